@@ -0,0 +1,65 @@
+"""Benchmark decoding API responses into models
+
+Usage:
+    python -m benchmarks.decoding [--meals N] [--number N]
+
+Compares the dedicated decoders in ugent_food.api.decoding to the generic dacite-based
+decoding that was used before.
+"""
+import argparse
+import timeit
+from enum import Enum
+
+from ugent_food.api.decoding import decode_menu
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Menu
+
+__all__ = ["synthetic_menu"]
+
+
+def synthetic_menu(meals: int) -> dict:
+    """Create an API response for a menu with [meals] meals"""
+    kinds = list(MealKind)
+    types = list(MealType)
+
+    return {
+        "date": "2022-09-21",
+        "open": True,
+        "meals": [
+            {
+                "kind": kinds[i % len(kinds)].value,
+                "name": f"Meal {i}",
+                "price": f"€ {i % 10},{i % 100:02}",
+                "type": types[i % len(types)].value,
+            }
+            for i in range(meals)
+        ],
+        "vegetables": ["Wortelen", "Erwten"],
+        "message": None,
+    }
+
+
+def main():
+    """Run the benchmark"""
+    from dacite import Config, from_dict
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meals", type=int, default=10, help="Amount of meals on the menu.")
+    parser.add_argument("--number", type=int, default=10_000, help="Amount of menus to decode.")
+    args = parser.parse_args()
+
+    data = synthetic_menu(args.meals)
+
+    candidates = {
+        "dacite": lambda: from_dict(Menu, data, config=Config(cast=[Enum])),
+        "decode_menu": lambda: decode_menu(data),
+        "decode_menu (strict)": lambda: decode_menu(data, strict=True),
+    }
+
+    for name, func in candidates.items():
+        duration = min(timeit.repeat(func, number=args.number, repeat=3))
+        print(f"{name:<24}{duration / args.number * 1_000_000:>10.2f}µs per menu")
+
+
+if __name__ == "__main__":
+    main()
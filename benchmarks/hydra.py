@@ -0,0 +1,91 @@
+"""Local stand-in for the Hydra API that replays recorded responses
+
+Usage:
+    python -m benchmarks.hydra [--port N] [--meals N] [--latency SECONDS]
+
+Every menu request is answered with the recorded menu (with the date filled in), or with a synthetic
+menu when --meals is passed. Point the tool at it by setting UGENT_FOOD_API_URL to the printed URL.
+"""
+import argparse
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from benchmarks.decoding import synthetic_menu
+
+__all__ = ["create_app", "stand_in_server"]
+
+RESPONSES_PATH = Path(__file__).parent / "responses"
+API_PATH = "/api/2.0/resto"
+
+
+def _recorded(name: str) -> Any:
+    """Load a recorded response"""
+    with (RESPONSES_PATH / f"{name}.json").open("r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def create_app(*, meals: Optional[int] = None, latency: float = 0) -> web.Application:
+    """Create the stand-in server
+
+    Menus contain [meals] synthetic meals instead of the recorded ones if it's passed, and every
+    response is delayed by [latency] seconds to simulate the network.
+    """
+    menu = _recorded("menu") if meals is None else synthetic_menu(meals)
+    sandwiches = _recorded("sandwiches")
+
+    async def _respond(request: web.Request, data: Any) -> web.Response:
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+        # Responses never change, so every conditional request can be answered with "not modified"
+        if request.headers.get("If-None-Match") == '"recorded"':
+            return web.Response(status=304)
+
+        return web.json_response(data, headers={"ETag": '"recorded"'})
+
+    async def menu_handler(request: web.Request) -> web.Response:
+        year, month, day = (int(request.match_info[part]) for part in ("year", "month", "day"))
+        return await _respond(request, {**menu, "date": f"{year:04}-{month:02}-{day:02}"})
+
+    async def sandwiches_handler(request: web.Request) -> web.Response:
+        return await _respond(request, sandwiches)
+
+    app = web.Application()
+    app.router.add_get(API_PATH + r"/menu/{language}/{year:\d+}/{month:\d+}/{day:\d+}.json", menu_handler)
+    app.router.add_get(API_PATH + "/sandwiches.json", sandwiches_handler)
+
+    return app
+
+
+@asynccontextmanager
+async def stand_in_server(*, meals: Optional[int] = None, latency: float = 0) -> AsyncIterator[str]:
+    """Run the stand-in server on a free port, yielding the URL to use as the API_URL"""
+    server = TestServer(create_app(meals=meals, latency=latency))
+    await server.start_server()
+
+    try:
+        yield str(server.make_url(API_PATH))
+    finally:
+        await server.close()
+
+
+def main():
+    """Run the server until it is interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765, help="The port to listen on.")
+    parser.add_argument("--meals", type=int, help="Serve synthetic menus with this amount of meals.")
+    parser.add_argument("--latency", type=float, default=0, help="Delay every response by this many seconds.")
+    args = parser.parse_args()
+
+    print(f"UGENT_FOOD_API_URL=http://127.0.0.1:{args.port}{API_PATH}")
+    web.run_app(create_app(meals=args.meals, latency=args.latency), host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
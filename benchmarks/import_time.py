@@ -0,0 +1,99 @@
+"""Benchmark the time it takes to import the CLI
+
+Usage:
+    python -m benchmarks.import_time [--runs N] [--save FILE] [--compare FILE] [--tolerance FRACTION]
+
+The cumulative import time of the entry point is measured using "python -X importtime",
+and the benchmark fails if any of the heavy dependencies are imported eagerly.
+"""
+import argparse
+import json
+import subprocess  # noqa: S404
+import sys
+from pathlib import Path
+from typing import Optional
+
+__all__ = ["measure_import_time"]
+
+ENTRY_MODULE = "ugent_food.cli"
+
+# Dependencies that should only be imported by the commands that need them
+LAZY_MODULES = ["aiohttp", "dacite", "tabulate"]
+
+
+def _parse_importtime(output: str) -> dict[str, int]:
+    """Parse the output of -X importtime into a mapping of module -> cumulative time (µs)"""
+    timings = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        timings[module.strip()] = int(cumulative)
+
+    return timings
+
+
+def measure_import_time(runs: int = 10) -> tuple[int, list[str]]:
+    """Measure the import time of the entry point
+
+    Returns the fastest cumulative import time (in µs) out of [runs] runs, along with
+    the list of modules that should have been imported lazily but weren't.
+    """
+    best: Optional[int] = None
+    eager_modules: list[str] = []
+
+    for _ in range(runs):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        timings = _parse_importtime(result.stderr)
+        eager_modules = [module for module in LAZY_MODULES if module in timings]
+
+        if best is None or timings[ENTRY_MODULE] < best:
+            best = timings[ENTRY_MODULE]
+
+    assert best is not None  # noqa: S101
+    return best, eager_modules
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Amount of times to import the entry point.")
+    parser.add_argument("--save", type=Path, help="Store the result in this file.")
+    parser.add_argument("--compare", type=Path, help="Compare the result to a previously stored result.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown compared to --compare.")
+    args = parser.parse_args()
+
+    import_time, eager_modules = measure_import_time(args.runs)
+    print(f"Importing {ENTRY_MODULE} took {import_time / 1000:.1f}ms")
+
+    failed = False
+
+    if eager_modules:
+        print(f"Modules that should be imported lazily were imported on startup: {', '.join(eager_modules)}")
+        failed = True
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())["import_time_us"]
+        slowdown = import_time / baseline - 1
+        print(f"Compared to {args.compare}: {slowdown:+.1%}")
+
+        if slowdown > args.tolerance:
+            print(f"Import time regressed by more than {args.tolerance:.0%}")
+            failed = True
+
+    if args.save is not None:
+        args.save.write_text(json.dumps({"import_time_us": import_time}))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
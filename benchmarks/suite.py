@@ -0,0 +1,284 @@
+"""Benchmark suite covering decoding, rendering and end-to-end latency
+
+Usage:
+    python -m benchmarks.suite [--only NAME ...] [--number N] [--save FILE] [--compare FILE] [--tolerance FRACTION]
+
+Everything that needs the API runs against the stand-in server from benchmarks.hydra, so the
+results don't depend on the network. Results are stored as the time per operation in µs, and
+comparing to a previous run fails if any benchmark became slower than the tolerance allows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import time
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from benchmarks.decoding import synthetic_menu
+from benchmarks.hydra import stand_in_server
+
+__all__ = ["BENCHMARKS", "run_benchmarks"]
+
+# Sizes of the synthetic data
+LARGE_MENU_MEALS = 200
+LARGE_SANDWICH_COUNT = 200
+MULTI_DAY_COUNT = 20
+
+DATE_ARGUMENTS = ["today", "morgen", "overmorgen", "monday", "vrijdag", "21/09", "21/09/2022", "2022-09-21"]
+
+Benchmark = Callable[[int], Awaitable[float]]
+
+
+def _time(func: Callable[[], object], number: int) -> float:
+    """Get the fastest time per call (in µs) of a synchronous function"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1_000_000
+
+
+async def _time_async(func: Callable[[], Awaitable[object]], number: int) -> float:
+    """Get the fastest time per call (in µs) of a coroutine function"""
+    best = float("inf")
+
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+
+        best = min(best, time.perf_counter() - start)
+
+    return best / number * 1_000_000
+
+
+def _synthetic_sandwiches(amount: int) -> list[dict]:
+    return [
+        {
+            "name": f"sandwich {i}",
+            "ingredients": [f"ingredient {j}" for j in range(i % 8 + 1)],
+            "price_small": f"{i % 5},{i % 100:02}",
+            "price_medium": f"{i % 5 + 1},{i % 100:02}",
+        }
+        for i in range(amount)
+    ]
+
+
+async def cold_start(number: int) -> float:
+    """Run the CLI in a new process to fetch a menu, without any cache"""
+    command = [sys.executable, "-m", "ugent_food", "menu", "2022-09-21", "--no-cache"]
+
+    # A separate home directory, so the user's config & archive aren't touched
+    with tempfile.TemporaryDirectory() as home:
+        async with stand_in_server() as url:
+            env = {**os.environ, "UGENT_FOOD_API_URL": url, "HOME": home}
+
+            async def _run():
+                process = await asyncio.create_subprocess_exec(
+                    *command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                if await process.wait() != 0:
+                    raise RuntimeError(f"{' '.join(command)} exited with status {process.returncode}")
+
+            # Starting a process is slow, so it's repeated fewer times than the other benchmarks
+            return await _time_async(_run, max(1, number // 100))
+
+
+async def warm_fetch(number: int) -> float:
+    """Fetch a menu using a client that already has an open connection, without any cache"""
+    from ugent_food.api import wrapper
+    from ugent_food.api.client import HydraClient
+
+    async with stand_in_server() as url:
+        wrapper.API_URL = url
+
+        async with HydraClient() as client:
+            await client.get_menu(date(2022, 9, 21))
+            return await _time_async(lambda: client.get_menu(date(2022, 9, 21)), max(1, number // 10))
+
+
+async def cached_fetch(number: int) -> float:
+    """Fetch a menu that is in the in-memory cache"""
+    from ugent_food.api import wrapper
+    from ugent_food.api.cache import MemoryCache
+    from ugent_food.api.client import HydraClient
+
+    async with stand_in_server() as url:
+        wrapper.API_URL = url
+
+        async with HydraClient(cache=MemoryCache()) as client:
+            await client.get_menu(date(2022, 9, 21))
+            return await _time_async(lambda: client.get_menu(date(2022, 9, 21)), number)
+
+
+async def multi_day_fetch(number: int) -> float:
+    """Fetch the menus for many days at once, without any cache"""
+    from ugent_food.api import wrapper
+    from ugent_food.api.client import HydraClient
+
+    days = [date(2022, 9, 1) + timedelta(days=i) for i in range(MULTI_DAY_COUNT)]
+
+    # A bit of latency, otherwise fetching concurrently doesn't make a difference
+    async with stand_in_server(latency=0.005) as url:
+        wrapper.API_URL = url
+
+        async with HydraClient() as client:
+            return await _time_async(lambda: client.get_menus(days), max(1, number // 100))
+
+
+async def decode_large_menu(number: int) -> float:
+    """Decode an API response for a menu with many meals"""
+    from ugent_food.api.decoding import decode_menu
+
+    data = synthetic_menu(LARGE_MENU_MEALS)
+    return _time(lambda: decode_menu(data), number)
+
+
+async def decode_sandwiches(number: int) -> float:
+    """Decode an API response with many sandwiches"""
+    from ugent_food.api.decoding import decode_sandwiches as _decode_sandwiches
+
+    data = _synthetic_sandwiches(LARGE_SANDWICH_COUNT)
+    return _time(lambda: _decode_sandwiches(data), number)
+
+
+async def stream_sandwiches(number: int) -> float:
+    """Parse many sandwiches from a response body that arrives in chunks"""
+    from ugent_food.api.decoding import decode_sandwich
+    from ugent_food.api.streaming import iter_json_array
+
+    body = json.dumps(_synthetic_sandwiches(LARGE_SANDWICH_COUNT)).encode()
+
+    async def _chunks():
+        for start in range(0, len(body), 4096):
+            yield body[start : start + 4096]
+
+    async def _stream():
+        return [decode_sandwich(data) async for data in iter_json_array(_chunks())]
+
+    return await _time_async(_stream, max(1, number // 10))
+
+
+async def render_large_menu(number: int) -> float:
+    """Render a menu with many meals as a table"""
+    from ugent_food.api.decoding import decode_menu
+    from ugent_food.cli.config import Config
+
+    config = Config()
+    menu = decode_menu(synthetic_menu(LARGE_MENU_MEALS))
+    return _time(lambda: menu.to_string(config, date(2022, 9, 21)), max(1, number // 10))
+
+
+async def render_cached_menus(number: int) -> float:
+    """Render a week of menus again, after they were rendered once with the same settings"""
+    from ugent_food.api.decoding import decode_menu
+    from ugent_food.cli.config import Config
+    from ugent_food.cli.renderers import RenderCache, render_menus
+
+    config = Config()
+    cache = RenderCache()
+    menus = [(date(2022, 9, 19) + timedelta(days=i), decode_menu(synthetic_menu(LARGE_MENU_MEALS))) for i in range(5)]
+    render_menus(menus, config, cache=cache)
+
+    return _time(lambda: render_menus(menus, config, cache=cache), number)
+
+
+async def render_sandwiches(number: int) -> float:
+    """Render many sandwiches as a table"""
+    from ugent_food.api.decoding import decode_sandwiches as _decode_sandwiches
+    from ugent_food.cli.config import Config
+    from ugent_food.cli.renderers import get_renderer
+
+    config = Config()
+    renderer = get_renderer("table")
+    sandwiches = _decode_sandwiches(_synthetic_sandwiches(LARGE_SANDWICH_COUNT))
+    return _time(lambda: list(renderer.sandwiches(sandwiches, config)), max(1, number // 10))
+
+
+async def sort_sandwiches(number: int) -> float:
+    """Render many sandwiches as NDJSON, from cheap to expensive"""
+    from ugent_food.api.decoding import decode_sandwiches as _decode_sandwiches
+    from ugent_food.cli.config import Config
+    from ugent_food.cli.renderers import get_renderer
+
+    config = Config()
+    renderer = get_renderer("ndjson")
+    sandwiches = _decode_sandwiches(_synthetic_sandwiches(LARGE_SANDWICH_COUNT))
+    return _time(lambda: list(renderer.sandwiches(sandwiches, config, sort="price")), max(1, number // 10))
+
+
+async def parse_dates(number: int) -> float:
+    """Parse every kind of date argument"""
+    from ugent_food.cli.parsers import parse_date_argument
+
+    today = date(2022, 9, 21)
+    return _time(lambda: [parse_date_argument(arg, today=today) for arg in DATE_ARGUMENTS], number)
+
+
+BENCHMARKS: dict[str, Benchmark] = {
+    "cold_start": cold_start,
+    "warm_fetch": warm_fetch,
+    "cached_fetch": cached_fetch,
+    "multi_day_fetch": multi_day_fetch,
+    "decode_large_menu": decode_large_menu,
+    "decode_sandwiches": decode_sandwiches,
+    "stream_sandwiches": stream_sandwiches,
+    "render_large_menu": render_large_menu,
+    "render_cached_menus": render_cached_menus,
+    "render_sandwiches": render_sandwiches,
+    "sort_sandwiches": sort_sandwiches,
+    "parse_dates": parse_dates,
+}
+
+
+async def run_benchmarks(names: list[str], number: int = 1000) -> dict[str, float]:
+    """Run the benchmarks in [names], returning the time per operation (in µs) of every one of them"""
+    results = {}
+
+    for name in names:
+        results[name] = await BENCHMARKS[name](number)
+        print(f"{name:<24}{results[name]:>14.2f}µs")
+
+    return results
+
+
+def main():
+    """Run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Only run these benchmarks.")
+    parser.add_argument("--number", type=int, default=1000, help="Amount of operations per benchmark.")
+    parser.add_argument("--save", type=Path, help="Store the results in this file.")
+    parser.add_argument("--compare", type=Path, help="Compare the results to previously stored results.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown compared to --compare.")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args.only or list(BENCHMARKS), args.number))
+    failed = False
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())["results_us"]
+        print(f"\nCompared to {args.compare}:")
+
+        for name, duration in results.items():
+            if name not in baseline:
+                continue
+
+            slowdown = duration / baseline[name] - 1
+            regressed = slowdown > args.tolerance
+            failed = failed or regressed
+
+            print(f"{name:<24}{slowdown:>+14.1%}{'  REGRESSED' if regressed else ''}")
+
+        if failed:
+            print(f"\nSome benchmarks regressed by more than {args.tolerance:.0%}")
+
+    if args.save is not None:
+        args.save.write_text(json.dumps({"results_us": results}, indent=2))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
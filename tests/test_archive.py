@@ -0,0 +1,85 @@
+import unittest
+from datetime import date
+from typing import Optional
+
+from ugent_food.api.archive import (
+    KIND_CODES,
+    NO_PRICE,
+    TYPE_CODES,
+    MenuArchive,
+    encode_meal,
+)
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Meal, Menu, Price
+
+__all__ = ["MenuArchiveTest"]
+
+MONDAY = date(2026, 10, 12)
+TUESDAY = date(2026, 10, 13)
+PRICE = Price(520)
+
+
+def _menu(*names: str, price: Optional[Price] = PRICE) -> Menu:
+    return Menu(
+        open=True,
+        meals=tuple(Meal(kind=MealKind.VEGAN, name=name, price=price, type=MealType.MAIN) for name in names),
+        vegetables=["Wortelen"],
+        message="Gesloten om 14u",
+    )
+
+
+class MenuArchiveTest(unittest.TestCase):
+    """Tests for storing menus in columns"""
+
+    def test_round_trip(self):
+        """Menus come out of the archive the way they went in"""
+        archive = MenuArchive()
+        monday = _menu("Curry", "Lasagne")
+        tuesday = Menu(open=False)
+
+        archive.add(TUESDAY, tuesday)
+        archive.add(MONDAY, monday)
+
+        self.assertEqual(len(archive), 2)
+        self.assertIn(MONDAY, archive)
+        self.assertEqual(archive.get(MONDAY), monday)
+        self.assertEqual(archive.get(TUESDAY), tuesday)
+        self.assertIsNone(archive.get(date(2026, 10, 14)))
+        self.assertEqual(list(archive), [(MONDAY, monday), (TUESDAY, tuesday)])
+
+    def test_replace_day(self):
+        """Adding a day that is already in the archive replaces its menu"""
+        archive = MenuArchive()
+        archive.add(MONDAY, _menu("Curry", "Lasagne"))
+        archive.add(MONDAY, _menu("Stoofvlees"))
+
+        self.assertEqual(len(archive), 1)
+        self.assertEqual([meal.name for meal in archive.meals(MONDAY)], ["Stoofvlees"])
+
+    def test_prices(self):
+        """Prices that couldn't be parsed keep their text, and meals without a price don't get one"""
+        archive = MenuArchive()
+        archive.add(MONDAY, _menu("Curry", price=Price(None, "n.v.t.")))
+        archive.add(TUESDAY, _menu("Curry", price=None))
+
+        self.assertEqual(next(archive.meals(MONDAY)).price, Price(None, "n.v.t."))
+        self.assertIsNone(next(archive.meals(TUESDAY)).price)
+
+    def test_encoded_meals(self):
+        """The meals of a day can be read without decoding them, and meals added encoded can be decoded"""
+        archive = MenuArchive()
+        meal = Meal(kind=MealKind.FISH, name="Vispannetje", price=None, type=MealType.MAIN)
+        archive.add_encoded(MONDAY, True, [encode_meal(meal)])
+
+        kinds, types, names, prices = archive.encoded_meals(MONDAY)
+        self.assertEqual(list(kinds), [KIND_CODES[MealKind.FISH]])
+        self.assertEqual(list(types), [TYPE_CODES[MealType.MAIN]])
+        self.assertEqual(names, ["Vispannetje"])
+        self.assertEqual(list(prices), [NO_PRICE])
+
+        self.assertTrue(archive.is_open(MONDAY))
+        self.assertEqual(archive.get(MONDAY), Menu(open=True, meals=(meal,)))
+
+
+if __name__ == "__main__":
+    unittest.main()
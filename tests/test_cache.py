@@ -0,0 +1,172 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from ugent_food.api.cache import PAST_MENU_TTL, CacheEntry, MenuCache, menu_ttl
+from ugent_food.api.policy import RequestPolicy
+from ugent_food.api.wrapper import _fetch_json
+
+__all__ = ["CacheEntryTest", "MenuCacheTest", "RevalidationTest"]
+
+TTL = timedelta(hours=1)
+
+
+class CacheEntryTest(unittest.TestCase):
+    """Tests for the expiry of cache entries"""
+
+    def test_expiry(self):
+        """Entries are fresh until their TTL has passed, and renewing them starts it again"""
+        with mock.patch("time.time", return_value=1000):
+            entry = CacheEntry.create({"open": True}, TTL, etag='"v1"')
+            self.assertTrue(entry.is_fresh)
+
+        with mock.patch("time.time", return_value=1000 + TTL.total_seconds()):
+            self.assertFalse(entry.is_fresh)
+            renewed = entry.renewed(TTL)
+            self.assertTrue(renewed.is_fresh)
+
+        self.assertEqual((renewed.data, renewed.etag), (entry.data, entry.etag))
+
+    def test_menu_ttl(self):
+        """Menus of days that have passed are cached for longer than the others"""
+        today = date(2026, 10, 12)
+        self.assertEqual(menu_ttl(today - timedelta(days=1), today), PAST_MENU_TTL)
+        self.assertLess(menu_ttl(today, today), PAST_MENU_TTL)
+        self.assertEqual(menu_ttl(today + timedelta(days=1), today), menu_ttl(today, today))
+
+
+class MenuCacheTest(unittest.TestCase):
+    """Tests for the on-disk cache"""
+
+    def setUp(self):
+        """Create an empty cache in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "cache"
+        self.cache = MenuCache(self.path, max_entries=3)
+
+    def tearDown(self):
+        """Remove the cache"""
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Stored entries can be read back, and entries that can't be read are misses"""
+        entry = CacheEntry({"open": True}, expires_at=1000, etag='"v1"', last_modified="Mon, 12 Oct 2026 10:00:00 GMT")
+        self.cache.put("menu", entry)
+
+        self.assertEqual(self.cache.get("menu"), entry)
+        self.assertIsNone(self.cache.get("missing"))
+
+        (self.path / "corrupt.json").write_text("{", encoding="utf-8")
+        self.assertIsNone(self.cache.get("corrupt"))
+
+    def test_eviction(self):
+        """The entries that were written the longest ago are removed once there are too many"""
+        for index in range(3):
+            self.cache.put(f"entry-{index}", CacheEntry(index, expires_at=0))
+            os.utime(self.path / f"entry-{index}.json", (index, index))
+
+        # Replacing an entry doesn't add one
+        self.cache.put("entry-2", CacheEntry(2, expires_at=0))
+        self.assertEqual(len(list(self.path.glob("*.json"))), 3)
+
+        self.cache.put("entry-3", CacheEntry(3, expires_at=0))
+        self.assertEqual(sorted(p.stem for p in self.path.glob("*.json")), ["entry-1", "entry-2", "entry-3"])
+
+    def test_counts_once(self):
+        """The directory is only listed again when there are too many entries"""
+        self.cache.put("entry-0", CacheEntry(0, expires_at=0))
+
+        with mock.patch.object(Path, "glob", autospec=True, side_effect=Path.glob) as glob:
+            self.cache.put("entry-1", CacheEntry(1, expires_at=0))
+            self.cache.put("entry-2", CacheEntry(2, expires_at=0))
+            self.assertEqual(glob.call_count, 0)
+
+            self.cache.put("entry-3", CacheEntry(3, expires_at=0))
+            self.assertEqual(glob.call_count, 1)
+
+    def test_write_error(self):
+        """Entries that can't be written are logged instead of failing"""
+        self.path.write_text("not a directory", encoding="utf-8")
+
+        with self.assertLogs("ugent_food.api.cache", "WARNING"):
+            self.cache.put("menu", CacheEntry({"open": True}, expires_at=0))
+
+        self.assertIsNone(self.cache.get("menu"))
+
+
+class RevalidationTest(unittest.TestCase):
+    """Tests for revalidating stale entries with conditional requests"""
+
+    def setUp(self):
+        """Create an empty cache in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = MenuCache(Path(self.directory.name))
+        self.requests: list[dict[str, str]] = []
+
+    def tearDown(self):
+        """Remove the cache"""
+        self.directory.cleanup()
+
+    def _fetch(self, validator: str, value: str, condition: str) -> list:
+        """Fetch the same endpoint twice, with the cached entry expiring in between"""
+
+        async def _handler(request: web.Request) -> web.Response:
+            self.requests.append(dict(request.headers))
+            if request.headers.get(condition) == value:
+                return web.Response(status=304)
+
+            return web.json_response({"open": True}, headers={validator: value})
+
+        async def _run() -> list:
+            app = web.Application()
+            app.router.add_get("/menu.json", _handler)
+
+            async with TestServer(app) as server, ClientSession() as session:
+                url = str(server.make_url("/menu.json"))
+                policy = RequestPolicy(retries=0)
+                results = [await _fetch_json(session, url, cache=self.cache, key="menu", ttl=TTL, policy=policy)]
+
+                entry = self.cache.get("menu")
+                self.assertIsNotNone(entry)
+                self.cache.put("menu", replace(entry, expires_at=0))
+
+                results.append(await _fetch_json(session, url, cache=self.cache, key="menu", ttl=TTL, policy=policy))
+
+                # The renewed entry is fresh again, so it's used without a request
+                results.append(await _fetch_json(session, url, cache=self.cache, key="menu", ttl=TTL, policy=policy))
+                return results
+
+        return asyncio.run(_run())
+
+    def test_etag(self):
+        """Stale entries with an ETag are revalidated using If-None-Match"""
+        results = self._fetch("ETag", '"v1"', "If-None-Match")
+
+        self.assertEqual(results, [{"open": True}] * 3)
+        self.assertEqual(len(self.requests), 2)
+        self.assertNotIn("If-None-Match", self.requests[0])
+        self.assertEqual(self.requests[1]["If-None-Match"], '"v1"')
+
+        entry = self.cache.get("menu")
+        self.assertTrue(entry is not None and entry.is_fresh)
+
+    def test_last_modified(self):
+        """Stale entries with a Last-Modified date are revalidated using If-Modified-Since"""
+        modified = "Mon, 12 Oct 2026 10:00:00 GMT"
+        results = self._fetch("Last-Modified", modified, "If-Modified-Since")
+
+        self.assertEqual(results, [{"open": True}] * 3)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[1]["If-Modified-Since"], modified)
+
+
+if __name__ == "__main__":
+    unittest.main()
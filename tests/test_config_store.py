@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ugent_food.cli.config_store import ConfigStore
+
+__all__ = ["ConfigStoreTest"]
+
+
+class ConfigStoreTest(unittest.TestCase):
+    """Tests for reading & updating the config file"""
+
+    def setUp(self):
+        """Create a store for a config file in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / ".ugent_food"
+        self.store = ConfigStore(self.path)
+
+    def tearDown(self):
+        """Remove the config file"""
+        self.directory.cleanup()
+
+    def _replace(self, content: dict):
+        """Replace the file the way another process would"""
+        tmp_path = self.path.with_name("other.tmp")
+        tmp_path.write_text(json.dumps(content), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def test_missing_file(self):
+        """A file that doesn't exist is empty"""
+        self.assertFalse(self.store.exists())
+        self.assertEqual(self.store.read(), {})
+
+    def test_update(self):
+        """Updates are written to the file, without leaving temporary files behind"""
+        self.assertEqual(self.store.update(lambda content: content.update(language="nl")), {"language": "nl"})
+        self.store.update(lambda content: content.update(hidden=["soup"]))
+
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), {"language": "nl", "hidden": ["soup"]})
+        self.assertEqual(sorted(p.name for p in self.path.parent.iterdir()), [".ugent_food", ".ugent_food.lock"])
+
+    def test_failed_write(self):
+        """A write that fails leaves the file the way it was"""
+        self.store.update(lambda content: content.update(language="nl"))
+
+        with mock.patch("json.dump", side_effect=OSError("disk full")), self.assertRaises(OSError):
+            self.store.update(lambda content: content.update(language="en"))
+
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")), {"language": "nl"})
+        self.assertFalse(list(self.path.parent.glob("*.tmp")))
+
+    def test_parsed_once(self):
+        """The file is only parsed again when it changed, and changing what was read doesn't change the store"""
+        self._replace({"language": "nl"})
+
+        with mock.patch("json.load", side_effect=json.load) as load:
+            self.store.read()["language"] = "en"
+            self.assertEqual(self.store.read(), {"language": "nl"})
+            self.assertEqual(load.call_count, 1)
+
+            self._replace({"language": "en"})
+            self.assertEqual(self.store.read(), {"language": "en"})
+            self.assertEqual(load.call_count, 2)
+
+    def test_same_mtime_and_size(self):
+        """A file that was replaced is parsed again, even if its mtime & size didn't change"""
+        self._replace({"language": "nl"})
+        stat = self.path.stat()
+        self.assertEqual(self.store.read(), {"language": "nl"})
+
+        # Keep the old file around, so the new one can't get its inode
+        old_path = self.path.with_name("old")
+        os.link(self.path, old_path)
+
+        self._replace({"language": "en"})
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(self.store.read(), {"language": "en"})
+
+    def test_concurrent_updates(self):
+        """Updates made at the same time by different stores are all kept"""
+
+        def _increment(content: dict):
+            content["count"] = content.get("count", 0) + 1
+
+        def _update():
+            store = ConfigStore(self.path)
+            for _ in range(10):
+                store.update(_increment)
+
+        threads = [threading.Thread(target=_update) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.store.read(), {"count": 40})
+
+
+if __name__ == "__main__":
+    unittest.main()
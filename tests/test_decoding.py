@@ -0,0 +1,47 @@
+import unittest
+
+from ugent_food.api.decoding import decode_menu, decode_sandwiches
+from ugent_food.exceptions import DecodingError
+
+__all__ = ["DecodeMenuTest", "DecodeSandwichesTest"]
+
+
+class DecodeMenuTest(unittest.TestCase):
+    """Tests for decoding menus from the API"""
+
+    def test_null_lists(self):
+        """Meals & vegetables that are null are empty, unless the menu is decoded strictly"""
+        menu = decode_menu({"open": False, "meals": None, "vegetables": None})
+        self.assertEqual(menu.meals, ())
+        self.assertEqual(menu.vegetables, [])
+
+        with self.assertRaises(DecodingError):
+            decode_menu({"open": False, "meals": None, "vegetables": None}, strict=True)
+
+    def test_invalid_meals(self):
+        """Meals that aren't a list raise a DecodingError"""
+        with self.assertRaises(DecodingError):
+            decode_menu({"open": True, "meals": 5})
+
+
+class DecodeSandwichesTest(unittest.TestCase):
+    """Tests for decoding the list of sandwiches from the API"""
+
+    def test_not_a_list(self):
+        """A response that isn't a list raises a DecodingError, also outside of strict mode"""
+        for data in (None, {}, 5):
+            for strict in (False, True):
+                with self.subTest(data=data, strict=strict), self.assertRaises(DecodingError):
+                    decode_sandwiches(data, strict=strict)  # type: ignore[arg-type]
+
+    def test_sandwiches(self):
+        """Every sandwich in the list is decoded"""
+        sandwiches = decode_sandwiches(
+            [{"name": "Kaas", "ingredients": ["kaas"], "price_small": "2,00", "price_medium": ""}]
+        )
+        self.assertEqual([sandwich.name for sandwich in sandwiches], ["Kaas"])
+        self.assertIsNone(sandwiches[0].price_medium)
+
+
+if __name__ == "__main__":
+    unittest.main()
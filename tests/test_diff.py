@@ -0,0 +1,55 @@
+import unittest
+from datetime import date
+
+from ugent_food.api.diff import ChangeKind, MenuChange, diff_menus
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Meal, Menu, Price
+from ugent_food.i18n import Language, Translator
+
+__all__ = ["DescribeTest"]
+
+DAY = date(2026, 10, 12)
+CURRY = Meal(kind=MealKind.VEGAN, name="Curry", price=Price(520), type=MealType.MAIN)
+
+
+class DescribeTest(unittest.TestCase):
+    """Tests for describing the changes to a menu"""
+
+    def test_changes(self):
+        """Changes are described in the language of the translator"""
+        old = Menu(open=True, meals=(CURRY,), vegetables=["Wortelen"], message="Gesloten om 14u")
+        new = Menu(open=True, meals=(Meal(CURRY.kind, CURRY.name, Price(540), CURRY.type),), vegetables=["Erwten"])
+        changes = diff_menus(DAY, old, new)
+
+        self.assertEqual(
+            [change.describe(Translator(Language.ENGLISH)) for change in changes],
+            [
+                "2026-10-12: ~ Curry (Main course, Vegan) € 5.20 -> € 5.40",
+                "2026-10-12: vegetables changed: Erwten",
+                "2026-10-12: message removed",
+            ],
+        )
+        self.assertEqual(
+            [change.describe(Translator(Language.DUTCH)) for change in changes],
+            [
+                "2026-10-12: ~ Curry (Hoofdgerecht, Vegan) € 5,20 -> € 5,40",
+                "2026-10-12: groenten gewijzigd: Erwten",
+                "2026-10-12: mededeling verwijderd",
+            ],
+        )
+
+    def test_every_change_is_translated(self):
+        """Every kind of change has a description in every language"""
+        for language in Language:
+            translator = Translator(language)
+
+            for kind in ChangeKind:
+                meal = CURRY if kind.value.startswith(("meal_", "price_")) else None
+                change = MenuChange(DAY, kind, meal, old=None, new=["Erwten"] if meal is None else None)
+
+                with self.subTest(language=language, kind=kind):
+                    self.assertTrue(change.describe(translator).startswith("2026-10-12: "))
+
+
+if __name__ == "__main__":
+    unittest.main()
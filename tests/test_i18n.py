@@ -0,0 +1,35 @@
+import copy
+import unittest
+
+from ugent_food.api.enums import MealKind
+from ugent_food.i18n import Language, Translator
+
+__all__ = ["TranslatorTest"]
+
+
+class TranslatorTest(unittest.TestCase):
+    """Tests for the lookup tables of the Translator"""
+
+    def test_tables_are_loaded_on_demand(self):
+        """The tables are loaded the first time a translation is needed"""
+        translator = Translator(Language.DUTCH)
+        self.assertNotIn("_kinds", vars(translator))
+        self.assertEqual(translator.kind(MealKind.VEGAN), "Vegan")
+        self.assertIn("_kinds", vars(translator))
+
+    def test_unknown_attributes(self):
+        """Attributes that don't exist raise an AttributeError, before and after loading the tables"""
+        translator = Translator(Language.ENGLISH)
+        self.assertFalse(hasattr(translator, "_repr_html_"))
+        translator.kind(MealKind.MEAT)
+        self.assertFalse(hasattr(translator, "_repr_html_"))
+        self.assertFalse(hasattr(translator, "__wrapped__"))
+
+    def test_copy(self):
+        """Translators can be copied"""
+        translator = copy.copy(Translator(Language.ENGLISH))
+        self.assertEqual(translator.kind(MealKind.MEAT), "Meat")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Meal, Menu
+
+__all__ = ["MenuTest"]
+
+SOUP = Meal(kind=MealKind.SOUP, name="Tomatensoep", price=None, type=MealType.MAIN)
+VEGAN = Meal(kind=MealKind.VEGAN, name="Curry", price=None, type=MealType.MAIN)
+MEAT = Meal(kind=MealKind.MEAT, name="Stoofvlees", price=None, type=MealType.MAIN)
+SIDE = Meal(kind=MealKind.VEGAN, name="Frietjes", price=None, type=MealType.SIDE)
+
+
+class MenuTest(unittest.TestCase):
+    """Tests for the Menu model"""
+
+    def test_iter_meals(self):
+        """Meals are grouped by their type and kind, and hidden kinds are left out"""
+        menu = Menu(open=True, meals=(SIDE, SOUP, VEGAN, MEAT))
+
+        self.assertEqual(list(menu.iter_meals()), [MEAT, VEGAN, SOUP, SIDE])
+        self.assertEqual(list(menu.iter_meals({MealKind.VEGAN})), [MEAT, SOUP])
+        self.assertEqual(menu.meals, (SIDE, SOUP, VEGAN, MEAT))
+
+    def test_replaced_meals(self):
+        """Replacing the meals after they were grouped groups them again"""
+        menu = Menu(open=True, meals=(VEGAN,))
+        self.assertEqual(list(menu.iter_meals()), [VEGAN])
+
+        menu.meals += (MEAT,)
+        self.assertEqual(list(menu.iter_meals()), [MEAT, VEGAN])
+
+        menu.meals = ()
+        self.assertEqual(list(menu.iter_meals()), [])
+
+    def test_empty_menu_is_grouped_once(self):
+        """Menus without meals don't have to be grouped again every time"""
+        menu = Menu(open=False)
+        buckets = menu._get_buckets()
+        self.assertIs(menu._get_buckets(), buckets)
+
+
+if __name__ == "__main__":
+    unittest.main()
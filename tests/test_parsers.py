@@ -0,0 +1,51 @@
+import unittest
+from datetime import date, timedelta
+
+from ugent_food.cli.parsers import parse_date_range, parse_range_end
+
+__all__ = ["ParseRangeEndTest"]
+
+# A Monday, so the weekdays of the week are easy to count
+MONDAY = date(2022, 9, 19)
+
+
+class ParseRangeEndTest(unittest.TestCase):
+    """Tests for resolving the END of a range relative to its start"""
+
+    def test_relative_keywords(self):
+        """Relative keywords are counted from the start"""
+        self.assertEqual(parse_range_end("today", MONDAY), MONDAY)
+        self.assertEqual(parse_range_end("tomorrow", MONDAY), MONDAY + timedelta(days=1))
+        self.assertEqual(parse_range_end("morgen", MONDAY), MONDAY + timedelta(days=1))
+        self.assertEqual(parse_range_end("overmorgen", MONDAY), MONDAY + timedelta(days=2))
+        self.assertEqual(parse_range_end("+4", MONDAY), MONDAY + timedelta(days=4))
+        self.assertEqual(parse_range_end("next week", MONDAY), MONDAY + timedelta(weeks=1))
+
+    def test_weekdays_and_dates(self):
+        """Weekdays & dates are the first matching day on or after the start"""
+        self.assertEqual(parse_range_end("monday", MONDAY), MONDAY)
+        self.assertEqual(parse_range_end("friday", MONDAY), MONDAY + timedelta(days=4))
+        self.assertEqual(parse_range_end("friday", MONDAY + timedelta(days=4)), MONDAY + timedelta(days=4))
+        self.assertEqual(parse_range_end("19/09", MONDAY), MONDAY)
+        self.assertEqual(parse_range_end("2022-09-23", MONDAY), MONDAY + timedelta(days=4))
+
+    def test_today_until_tomorrow(self):
+        """A range from today until tomorrow contains both days"""
+        today = date.today()
+        self.assertEqual(parse_date_range("today..tomorrow", skip_weekends=False), [today, today + timedelta(days=1)])
+
+    def test_monday_until_friday(self):
+        """A range from Monday until Friday contains the whole week"""
+        dates = parse_date_range("monday..friday", skip_weekends=False)
+        self.assertEqual([day.weekday() for day in dates or []], [0, 1, 2, 3, 4])
+        self.assertEqual(dates[-1] - dates[0] if dates else None, timedelta(days=4))
+
+    def test_week(self):
+        """A week by itself is a range from its Monday"""
+        dates = parse_date_range("next week", skip_weekends=True)
+        self.assertEqual([day.weekday() for day in dates or []], [0, 1, 2, 3, 4])
+        self.assertGreater(dates[0] if dates else None, date.today())
+
+
+if __name__ == "__main__":
+    unittest.main()
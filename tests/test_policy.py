@@ -0,0 +1,156 @@
+import asyncio
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from ugent_food.api.cache import CacheEntry, MemoryCache
+from ugent_food.api.policy import CircuitBreaker, RequestPolicy
+from ugent_food.api.wrapper import _fetch_json
+from ugent_food.exceptions import APIException
+
+__all__ = ["CircuitBreakerTest", "RequestPolicyTest"]
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """Tests for opening & closing the circuit"""
+
+    def setUp(self):
+        """Create a breaker with a clock that only moves when the test moves it"""
+        self.now = 100.0
+        patcher = mock.patch("ugent_food.api.policy.time")
+        patcher.start().monotonic.side_effect = lambda: self.now
+        self.addCleanup(patcher.stop)
+
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def test_opens_after_threshold(self):
+        """The circuit only opens once enough requests failed in a row"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open)
+
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+
+    def test_success_resets_failures(self):
+        """A successful request starts counting the failures from zero again"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        self.assertFalse(self.breaker.is_open)
+
+    def test_half_open(self):
+        """After the timeout, requests are allowed again and a single failure opens the circuit again"""
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        self.now += 29
+        self.assertTrue(self.breaker.is_open)
+
+        self.now += 1
+        self.assertFalse(self.breaker.is_open)
+
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+
+    def test_closes_after_success(self):
+        """A successful request while half-open closes the circuit"""
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        self.now += 30
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertFalse(self.breaker.is_open)
+
+
+class RequestPolicyTest(unittest.TestCase):
+    """Tests for retrying requests and blocking them while the circuit is open"""
+
+    def setUp(self):
+        """Start counting the requests that reach the server"""
+        self.requests = 0
+        self.status = 500
+
+    def _fetch(self, policy: RequestPolicy, cache: MemoryCache) -> object:
+        async def _handler(_request: web.Request) -> web.Response:
+            self.requests += 1
+            return web.json_response({"open": True}, status=self.status)
+
+        async def _run() -> object:
+            app = web.Application()
+            app.router.add_get("/menu.json", _handler)
+
+            async with TestServer(app) as server, ClientSession() as session:
+                url = str(server.make_url("/menu.json"))
+                return await _fetch_json(session, url, cache=cache, key="menu", ttl=timedelta(hours=1), policy=policy)
+
+        return asyncio.run(_run())
+
+    def test_should_retry(self):
+        """Server errors and rate limits are retried, other errors aren't"""
+        self.assertTrue(RequestPolicy.should_retry(503))
+        self.assertTrue(RequestPolicy.should_retry(429))
+        self.assertFalse(RequestPolicy.should_retry(404))
+        self.assertFalse(RequestPolicy.should_retry(304))
+
+    def test_backoff(self):
+        """The time between attempts grows exponentially, up to the maximum"""
+        policy = RequestPolicy(backoff_base=1, backoff_max=5)
+
+        with mock.patch("random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual([policy.backoff(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_retries_then_opens(self):
+        """Failing requests are retried, and once the circuit opens they aren't sent at all"""
+        policy = RequestPolicy(retries=2, backoff_base=0, breaker=CircuitBreaker(failure_threshold=2))
+        cache = MemoryCache()
+
+        with self.assertRaises(APIException):
+            self._fetch(policy, cache)
+
+        self.assertEqual(self.requests, 3)
+        self.assertFalse(policy.breaker.is_open)
+
+        # The cached response is used while the API is failing, also once the circuit is open
+        cache.put("menu", CacheEntry({"open": False}, expires_at=0))
+        self.assertEqual(self._fetch(policy, cache), {"open": False})
+        self.assertTrue(policy.breaker.is_open)
+
+        self.assertEqual(self._fetch(policy, cache), {"open": False})
+        self.assertEqual(self.requests, 6)
+
+    def test_success_closes(self):
+        """A successful response while the circuit is half-open closes it again"""
+        policy = RequestPolicy(retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30))
+
+        with mock.patch("ugent_food.api.policy.time") as clock:
+            clock.monotonic.return_value = 100
+
+            for _ in range(2):
+                with self.assertRaises(APIException):
+                    self._fetch(policy, MemoryCache())
+
+            self.assertTrue(policy.breaker.is_open)
+
+            clock.monotonic.return_value = 130
+            self.status = 200
+            self.assertEqual(self._fetch(policy, MemoryCache()), {"open": True})
+
+            # Only a single failure since the circuit closed
+            self.status = 500
+            with self.assertRaises(APIException):
+                self._fetch(policy, MemoryCache())
+
+            self.assertFalse(policy.breaker.is_open)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from ugent_food.api.models import Price
+from ugent_food.api.prices import parse_cents
+
+__all__ = ["ParseCentsTest", "PriceTest"]
+
+
+class ParseCentsTest(unittest.TestCase):
+    """Tests for turning prices into cents"""
+
+    def test_prices(self):
+        """The notations that the API uses are parsed"""
+        self.assertEqual(parse_cents("€ 5,20"), 520)
+        self.assertEqual(parse_cents("5.20"), 520)
+        self.assertEqual(parse_cents("€5"), 500)
+        self.assertEqual(parse_cents("5,2"), 520)
+
+    def test_not_a_single_price(self):
+        """Anything else isn't parsed, instead of taking the first digits that are found"""
+        self.assertIsNone(parse_cents(""))
+        self.assertIsNone(parse_cents("1.234,50"))
+        self.assertIsNone(parse_cents("5,205"))
+        self.assertIsNone(parse_cents("€ 5,20 / € 6,00"))
+
+
+class PriceTest(unittest.TestCase):
+    """Tests for the Price model"""
+
+    def test_unparsed_text_is_kept(self):
+        """Prices that can't be parsed are shown the way they were written"""
+        price = Price.parse("n.v.t.")
+        self.assertEqual(price, Price(None, "n.v.t."))
+        self.assertEqual(str(price), "n.v.t.")
+
+    def test_empty(self):
+        """An empty price means there is no price"""
+        self.assertIsNone(Price.parse(" "))
+        self.assertEqual(Price.parse("€ 5,20"), Price(520))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from datetime import date, timedelta
+
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Meal, Menu, Price
+from ugent_food.cli.config import Config
+from ugent_food.cli.renderers import RenderCache, render_menus
+
+__all__ = ["RenderMenusTest"]
+
+MONDAY = date(2026, 10, 12)
+MENU = Menu(open=True, meals=(Meal(kind=MealKind.VEGAN, name="Curry", price=Price(520), type=MealType.MAIN),))
+
+
+class RenderMenusTest(unittest.TestCase):
+    """Tests for rendering multiple menus at once"""
+
+    def test_same_output(self):
+        """The output is the same as rendering every menu by itself"""
+        config = Config()
+        menus = [(MONDAY, MENU), (MONDAY + timedelta(days=1), None), (MONDAY + timedelta(days=2), Menu(open=False))]
+
+        self.assertEqual(
+            render_menus(menus, config, cache=RenderCache()),
+            "\n\n".join(
+                [
+                    MENU.to_string(config, MONDAY),
+                    f"No menu found for {MONDAY + timedelta(days=1)}.",
+                    Menu(open=False).to_string(config, MONDAY + timedelta(days=2)),
+                ]
+            ),
+        )
+
+    def test_days_share_their_table(self):
+        """Days with the same menu only create their table once"""
+        cache = RenderCache()
+        render_menus([(MONDAY + timedelta(days=offset), MENU) for offset in range(5)], Config(), cache=cache)
+
+        # Five days and one table, which is reused for the last four days
+        self.assertEqual((cache.misses, cache.hits), (6, 4))
+
+    def test_settings_are_part_of_the_key(self):
+        """Rendering with different settings doesn't reuse the output"""
+        cache = RenderCache()
+        english = render_menus([(MONDAY, MENU)], Config(language="en"), cache=cache)
+        dutch = render_menus([(MONDAY, MENU)], Config(language="nl"), cache=cache)
+        hidden = render_menus([(MONDAY, MENU)], Config(hidden=[MealKind.VEGAN.value]), cache=cache)
+
+        self.assertNotEqual(english, dutch)
+        self.assertNotIn("Curry", hidden)
+        self.assertEqual(render_menus([(MONDAY, MENU)], Config(language="en"), cache=cache), english)
+
+
+if __name__ == "__main__":
+    unittest.main()
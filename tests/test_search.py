@@ -0,0 +1,128 @@
+import sqlite3
+import unittest
+from datetime import date
+
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Meal, Menu, Sandwich
+from ugent_food.api.search import SearchIndex, SearchSource, tokenize
+
+__all__ = ["SearchIndexTest", "TokenizeTest"]
+
+MONDAY = date(2026, 10, 12)
+TUESDAY = date(2026, 10, 13)
+
+
+def _meal(name: str, kind: MealKind = MealKind.VEGAN, type_: MealType = MealType.MAIN) -> Meal:
+    return Meal(kind=kind, name=name, price=None, type=type_)
+
+
+class TokenizeTest(unittest.TestCase):
+    """Tests for splitting names into terms"""
+
+    def test_tokenize(self):
+        """Terms are lowercase words without accents"""
+        self.assertEqual(tokenize("Vol-au-vent"), ("vol", "au", "vent"))
+        self.assertEqual(tokenize("Crème Brûlée"), ("creme", "brulee"))
+        self.assertEqual(tokenize(" - "), ())
+
+
+class SearchIndexTest(unittest.TestCase):
+    """Tests for finding meals, vegetables and sandwiches"""
+
+    def setUp(self):
+        """Index a few menus and sandwiches in an in-memory database"""
+        self.connection = sqlite3.connect(":memory:")
+        self.index = SearchIndex(self.connection)
+        self.index.create()
+
+        self.index.index_menu(
+            "nl",
+            MONDAY,
+            Menu(
+                open=True,
+                meals=(
+                    _meal("Tomatensoep", MealKind.SOUP),
+                    _meal("Vol-au-vent", MealKind.MEAT),
+                    _meal("Tomaat met mozzarella", MealKind.VEGETARIAN, MealType.COLD),
+                ),
+                vegetables=["Tomatensalade"],
+            ),
+        )
+        self.index.index_menu("nl", TUESDAY, Menu(open=True, meals=(_meal("Tofu met tomaat"),)))
+        self.index.index_menu("en", MONDAY, Menu(open=True, meals=(_meal("Tomato soup", MealKind.SOUP),)))
+        self.index.index_sandwiches("nl", [Sandwich("Tomaat-mozzarella", ["tomaat", "mozzarella"], None, None)])
+
+    def tearDown(self):
+        """Close the database"""
+        self.connection.close()
+
+    def _names(self, query: str, language: str = "nl", **kwargs) -> list[str]:
+        return [result.name for result in self.index.search(query, language, **kwargs)]
+
+    def test_prefix(self):
+        """Terms in the query match every term that starts with them, unless prefixes are turned off"""
+        self.assertEqual(self._names("tomaten"), ["Tomatensoep", "Tomatensalade"])
+        self.assertEqual(self._names("tomaten", prefix=False), [])
+        self.assertEqual(
+            self._names("tomaat", prefix=False), ["Tomaat met mozzarella", "Tofu met tomaat", "Tomaat-mozzarella"]
+        )
+
+        # "tomaat" and "tomatensoep" share the first letters, but only match the prefixes they start with
+        self.assertEqual(self._names("tomaa"), ["Tomaat met mozzarella", "Tofu met tomaat", "Tomaat-mozzarella"])
+        self.assertEqual(self._names("Tomat"), ["Tomatensoep", "Tomatensalade"])
+
+    def test_every_term(self):
+        """Entries have to contain every term in the query"""
+        self.assertEqual(self._names("vol vent"), ["Vol-au-vent"])
+        self.assertEqual(self._names("tomaat mozza"), ["Tomaat met mozzarella", "Tomaat-mozzarella"])
+        self.assertEqual(self._names("vol soep"), [])
+        self.assertEqual(self._names(" - "), [])
+
+    def test_filters(self):
+        """Results can be limited to sources, kinds, types and days"""
+        self.assertEqual(self._names("tomaat", sources=[SearchSource.SANDWICH]), ["Tomaat-mozzarella"])
+        self.assertEqual(self._names("tom", kinds=[MealKind.SOUP, MealKind.VEGAN]), ["Tomatensoep", "Tofu met tomaat"])
+        self.assertEqual(self._names("tom", types=[MealType.COLD]), ["Tomaat met mozzarella"])
+
+        # Sandwiches aren't tied to a day, so they're left out when looking for days
+        self.assertEqual(self._names("tomaat", start=TUESDAY), ["Tofu met tomaat"])
+        self.assertEqual(self._names("tomaat", end=MONDAY), ["Tomaat met mozzarella"])
+
+    def test_languages(self):
+        """Meals are only found in their own language, sandwiches in every language"""
+        self.assertEqual(self._names("tomat", "en"), ["Tomato soup"])
+        self.assertEqual(self._names("mozzarella", "en"), ["Tomaat-mozzarella"])
+
+    def test_reindex_day(self):
+        """Indexing a menu again only replaces the entries of that day, and removes the terms of the old ones"""
+        self.index.index_menu("nl", MONDAY, Menu(open=True, meals=(_meal("Pasta pesto"),)))
+
+        self.assertEqual(self._names("tomaat"), ["Tofu met tomaat", "Tomaat-mozzarella"])
+        self.assertEqual(self._names("pesto"), ["Pasta pesto"])
+        self.assertEqual(self._names("tomato", "en"), ["Tomato soup"])
+
+        orphans = self.connection.execute(
+            "SELECT COUNT(*) FROM search_terms WHERE entry NOT IN (SELECT id FROM search_entries)"
+        ).fetchone()[0]
+        self.assertEqual(orphans, 0)
+
+    def test_reindex_sandwiches(self):
+        """Indexing the sandwiches again replaces all of them"""
+        self.index.index_sandwiches("nl", [Sandwich("Kaas", ["kaas", "boter"], None, None)])
+
+        self.assertEqual(self._names("mozzarella"), ["Tomaat met mozzarella"])
+        self.assertEqual(self._names("boter"), ["Kaas"])
+
+    def test_outdated_index(self):
+        """An index with a newer version empties the tables of the old one"""
+
+        class NewerSearchIndex(SearchIndex):
+            version = SearchIndex.version + 1
+
+        self.assertFalse(SearchIndex(self.connection).create())
+        self.assertTrue(NewerSearchIndex(self.connection).create())
+        self.assertEqual(self._names("tomaat"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from ugent_food.api.singleflight import SingleFlight
+
+__all__ = ["SingleFlightTest"]
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for coalescing concurrent calls"""
+
+    async def asyncSetUp(self):
+        """Create a call that only finishes once the test allows it to"""
+        self.single_flight = SingleFlight()
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def _call(self) -> int:
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+    async def _fail(self) -> int:
+        self.calls += 1
+        await self.release.wait()
+        raise ValueError("failed")
+
+    async def test_coalesces_concurrent_calls(self):
+        """Concurrent calls for the same key share one call and its result"""
+        waiters = [asyncio.ensure_future(self.single_flight.do("menu", self._call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        self.assertEqual(self.single_flight.in_flight, 1)
+
+        self.release.set()
+        self.assertEqual(await asyncio.gather(*waiters), [1, 1, 1])
+        self.assertEqual((self.calls, self.single_flight.executed, self.single_flight.coalesced), (1, 1, 2))
+        self.assertEqual(self.single_flight.in_flight, 0)
+
+    async def test_different_keys(self):
+        """Calls for different keys aren't combined"""
+        self.release.set()
+        await asyncio.gather(self.single_flight.do("a", self._call), self.single_flight.do("b", self._call))
+        self.assertEqual((self.calls, self.single_flight.coalesced), (2, 0))
+
+    async def test_sequential_calls(self):
+        """A call that finished isn't reused by the next one"""
+        self.release.set()
+        self.assertEqual(await self.single_flight.do("menu", self._call), 1)
+        self.assertEqual(await self.single_flight.do("menu", self._call), 2)
+
+    async def test_errors(self):
+        """An exception is raised for every waiter, and the next call is sent again"""
+        waiters = [asyncio.ensure_future(self.single_flight.do("menu", self._fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        for result in await asyncio.gather(*waiters, return_exceptions=True):
+            self.assertIsInstance(result, ValueError)
+
+        self.assertEqual(self.single_flight.in_flight, 0)
+        self.assertEqual(await self.single_flight.do("menu", self._call), 2)
+
+    async def test_cancelled_waiter(self):
+        """Cancelling one waiter doesn't cancel the call for the others"""
+        first = asyncio.ensure_future(self.single_flight.do("menu", self._call))
+        second = asyncio.ensure_future(self.single_flight.do("menu", self._call))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        self.release.set()
+
+        self.assertEqual(await second, 1)
+        self.assertTrue(first.cancelled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import sqlite3
+import unittest
+from datetime import date
+
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Meal, Menu, Price
+from ugent_food.api.stats import PriceSummary, StatsIndex, WeekShare, compute_stats
+
+__all__ = ["StatsTest"]
+
+# Sunday, Monday & Tuesday, which are in two different ISO weeks
+SUNDAY = date(2026, 10, 11)
+MONDAY = date(2026, 10, 12)
+TUESDAY = date(2026, 10, 13)
+
+
+def _meal(name: str, kind: MealKind, cents: int, type_: MealType = MealType.MAIN) -> Meal:
+    return Meal(kind=kind, name=name, price=Price(cents), type=type_)
+
+
+class StatsTest(unittest.TestCase):
+    """Tests for indexing menus and aggregating them"""
+
+    def setUp(self):
+        """Index the menus of a few days in an in-memory database"""
+        self.connection = sqlite3.connect(":memory:")
+        self.index = StatsIndex(self.connection)
+        self.index.create()
+
+        self.index.index_menu("nl", SUNDAY, Menu(open=False))
+        self.index.index_menu(
+            "nl",
+            MONDAY,
+            Menu(
+                open=True,
+                meals=(
+                    _meal("Curry", MealKind.VEGAN, 520),
+                    _meal("Stoofvlees", MealKind.MEAT, 700),
+                    _meal("Tomatensoep", MealKind.SOUP, 150),
+                    _meal("Frietjes", MealKind.VEGAN, 200, MealType.SIDE),
+                ),
+            ),
+        )
+        self.index.index_menu(
+            "nl",
+            TUESDAY,
+            Menu(open=True, meals=(_meal("Curry", MealKind.VEGAN, 540), _meal("Lasagne", MealKind.VEGETARIAN, 600))),
+        )
+        self.index.index_menu("en", TUESDAY, Menu(open=True, meals=(_meal("Curry", MealKind.VEGAN, 540),)))
+
+    def tearDown(self):
+        """Close the database"""
+        self.connection.close()
+
+    def test_load(self):
+        """The indexed menus of a language are loaded into an archive"""
+        archive = self.index.load("nl")
+
+        self.assertEqual(archive.days(), [SUNDAY, MONDAY, TUESDAY])
+        self.assertFalse(archive.is_open(SUNDAY))
+        self.assertEqual(
+            [meal.name for meal in archive.meals(MONDAY)], ["Curry", "Stoofvlees", "Tomatensoep", "Frietjes"]
+        )
+        self.assertEqual(list(archive.meals(TUESDAY))[1], _meal("Lasagne", MealKind.VEGETARIAN, 600))
+
+        self.assertEqual(self.index.load("nl", MONDAY, MONDAY).days(), [MONDAY])
+        self.assertEqual(self.index.load("en").days(), [TUESDAY])
+
+    def test_reindex_day(self):
+        """Indexing a day again replaces its meals"""
+        self.index.index_menu("nl", MONDAY, Menu(open=True, meals=(_meal("Pasta", MealKind.VEGAN, 500),)))
+        self.assertEqual([meal.name for meal in self.index.load("nl").meals(MONDAY)], ["Pasta"])
+
+    def test_compute_stats(self):
+        """Prices are summarized per kind, main courses counted per week, and dishes by how often they're served"""
+        stats = compute_stats(self.index.load("nl"), top=1)
+
+        self.assertEqual((stats.start, stats.end, stats.days), (SUNDAY, TUESDAY, 3))
+        self.assertEqual(stats.closed, [SUNDAY])
+        self.assertEqual(
+            stats.prices[MealKind.VEGAN], PriceSummary(count=3, minimum=200, median=520, mean=420, maximum=540)
+        )
+        self.assertEqual(stats.weeks, [WeekShare(year=2026, week=42, meals=4, vegan=2, vegetarian=1)])
+        self.assertEqual(stats.dishes, [("Curry", 2)])
+
+    def test_compute_stats_range(self):
+        """The range that was asked for is kept, also when there are no days in it"""
+        start, end = date(2026, 11, 1), date(2026, 11, 30)
+        stats = compute_stats(self.index.load("nl", start, end), start=start, end=end)
+
+        self.assertEqual((stats.start, stats.end, stats.days), (start, end, 0))
+        self.assertEqual((stats.prices, stats.weeks, stats.dishes), ({}, [], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
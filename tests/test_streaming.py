@@ -0,0 +1,170 @@
+import asyncio
+import importlib.util
+import json
+import random
+import sys
+import types
+import unittest
+from typing import Any, AsyncIterator
+from unittest import mock
+
+from ugent_food.api import streaming
+from ugent_food.api.streaming import _ArrayParser, iter_json_array
+from ugent_food.exceptions import DecodingError
+
+__all__ = ["ArrayParserTest", "BackendTest", "IterJsonArrayTest"]
+
+# Strings with brackets, escapes and multi-byte characters, and numbers that can be cut off anywhere
+TEXT = json.dumps(
+    [
+        {"name": "Kaas [jong]", "ingredients": ["kaas", "boter {zacht}"], "price_small": "2,00"},
+        {"name": 'Tomaat "mozzarella"', "ingredients": ["tomaat\\", "basilicum"], "price_small": "2,60"},
+        {"name": "Crème brûlée ☕", "nested": [[], [{}], {"a": [1, 2]}]},
+        -12.5e3,
+        "]",
+        True,
+        None,
+        [],
+        0,
+    ]
+)
+ITEMS = json.loads(TEXT)
+
+
+async def _chunks(data: bytes, sizes: list[int], consumed: list[int]) -> AsyncIterator[bytes]:
+    """Yield [data] in chunks of [sizes], counting how many chunks were consumed"""
+    pos = 0
+    for size in sizes:
+        consumed.append(size)
+        yield data[pos : pos + size]
+        pos += size
+
+    if pos < len(data):
+        consumed.append(len(data) - pos)
+        yield data[pos:]
+
+
+def _parse(data: bytes, sizes: list[int]) -> list[Any]:
+    async def _collect() -> list[Any]:
+        return [item async for item in iter_json_array(_chunks(data, sizes, []))]
+
+    return asyncio.run(_collect())
+
+
+class ArrayParserTest(unittest.TestCase):
+    """Tests for splitting the text of an array into its items"""
+
+    def test_split_anywhere(self):
+        """The items are the same no matter where the text is split"""
+        for split in range(len(TEXT) + 1):
+            with self.subTest(split=split):
+                parser = _ArrayParser()
+                items = parser.feed(TEXT[:split]) + parser.feed(TEXT[split:], final=True)
+                self.assertEqual(items, ITEMS)
+
+    def test_one_character_at_a_time(self):
+        """Items are returned as soon as they're complete"""
+        parser = _ArrayParser()
+        items = []
+        for char in TEXT:
+            items.extend(parser.feed(char))
+
+        # The number at the end can only be complete once the array is closed
+        self.assertEqual(items + parser.feed("", final=True), ITEMS)
+
+    def test_incomplete_number(self):
+        """Numbers that are cut off wait for the rest of them"""
+        parser = _ArrayParser()
+        self.assertEqual(parser.feed("[1"), [])
+        self.assertEqual(parser.feed(".5e"), [])
+        self.assertEqual(parser.feed("2, 3"), [150.0])
+        self.assertEqual(parser.feed("]", final=True), [3])
+
+    def test_invalid_item_fails_right_away(self):
+        """An item that is complete but invalid is an error before the rest of the text arrives"""
+        parser = _ArrayParser()
+        self.assertEqual(parser.feed('[{"a": 1}, '), [{"a": 1}])
+
+        with self.assertRaises(DecodingError):
+            parser.feed('{"a": tru}, {"a": ')
+
+    def test_invalid_scalar(self):
+        """Scalars that aren't valid are an error once something follows them"""
+        for text in ("[tru,", "[1.5x,", '["a" "b"]'):
+            with self.subTest(text=text), self.assertRaises(DecodingError):
+                _ArrayParser().feed(text)
+
+    def test_malformed(self):
+        """Text that isn't a JSON array is an error"""
+        for text in ("{}", "[1 2]", "[1,]", "[1] 2", "[1", '["a', "[{]}]"):
+            with self.subTest(text=text), self.assertRaises(DecodingError):
+                _ArrayParser().feed(text, final=True)
+
+    def test_empty(self):
+        """Empty arrays have no items"""
+        self.assertEqual(_ArrayParser().feed(" [ ] ", final=True), [])
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    """Tests for parsing an array from a stream of bytes"""
+
+    def test_random_chunks(self):
+        """The items are the same for any chunk sizes, also when a character is split over multiple chunks"""
+        data = json.dumps(ITEMS, ensure_ascii=False).encode()
+        rng = random.Random(0)
+
+        for _ in range(200):
+            sizes = [rng.randint(1, 16) for _ in range(len(data))]
+            self.assertEqual(_parse(data, sizes), ITEMS)
+
+    def test_stops_at_invalid_item(self):
+        """The rest of the stream isn't read after an invalid item"""
+        data = b'[{"a": 1}, {"a": nope}, ' + b'{"a": 2}, ' * 100 + b"]"
+        consumed: list[int] = []
+
+        async def _collect():
+            return [item async for item in iter_json_array(_chunks(data, [10] * (len(data) // 10), consumed))]
+
+        with self.assertRaises(DecodingError):
+            asyncio.run(_collect())
+
+        self.assertLess(len(consumed), 5)
+
+    def test_invalid_utf8(self):
+        """Bytes that aren't UTF-8 are a DecodingError"""
+        with self.assertRaises(DecodingError):
+            _parse(b'["\xff"]', [])
+
+
+class BackendTest(unittest.TestCase):
+    """Tests for choosing the JSON parser"""
+
+    def test_without_orjson(self):
+        """The json module is used when orjson isn't installed"""
+        with mock.patch.dict(sys.modules, {"orjson": None}):
+            name, loads = streaming._load_backend()
+
+        self.assertEqual(name, "json")
+        self.assertEqual(loads(b'{"a": [1]}'), {"a": [1]})
+
+    def test_with_orjson(self):
+        """The orjson module is used when it's installed"""
+        fake = types.ModuleType("orjson")
+        fake.loads = json.loads  # type: ignore[attr-defined]
+
+        with mock.patch.dict(sys.modules, {"orjson": fake}):
+            name, loads = streaming._load_backend()
+
+        self.assertEqual(name, "orjson")
+        self.assertIs(loads, fake.loads)  # type: ignore[attr-defined]
+
+    @unittest.skipIf(importlib.util.find_spec("orjson") is None, "orjson isn't installed")
+    def test_orjson_loads(self):
+        """The orjson module parses the same bytes to the same items"""
+        import orjson  # type: ignore
+
+        self.assertEqual(orjson.loads(TEXT.encode()), ITEMS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from ugent_food.tracing import Tracer, shared_trace_config
+
+__all__ = ["SharedTraceConfigTest"]
+
+
+async def _request(trace_config, url: str):
+    """Send the signals of a request that succeeded, without sending anything"""
+    context = SimpleNamespace()
+    params = SimpleNamespace(method="GET", url=url, response=SimpleNamespace(status=200))
+
+    for callback in trace_config.on_request_start:
+        await callback(None, context, params)
+
+    for callback in trace_config.on_request_end:
+        await callback(None, context, params)
+
+
+class SharedTraceConfigTest(unittest.TestCase):
+    """Tests for recording the requests of a session that outlives its tracers"""
+
+    def test_active_tracer(self):
+        """Requests are recorded in the tracer that is active when they're sent"""
+        trace_config = shared_trace_config()
+        first, second = Tracer(), Tracer()
+
+        with first.activate("first"):
+            asyncio.run(_request(trace_config, "https://example.com/a"))
+
+        # Without an active tracer, nothing is recorded
+        asyncio.run(_request(trace_config, "https://example.com/b"))
+
+        with second.activate("second"):
+            asyncio.run(_request(trace_config, "https://example.com/c"))
+
+        self.assertEqual(
+            [(s.name, s.attributes.get("url")) for s in first.spans],
+            [("first", None), ("http.request", "https://example.com/a")],
+        )
+        self.assertEqual([s.attributes.get("url") for s in second.spans], [None, "https://example.com/c"])
+        self.assertEqual(second.spans[1].parent, second.spans[0])
+        self.assertEqual(second.spans[1].attributes["status"], 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
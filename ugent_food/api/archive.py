@@ -0,0 +1,197 @@
+import sys
+from array import array
+from datetime import date
+from typing import Iterable, Iterator, Optional
+
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Meal, Menu, Price
+
+__all__ = ["EncodedMeal", "KINDS", "KIND_CODES", "MenuArchive", "NO_PRICE", "TYPES", "TYPE_CODES", "encode_meal"]
+
+# Kinds & types are stored as their position in these tuples (the stats index stores them as well,
+# so bump its version if they change)
+KINDS: tuple[MealKind, ...] = tuple(MealKind)
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+TYPES: tuple[MealType, ...] = tuple(MealType)
+TYPE_CODES = {type_: code for code, type_ in enumerate(TYPES)}
+
+# Meals without a price (or with a price that couldn't be parsed)
+NO_PRICE = -1
+
+# A meal as it's stored in the columns: (kind code, type code, name, price in cents)
+EncodedMeal = tuple[int, int, str, int]
+
+
+def encode_meal(meal: Meal) -> EncodedMeal:
+    """Get the values of a meal in the way they're stored in the columns"""
+    cents = meal.price.cents if meal.price is not None else None
+    return KIND_CODES[meal.kind], TYPE_CODES[meal.type], meal.name, cents if cents is not None else NO_PRICE
+
+
+class MenuArchive:
+    """Compact storage for the menus of many days
+
+    Instead of keeping a Menu with a list of Meal instances around for every day, all meals are
+    stored in parallel columns: the enums as single-byte codes, the prices as cents, and the names as
+    interned strings (which are shared between all days that serve the same dish). The meals of a day are
+    always stored next to each other, so a day only has to remember where its meals start and end.
+
+    Adding a day that is already in the archive replaces its menu.
+    """
+
+    # Columns for the days
+    _days: list[date]
+    _day_rows: dict[date, int]
+    _open: array
+    _messages: list[Optional[str]]
+    _vegetables: list[tuple[str, ...]]
+    _meals_start: array
+    _meals_end: array
+
+    # Columns for the meals
+    _meal_kinds: array
+    _meal_types: array
+    _meal_names: list[str]
+    _meal_prices: array
+    # The text of prices that couldn't be parsed, by the index of their meal (they're rare, so not a column)
+    _meal_price_texts: dict[int, str]
+
+    def __init__(self):
+        self._days = []
+        self._day_rows = {}
+        self._open = array("b")
+        self._messages = []
+        self._vegetables = []
+        self._meals_start = array("L")
+        self._meals_end = array("L")
+
+        self._meal_kinds = array("B")
+        self._meal_types = array("B")
+        self._meal_names = []
+        self._meal_prices = array("l")
+        self._meal_price_texts = {}
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __contains__(self, day: date) -> bool:
+        return day in self._day_rows
+
+    def add(self, day: date, menu: Menu):
+        """Add the menu for a day to the archive"""
+        start = len(self._meal_names)
+        self.add_encoded(day, menu.open, map(encode_meal, menu.meals), message=menu.message, vegetables=menu.vegetables)
+
+        for index, meal in enumerate(menu.meals, start=start):
+            if meal.price is not None and meal.price.cents is None:
+                self._meal_price_texts[index] = meal.price.text
+
+    def add_encoded(
+        self,
+        day: date,
+        is_open: bool,
+        meals: Iterable[EncodedMeal],
+        *,
+        message: Optional[str] = None,
+        vegetables: Iterable[str] = (),
+    ):
+        """Add a day whose meals are already encoded (see encode_meal), without creating any Meals"""
+        start = len(self._meal_names)
+
+        for kind, type_, name, cents in meals:
+            self._meal_kinds.append(kind)
+            self._meal_types.append(type_)
+            self._meal_names.append(sys.intern(name))
+            self._meal_prices.append(cents)
+
+        end = len(self._meal_names)
+        vegetables = tuple(map(sys.intern, vegetables))
+
+        # Replace an existing day, its old meals are left behind in the columns
+        row = self._day_rows.get(day)
+        if row is not None:
+            self._open[row] = is_open
+            self._messages[row] = message
+            self._vegetables[row] = vegetables
+            self._meals_start[row] = start
+            self._meals_end[row] = end
+            return
+
+        self._day_rows[day] = len(self._days)
+        self._days.append(day)
+        self._open.append(is_open)
+        self._messages.append(message)
+        self._vegetables.append(vegetables)
+        self._meals_start.append(start)
+        self._meals_end.append(end)
+
+    def days(self) -> list[date]:
+        """Get all days in the archive, in chronological order"""
+        return sorted(self._days)
+
+    def is_open(self, day: date) -> bool:
+        """Check if the restaurants were open on a day in the archive"""
+        return bool(self._open[self._day_rows[day]])
+
+    def encoded_meals(self, day: date) -> tuple[array, array, list[str], array]:
+        """Get the kind codes, type codes, names & prices of the meals served on a day in the archive
+
+        These are slices of the columns, so nothing has to be decoded into Meals to aggregate them.
+        """
+        row = self._day_rows[day]
+        start, end = self._meals_start[row], self._meals_end[row]
+        return (
+            self._meal_kinds[start:end],
+            self._meal_types[start:end],
+            self._meal_names[start:end],
+            self._meal_prices[start:end],
+        )
+
+    def _meal(self, index: int) -> Meal:
+        cents = self._meal_prices[index]
+        text = self._meal_price_texts.get(index)
+
+        if cents != NO_PRICE:
+            price: Optional[Price] = Price(cents)
+        else:
+            price = Price(None, text) if text is not None else None
+
+        return Meal(
+            kind=KINDS[self._meal_kinds[index]],
+            name=self._meal_names[index],
+            price=price,
+            type=TYPES[self._meal_types[index]],
+        )
+
+    def _meals_at(self, row: int) -> Iterator[Meal]:
+        for index in range(self._meals_start[row], self._meals_end[row]):
+            yield self._meal(index)
+
+    def _menu_at(self, row: int) -> Menu:
+        return Menu(
+            open=bool(self._open[row]),
+            meals=tuple(self._meals_at(row)),
+            vegetables=list(self._vegetables[row]),
+            message=self._messages[row],
+        )
+
+    def meals(self, day: date) -> Iterator[Meal]:
+        """Iterate over the meals served on a day"""
+        row = self._day_rows.get(day)
+        if row is None:
+            return iter(())
+
+        return self._meals_at(row)
+
+    def get(self, day: date) -> Optional[Menu]:
+        """Get the menu for a day, if it's in the archive"""
+        row = self._day_rows.get(day)
+        if row is None:
+            return None
+
+        return self._menu_at(row)
+
+    def __iter__(self) -> Iterator[tuple[date, Menu]]:
+        """Iterate over all days & their menus, in chronological order"""
+        for day in self.days():
+            yield day, self._menu_at(self._day_rows[day])
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import ClassVar, Iterable
+
+from ugent_food.api.models import Menu, Sandwich
+
+__all__ = ["ArchiveIndex"]
+
+_VERSIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS index_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+)
+"""
+
+
+class ArchiveIndex(ABC):
+    """Base class for tables that are derived from the archive, and kept up-to-date with it
+
+    The archive passes every menu (and list of sandwiches) that changed to all of its indexes.
+    Every index has a [version], which should be bumped whenever the way it's filled in changes.
+    Outdated indexes are emptied, and filled again with everything in the archive.
+    """
+
+    name: ClassVar[str]
+    version: ClassVar[int]
+
+    # Statements that create the tables of the index, and the tables that have to be emptied when it's outdated
+    _schema: ClassVar[tuple[str, ...]]
+    _tables: ClassVar[tuple[str, ...]]
+
+    _connection: sqlite3.Connection
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def create(self) -> bool:
+        """Create the tables of the index if they don't exist yet
+
+        Returns True if the index is new (or outdated) and has to be filled with everything that
+        was already archived, in which case all of its entries have been removed.
+        """
+        self._connection.execute(_VERSIONS_SCHEMA)
+
+        for statement in self._schema:
+            self._connection.execute(statement)
+
+        row = self._connection.execute("SELECT version FROM index_versions WHERE name = ?", (self.name,)).fetchone()
+        if row is not None and row[0] >= self.version:
+            return False
+
+        for table in self._tables:
+            self._connection.execute(f"DELETE FROM {table}")  # noqa: S608
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO index_versions (name, version) VALUES (?, ?)", (self.name, self.version)
+        )
+        return True
+
+    @abstractmethod
+    def index_menu(self, language: str, day: date, menu: Menu):
+        """Replace the entries for the menu of a day"""
+
+    @abstractmethod
+    def index_sandwiches(self, language: str, sandwiches: Iterable[Sandwich]):
+        """Replace the entries for the sandwiches"""
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+__all__ = [
+    "CACHE_PATH",
+    "Cache",
+    "CacheEntry",
+    "MemoryCache",
+    "MenuCache",
+    "SANDWICHES_KEY",
+    "SANDWICHES_TTL",
+    "menu_key",
+    "menu_ttl",
+]
+
+_logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path.home() / ".ugent_food_cache"
+SANDWICHES_KEY = "sandwiches"
+
+# Menus for days that have already passed are very unlikely to still change,
+# menus for today & the future can still be updated by the restaurants
+PAST_MENU_TTL = timedelta(days=30)
+MENU_TTL = timedelta(hours=1)
+SANDWICHES_TTL = timedelta(days=1)
+
+
+def menu_key(language: str, day: date) -> str:
+    """Get the cache key for the menu of a given day"""
+    return f"menu-{language}-{day.isoformat()}"
+
+
+def menu_ttl(day: date, today: Optional[date] = None) -> timedelta:
+    """Get the amount of time the menu for a given day can be cached for"""
+    if today is None:
+        today = date.today()
+
+    if day < today:
+        return PAST_MENU_TTL
+
+    return MENU_TTL
+
+
+def _modified_time(path: Path) -> float:
+    """Get the modification time of a file, or 0 if it was removed in the meantime"""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0
+
+
+@dataclass
+class CacheEntry:
+    """A cached API response, along with the information required to revalidate it"""
+
+    data: Any
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls, data: Any, ttl: timedelta, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> CacheEntry:
+        """Create a new entry that expires after [ttl]"""
+        return cls(data=data, expires_at=time.time() + ttl.total_seconds(), etag=etag, last_modified=last_modified)
+
+    @property
+    def is_fresh(self) -> bool:
+        """Check if this entry can still be used without asking the API"""
+        return time.time() < self.expires_at
+
+    @property
+    def can_revalidate(self) -> bool:
+        """Check if this entry can be revalidated using a conditional request"""
+        return self.etag is not None or self.last_modified is not None
+
+    def renewed(self, ttl: timedelta) -> CacheEntry:
+        """Get a copy of this entry with a new expiry time
+
+        Used when the API tells us that the cached data is still up-to-date
+        """
+        return replace(self, expires_at=time.time() + ttl.total_seconds())
+
+
+class Cache(ABC):
+    """Base class for caches of API responses"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry from the cache, if it exists"""
+
+    @abstractmethod
+    def put(self, key: str, entry: CacheEntry):
+        """Store an entry in the cache"""
+
+    @abstractmethod
+    def clear(self):
+        """Remove all entries from the cache"""
+
+
+class MemoryCache(Cache):
+    """In-memory cache for API responses, used by long-running processes
+
+    When there are more than [max_entries] entries, the least recently used ones are removed.
+    """
+
+    max_entries: int
+    _entries: OrderedDict[str, CacheEntry]
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry from the cache, if it exists"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+
+        return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        """Store an entry in the cache"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        self._entries.clear()
+
+
+class MenuCache(Cache):
+    """On-disk cache for API responses
+
+    Every entry is stored in a separate JSON file, named after its key. When there are
+    more than [max_entries] files, the ones that were written the longest ago are removed.
+    """
+
+    path: Path
+    max_entries: int
+
+    # The amount of files, counted when the first entry is stored and kept up-to-date afterwards
+    # (entries stored by other processes are only noticed the next time it's counted)
+    _count: Optional[int]
+
+    def __init__(self, path: Path = CACHE_PATH, max_entries: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+
+        self._count = None
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry from the cache, if it exists"""
+        try:
+            with self._entry_path(key).open("r", encoding="utf-8") as fp:
+                return CacheEntry(**json.load(fp))
+        except (OSError, ValueError, TypeError):
+            # Missing or corrupt entries are treated as cache misses
+            return None
+
+    def put(self, key: str, entry: CacheEntry):
+        """Store an entry in the cache
+
+        The response was already received, so if the entry can't be written it's only logged.
+        """
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            is_new = not entry_path.exists()
+
+            # Write to a temporary file first so that concurrent readers never see half an entry
+            with tmp_path.open("w", encoding="utf-8") as fp:
+                json.dump(asdict(entry), fp)
+
+            os.replace(tmp_path, entry_path)
+
+            if self._count is None:
+                self._count = sum(1 for _ in self.path.glob("*.json"))
+            elif is_new:
+                self._count += 1
+
+            if self._count > self.max_entries:
+                self._evict()
+        except OSError as e:
+            _logger.warning("Unable to store %s in the cache at %s: %s", key, self.path, e)
+
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        for entry_path in self.path.glob("*.json"):
+            entry_path.unlink(missing_ok=True)
+
+        self._count = None
+
+    def _evict(self):
+        """Remove the oldest entries until the cache is small enough again"""
+        entries = sorted(self.path.glob("*.json"), key=_modified_time)
+        for entry_path in entries[: len(entries) - self.max_entries]:
+            entry_path.unlink(missing_ok=True)
+
+        self._count = min(len(entries), self.max_entries)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import AsyncIterator, Iterable, Optional
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig
+
+from ugent_food.api.cache import Cache
+from ugent_food.api.models import Menu, MultilingualMenu, Sandwich
+from ugent_food.api.policy import RequestPolicy
+from ugent_food.api.singleflight import SingleFlight
+from ugent_food.api.storage import MenuStorage
+from ugent_food.api.wrapper import (
+    fetch_menu,
+    fetch_menus,
+    fetch_multilingual_menu,
+    fetch_multilingual_menus,
+    fetch_sandwiches,
+    iter_sandwiches,
+)
+from ugent_food.tracing import current_tracer
+
+__all__ = ["HydraClient"]
+
+
+class HydraClient:
+    """Client for the Hydra API that keeps one pool of connections alive
+
+    Meant to be used as an async context manager, and to be shared by everything that needs menus
+    (for example all handlers of a bot) instead of creating a new session every time:
+
+        async with HydraClient(cache=MemoryCache()) as client:
+            menu = await client.get_menu(date.today())
+
+    The [cache], [storage] and [policy] are passed on to every request, see the functions in
+    ugent_food.api.wrapper for their meaning. An existing [session] can be passed as well, in which
+    case the client doesn't create or close one by itself.
+
+    If a tracer is active when the session is created, the network phases of every request are
+    recorded as spans. Extra [trace_configs] are added to the session that the client creates.
+
+    Concurrent requests for the same endpoint are combined into one, [single_flight] keeps track of
+    how many requests were actually sent and how many were coalesced.
+    """
+
+    language: str
+    cache: Optional[Cache]
+    storage: Optional[MenuStorage]
+    policy: Optional[RequestPolicy]
+    concurrency: int
+    single_flight: SingleFlight
+
+    _connection_limit: int
+    _keepalive_timeout: float
+    _dns_cache_ttl: int
+    _trace_configs: list[TraceConfig]
+    _session: Optional[ClientSession]
+    _owns_session: bool
+
+    def __init__(
+        self,
+        *,
+        language: str = "nl",
+        cache: Optional[Cache] = None,
+        storage: Optional[MenuStorage] = None,
+        policy: Optional[RequestPolicy] = None,
+        concurrency: int = 4,
+        connection_limit: int = 10,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+        session: Optional[ClientSession] = None,
+        trace_configs: Iterable[TraceConfig] = (),
+    ):
+        self.language = language
+        self.cache = cache
+        self.storage = storage
+        self.policy = policy
+        self.concurrency = concurrency
+        self.single_flight = SingleFlight()
+
+        self._connection_limit = connection_limit
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._trace_configs = list(trace_configs)
+        self._session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self) -> HydraClient:
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def open(self):
+        """Create the session, if the client doesn't have one yet"""
+        if self._session is not None:
+            return
+
+        connector = TCPConnector(
+            limit=self._connection_limit,
+            keepalive_timeout=self._keepalive_timeout,
+            ttl_dns_cache=self._dns_cache_ttl,
+        )
+        trace_configs = list(self._trace_configs)
+
+        tracer = current_tracer()
+        if tracer is not None:
+            trace_configs.append(tracer.trace_config())
+
+        self._session = ClientSession(connector=connector, trace_configs=trace_configs or None)
+
+    async def close(self):
+        """Close the session, if it was created by the client"""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> ClientSession:
+        """The session that is used to send requests"""
+        if self._session is None:
+            raise RuntimeError("The client has not been opened yet, use it as an async context manager.")
+
+        return self._session
+
+    async def get_menu(
+        self, day: date, language: Optional[str] = None, *, refresh: bool = False, revalidate: bool = False
+    ) -> Menu:
+        """Get the menu for a given day"""
+        return await fetch_menu(
+            self.session,
+            day,
+            language or self.language,
+            cache=self.cache,
+            refresh=refresh,
+            revalidate=revalidate,
+            storage=self.storage,
+            policy=self.policy,
+            single_flight=self.single_flight,
+        )
+
+    async def get_menus(
+        self,
+        days: Iterable[date],
+        language: Optional[str] = None,
+        *,
+        refresh: bool = False,
+        revalidate: bool = False,
+    ) -> list[Optional[Menu]]:
+        """Get the menus for multiple days at once, days that don't have a menu are None"""
+        return await fetch_menus(
+            self.session,
+            list(days),
+            language or self.language,
+            concurrency=self.concurrency,
+            cache=self.cache,
+            refresh=refresh,
+            revalidate=revalidate,
+            storage=self.storage,
+            policy=self.policy,
+            single_flight=self.single_flight,
+        )
+
+    async def get_multilingual_menu(
+        self, day: date, languages: Iterable[str], *, refresh: bool = False
+    ) -> MultilingualMenu:
+        """Get the menu for a given day in multiple languages at once"""
+        return await fetch_multilingual_menu(
+            self.session,
+            day,
+            list(languages),
+            cache=self.cache,
+            refresh=refresh,
+            storage=self.storage,
+            policy=self.policy,
+            single_flight=self.single_flight,
+        )
+
+    async def get_multilingual_menus(
+        self, days: Iterable[date], languages: Iterable[str], *, refresh: bool = False
+    ) -> list[Optional[MultilingualMenu]]:
+        """Get the menus for multiple days at once in multiple languages, days that don't have a menu are None"""
+        return await fetch_multilingual_menus(
+            self.session,
+            list(days),
+            list(languages),
+            concurrency=self.concurrency,
+            cache=self.cache,
+            refresh=refresh,
+            storage=self.storage,
+            policy=self.policy,
+            single_flight=self.single_flight,
+        )
+
+    async def get_sandwiches(self, *, refresh: bool = False) -> list[Sandwich]:
+        """Get the list of available sandwiches"""
+        return await fetch_sandwiches(
+            self.session,
+            cache=self.cache,
+            refresh=refresh,
+            storage=self.storage,
+            policy=self.policy,
+            single_flight=self.single_flight,
+        )
+
+    def iter_sandwiches(self, *, refresh: bool = False) -> AsyncIterator[Sandwich]:
+        """Get the available sandwiches one by one, while the response is still coming in"""
+        return iter_sandwiches(
+            self.session, cache=self.cache, refresh=refresh, storage=self.storage, policy=self.policy
+        )
@@ -0,0 +1,157 @@
+from typing import Any, Optional
+
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import (
+    Meal,
+    Menu,
+    MultilingualMeal,
+    MultilingualMenu,
+    Price,
+    Sandwich,
+)
+from ugent_food.exceptions import DecodingError
+
+__all__ = ["decode_meal", "decode_menu", "decode_multilingual_menu", "decode_sandwich", "decode_sandwiches"]
+
+# Lookup tables are a lot faster than calling the Enum constructors
+_KINDS = {kind.value: kind for kind in MealKind}
+_TYPES = {type_.value: type_ for type_ in MealType}
+
+
+def _check_type(value: Any, type_: type, name: str) -> Any:
+    """Make sure a value has the expected type"""
+    if not isinstance(value, type_):
+        raise DecodingError(f'Expected "{name}" to be of type {type_.__name__}, got {type(value).__name__}.')
+
+    return value
+
+
+def _check_str_list(value: Any, name: str) -> list[str]:
+    """Make sure a value is a list of strings"""
+    _check_type(value, list, name)
+
+    for item in value:
+        _check_type(item, str, name)
+
+    return value
+
+
+def _decode_price(value: Any, name: str) -> Optional[Price]:
+    """Parse a price, which is always validated as it has to be parsed anyway"""
+    return Price.parse(_check_type(value, str, name))
+
+
+def decode_meal(data: dict, *, strict: bool = False) -> Meal:
+    """Create a Meal from the API response
+
+    By default, only the fields that need to be converted (the enums & the price) are validated. In [strict] mode,
+    the types of all other fields are checked as well.
+    """
+    try:
+        kind = _KINDS[data["kind"]]
+        type_ = _TYPES[data["type"]]
+        name = data["name"]
+        price = data["price"]
+    except (KeyError, TypeError) as e:
+        raise DecodingError(f"Invalid meal: {data!r}.") from e
+
+    if strict:
+        _check_type(name, str, "name")
+
+    return Meal(kind=kind, name=name, price=_decode_price(price, "price"), type=type_)
+
+
+def decode_menu(data: dict, *, strict: bool = False) -> Menu:
+    """Create a Menu from the API response
+
+    See decode_meal for the meaning of [strict].
+    """
+    try:
+        is_open = data["open"]
+        meals = data.get("meals", [])
+        vegetables = data.get("vegetables", [])
+        message = data.get("message")
+    except (KeyError, AttributeError, TypeError) as e:
+        raise DecodingError(f"Invalid menu: {data!r}.") from e
+
+    if strict:
+        _check_type(is_open, bool, "open")
+        _check_type(meals, list, "meals")
+        _check_str_list(vegetables, "vegetables")
+
+        if message is not None:
+            _check_type(message, str, "message")
+
+    # Outside of strict mode, meals & vegetables that are null are treated as empty lists
+    try:
+        decoded_meals = tuple(decode_meal(meal, strict=strict) for meal in meals or ())
+    except TypeError as e:
+        raise DecodingError(f"Invalid menu: {data!r}.") from e
+
+    return Menu(
+        open=is_open,
+        meals=decoded_meals,
+        vegetables=vegetables or [],
+        message=message,
+    )
+
+
+def decode_multilingual_menu(data: dict) -> MultilingualMenu:
+    """Create a MultilingualMenu from the output of MultilingualMenu.to_dict
+
+    These are never returned by the API itself, only stored in the cache.
+    """
+    try:
+        return MultilingualMenu(
+            languages=data["languages"],
+            open=data["open"],
+            meals=[
+                MultilingualMeal(
+                    kind=_KINDS[meal["kind"]],
+                    names=meal["names"],
+                    price=_decode_price(meal["price"], "price"),
+                    type=_TYPES[meal["type"]],
+                )
+                for meal in data["meals"]
+            ],
+            vegetables=data["vegetables"],
+            message=data["message"],
+        )
+    except (KeyError, TypeError) as e:
+        raise DecodingError(f"Invalid menu: {data!r}.") from e
+
+
+def decode_sandwich(data: dict, *, strict: bool = False) -> Sandwich:
+    """Create a Sandwich from the API response
+
+    See decode_meal for the meaning of [strict].
+    """
+    try:
+        name = data["name"]
+        ingredients = data["ingredients"]
+        price_small = data["price_small"]
+        price_medium = data["price_medium"]
+    except (KeyError, TypeError) as e:
+        raise DecodingError(f"Invalid sandwich: {data!r}.") from e
+
+    if strict:
+        _check_type(name, str, "name")
+        _check_str_list(ingredients, "ingredients")
+
+    return Sandwich(
+        name=name,
+        ingredients=ingredients,
+        price_small=_decode_price(price_small, "price_small"),
+        price_medium=_decode_price(price_medium, "price_medium"),
+    )
+
+
+def decode_sandwiches(data: list, *, strict: bool = False) -> list[Sandwich]:
+    """Create a list of Sandwiches from the API response
+
+    See decode_meal for the meaning of [strict]. The response itself is always checked, as anything other
+    than a list can't be decoded at all.
+    """
+    _check_type(data, list, "sandwiches")
+
+    return [decode_sandwich(sandwich, strict=strict) for sandwich in data]
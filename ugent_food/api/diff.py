@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import Any, Optional
+
+from ugent_food.api.models import Meal, Menu, Price
+from ugent_food.i18n import Translator
+
+__all__ = ["ChangeKind", "MenuChange", "diff_menus"]
+
+
+class ChangeKind(str, Enum):
+    """Enum for the different ways a menu can change"""
+
+    PUBLISHED = "published"
+    WITHDRAWN = "withdrawn"
+    OPENED = "opened"
+    CLOSED = "closed"
+    MEAL_ADDED = "meal_added"
+    MEAL_REMOVED = "meal_removed"
+    PRICE_CHANGED = "price_changed"
+    VEGETABLES_CHANGED = "vegetables_changed"
+    MESSAGE_CHANGED = "message_changed"
+
+
+@dataclass(frozen=True)
+class MenuChange:
+    """A change to the menu of a day
+
+    For changes to a meal, [meal] is the meal after the change (or before it, if it was removed).
+    [old] and [new] hold the values that changed, if any.
+    """
+
+    day: date
+    kind: ChangeKind
+    meal: Optional[Meal] = None
+    old: Any = None
+    new: Any = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Machine-readable representation of the change"""
+        return {
+            "date": self.day.isoformat(),
+            "change": self.kind.value,
+            "meal": (
+                {"type": self.meal.type.value, "kind": self.meal.kind.value, "name": self.meal.name}
+                if self.meal is not None
+                else None
+            ),
+            "old": _value(self.old),
+            "new": _value(self.new),
+        }
+
+    def describe(self, translator: Translator) -> str:
+        """Human-readable description of the change"""
+        return f"{self.day.isoformat()}: {self._describe_change(translator)}"
+
+    def _describe_change(self, translator: Translator) -> str:
+        if self.meal is not None:
+            return translator.change(
+                self.kind.value,
+                name=self.meal.name,
+                type=translator.type(self.meal.type),
+                kind=translator.kind(self.meal.kind),
+                price=translator.price(self.new),
+                old=translator.price(self.old),
+                new=translator.price(self.new),
+            )
+
+        if self.kind == ChangeKind.VEGETABLES_CHANGED:
+            return translator.change(self.kind.value, vegetables=", ".join(self.new))
+
+        if self.kind == ChangeKind.MESSAGE_CHANGED and not self.new:
+            return translator.change("message_removed")
+
+        return translator.change(self.kind.value, message=self.new)
+
+
+def _value(value: Any) -> Any:
+    """Machine-readable representation of a changed value, with prices written the way the API writes them"""
+    return str(value) if isinstance(value, Price) else value
+
+
+def _meal_key(meal: Meal) -> tuple[str, str, str]:
+    """Meals are identified by everything except their price, so that price changes can be detected"""
+    return meal.type.value, meal.kind.value, meal.name
+
+
+def diff_menus(day: date, old: Optional[Menu], new: Optional[Menu]) -> list[MenuChange]:
+    """Get the changes between two versions of the menu of a day
+
+    None means that there was no menu for that day.
+    """
+    if old is None and new is None:
+        return []
+
+    if old is None:
+        return [MenuChange(day, ChangeKind.PUBLISHED)]
+
+    if new is None:
+        return [MenuChange(day, ChangeKind.WITHDRAWN)]
+
+    changes = []
+
+    if old.open != new.open:
+        changes.append(MenuChange(day, ChangeKind.OPENED if new.open else ChangeKind.CLOSED))
+
+    old_meals = {_meal_key(meal): meal for meal in old.meals}
+    new_meals = {_meal_key(meal): meal for meal in new.meals}
+
+    for key, meal in old_meals.items():
+        if key not in new_meals:
+            changes.append(MenuChange(day, ChangeKind.MEAL_REMOVED, meal, old=meal.price))
+
+    for key, meal in new_meals.items():
+        old_meal = old_meals.get(key)
+
+        if old_meal is None:
+            changes.append(MenuChange(day, ChangeKind.MEAL_ADDED, meal, new=meal.price))
+        elif old_meal.price != meal.price:
+            changes.append(MenuChange(day, ChangeKind.PRICE_CHANGED, meal, old=old_meal.price, new=meal.price))
+
+    if old.vegetables != new.vegetables:
+        changes.append(MenuChange(day, ChangeKind.VEGETABLES_CHANGED, old=old.vegetables, new=new.vegetables))
+
+    if old.message != new.message:
+        changes.append(MenuChange(day, ChangeKind.MESSAGE_CHANGED, old=old.message, new=new.message))
+
+    return changes
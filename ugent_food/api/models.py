@@ -1,110 +1,378 @@
-from dataclasses import dataclass, field
-from datetime import date
-from typing import Optional
+from __future__ import annotations
 
-from tabulate import tabulate
+import functools
+from dataclasses import dataclass, field, fields
+from datetime import date
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Collection,
+    Iterator,
+    Optional,
+    TypeVar,
+)
 
 from ugent_food.api.enums import MealKind, MealType
-from ugent_food.cli.config import Config
+from ugent_food.api.prices import format_cents, parse_cents
 from ugent_food.i18n import Message
 
-__all__ = ["Menu", "Sandwich"]
+if TYPE_CHECKING:
+    from ugent_food.cli.config import Config
 
+__all__ = ["Meal", "Menu", "MultilingualMeal", "MultilingualMenu", "Price", "Sandwich"]
 
-@dataclass
+T = TypeVar("T", bound=type)
+
+
+def _slots_getstate(self) -> list:
+    return [getattr(self, _field.name) for _field in fields(self)]
+
+
+def _slots_setstate(self, state: list):
+    # Frozen dataclasses don't allow setting attributes, so go around their __setattr__
+    for _field, value in zip(fields(self), state):
+        object.__setattr__(self, _field.name, value)
+
+
+def _add_slots(cls: T) -> T:
+    """Recreate a dataclass with __slots__ for all of its fields
+
+    Instances of slotted classes don't carry a __dict__ around, which makes them a lot smaller.
+    This does the same as dataclass(slots=True), which is only available starting from Python 3.10.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(_field.name for _field in fields(cls))
+
+    cls_dict["__slots__"] = field_names
+
+    # Class attributes with the same name as a slot aren't allowed, so every default is removed from the class.
+    # __init__ still sets the defaults of regular fields, but not those of fields with init=False: those would
+    # never be set, so they have to use a default_factory instead (which __init__ does call)
+    for name in field_names:
+        cls_dict.pop(name, None)
+
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    # Without a __dict__, frozen instances can't be unpickled by default
+    if cls.__dataclass_params__.frozen:  # type: ignore[attr-defined]
+        cls_dict["__getstate__"] = _slots_getstate
+        cls_dict["__setstate__"] = _slots_setstate
+
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)  # type: ignore[return-value]
+
+
+@_add_slots
+@dataclass(frozen=True)
+class Price:
+    """An amount of money, stored in cents
+
+    Prices are parsed once when the API response is decoded, so sorting & comparing them doesn't involve
+    any strings. Use Translator.price to display them, str() gives the format the API uses ("€ 5,20").
+    If the API writes a price in a way that can't be parsed, [cents] is None and its [text] is shown as-is.
+    """
+
+    cents: Optional[int]
+    text: str = ""
+
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def parse(cls, price: str) -> Optional[Price]:
+        """Parse a price like "€ 5,20" or "5,20", returns None if it's empty
+
+        There are only a handful of different prices, so they're parsed once and shared by all meals & sandwiches.
+        """
+        cents = parse_cents(price)
+        if cents is not None:
+            return cls(cents)
+
+        text = price.strip()
+        return cls(None, text) if text else None
+
+    def __str__(self) -> str:
+        return format_cents(self.cents) if self.cents is not None else self.text
+
+
+@_add_slots
+@dataclass(frozen=True)
 class Meal:
-    """A meal on the menu"""
+    """A meal on the menu, [price] is None if it doesn't have one"""
 
     kind: MealKind
     name: str
-    price: str
+    price: Optional[Price]
     type: MealType
 
 
+@_add_slots
 @dataclass
 class Menu:
-    """The menu for the main dishes available on a given day"""
+    """The menu for the main dishes available on a given day
+
+    [meals] is a tuple, so the meals that were grouped for displaying them can't change afterwards.
+    """
 
     open: bool
-    meals: list[Meal] = field(default_factory=list)
+    meals: tuple[Meal, ...] = ()
     vegetables: list[str] = field(default_factory=list)
     message: Optional[str] = None
 
-    _main_kinds_order: list[MealKind] = field(
-        init=False,
-        default_factory=lambda: [MealKind.MEAT, MealKind.FISH, MealKind.VEGETARIAN, MealKind.VEGAN, MealKind.SOUP],
+    _main_kinds_order: ClassVar[tuple[MealKind, ...]] = (
+        MealKind.MEAT,
+        MealKind.FISH,
+        MealKind.VEGETARIAN,
+        MealKind.VEGAN,
+        MealKind.SOUP,
     )
+    _types_order: ClassVar[tuple[MealType, ...]] = (MealType.MAIN, MealType.SIDE, MealType.COLD)
 
-    def _get_meals_by_type(self, meal_type: MealType) -> list[Meal]:
-        """Get all meals of a given type"""
-        meals = []
-        type_meals = list(filter(lambda x: x.type == meal_type, self.meals))
+    # Meals grouped by (type, kind), built the first time it's needed, and the meals they were built from
+    _buckets: dict[tuple[MealType, MealKind], list[Meal]] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
+    _bucketed: Optional[tuple[Meal, ...]] = field(init=False, default_factory=lambda: None, repr=False, compare=False)
 
-        # Group by kind, in order
-        for kind in self._main_kinds_order:
-            for meal in type_meals:
-                if meal.kind == kind:
-                    meals.append(meal)
+    def _get_buckets(self) -> dict[tuple[MealType, MealKind], list[Meal]]:
+        """Group all meals by their type and kind in a single pass
 
-        return meals
+        The meals can't be modified, so this only has to be done again when they're replaced.
+        """
+        if self._bucketed is not self.meals:
+            buckets: dict[tuple[MealType, MealKind], list[Meal]] = {}
+            for meal in self.meals:
+                buckets.setdefault((meal.type, meal.kind), []).append(meal)
 
-    def to_string(self, config: Config, day: date) -> str:
-        """String representation of a menu: table of all dishes"""
-        aggregated = []
+            self._buckets = buckets
+            self._bucketed = self.meals
 
-        if not self.open:
-            aggregated.append(config.translator.message(Message.RESTO_CLOSED, day=day))
+        return self._buckets
+
+    def iter_meals(self, hidden: Collection[str] = ()) -> Iterator[Meal]:
+        """Iterate over all meals in the order they should be displayed in
 
-        table_data: list[list[str]] = []
+        Meals are grouped by their type, and then by their kind. Kinds in [hidden] are left out,
+        without modifying the menu itself.
+        """
+        buckets = self._get_buckets()
 
-        # Remove hidden meals
-        acceptable_kinds = list(filter(lambda x: x not in config.hidden, self._main_kinds_order))
-        self.meals = list(filter(lambda _meal: _meal.kind in acceptable_kinds, self.meals))
+        for _type in self._types_order:
+            for kind in self._main_kinds_order:
+                if kind in hidden:
+                    continue
 
-        for _type in [MealType.MAIN, MealType.SIDE, MealType.COLD]:
-            meals = self._get_meals_by_type(_type)
+                yield from buckets.get((_type, kind), ())
 
-            for meal in meals:
-                meal_data = [
-                    config.translator.type(meal.type),
-                    config.translator.kind(meal.kind),
-                    meal.name,
-                    meal.price,
-                ]
+    def fingerprint(self) -> tuple:
+        """Hashable representation of the content of the menu, which is equal for menus with the same content"""
+        return self.open, self.meals, tuple(self.vegetables), self.message
 
-                table_data.append(meal_data)
+    def table(self, config: Config) -> str:
+        """Table of all dishes, which is the part of to_string that doesn't depend on the day"""
+        from tabulate import tabulate
+
+        translator = config.translator
+        table_data: list[list[str]] = [
+            [
+                translator.type(meal.type),
+                translator.kind(meal.kind),
+                meal.name,
+                translator.price(meal.price),
+            ]
+            for meal in self.iter_meals(config.hidden)
+        ]
+
+        return tabulate(table_data, headers=translator.menu_table_headers())
+
+    def to_string(self, config: Config, day: date, *, table: Optional[str] = None) -> str:
+        """String representation of a menu: table of all dishes
+
+        If the [table] was already created using Menu.table, it isn't created again.
+        """
+        translator = config.translator
+        aggregated = []
+
+        if not self.open:
+            aggregated.append(translator.message(Message.RESTO_CLOSED, day=day))
 
         # Menu header
-        weekday = config.translator.weekday(day.weekday())
+        weekday = translator.weekday(day.weekday())
         day_str = day.strftime("%d/%m/%Y")
 
-        # Create table
-        aggregated.append(config.translator.message(Message.MENU_FOR, day=day_str, weekday=weekday))
-        aggregated.append("\n" + tabulate(table_data, headers=config.translator.menu_table_headers()))
+        aggregated.append(translator.message(Message.MENU_FOR, day=day_str, weekday=weekday))
+        aggregated.append("\n" + (table if table is not None else self.table(config)))
 
         if self.vegetables:
             vegetables_str = "\n".join(map(lambda x: f"- {x}", self.vegetables))
-            aggregated.append("\n" + config.translator.message(Message.VEGETABLES, vegetables=vegetables_str))
+            aggregated.append("\n" + translator.message(Message.VEGETABLES, vegetables=vegetables_str))
 
         if self.message:
-            aggregated.append("\n" + config.translator.message(Message.EXTRA_MESSAGE, extra=self.message))
+            aggregated.append("\n" + translator.message(Message.EXTRA_MESSAGE, extra=self.message))
 
         return "\n".join(aggregated)
 
 
+@_add_slots
+@dataclass
+class MultilingualMeal:
+    """A meal on the menu, with its name in multiple languages
+
+    Languages that don't have this meal on their menu have None as the name.
+    """
+
+    kind: MealKind
+    names: dict[str, Optional[str]]
+    price: Optional[Price]
+    type: MealType
+
+
+@_add_slots
+@dataclass
+class MultilingualMenu:
+    """The menu for a given day in multiple languages at once, with the meals aligned across languages
+
+    The vegetables & messages are kept per language, as they can't be matched up one by one.
+    """
+
+    languages: list[str]
+    open: bool
+    meals: list[MultilingualMeal] = field(default_factory=list)
+    vegetables: dict[str, list[str]] = field(default_factory=dict)
+    message: dict[str, Optional[str]] = field(default_factory=dict)
+
+    @classmethod
+    def merge(cls, menus: dict[str, Menu]) -> MultilingualMenu:
+        """Merge the menus of the same day in different languages
+
+        The API returns the meals in the same order in every language, so meals are matched by their type,
+        their kind, and their position among the other meals of that type & kind.
+        """
+        buckets = {language: menu._get_buckets() for language, menu in menus.items()}
+        meals = []
+
+        for _type in Menu._types_order:
+            for kind in Menu._main_kinds_order:
+                matched = {language: bucket.get((_type, kind), []) for language, bucket in buckets.items()}
+
+                for index in range(max(map(len, matched.values()), default=0)):
+                    names = {
+                        language: language_meals[index].name if index < len(language_meals) else None
+                        for language, language_meals in matched.items()
+                    }
+
+                    # The price of the first language that has this meal
+                    price = next(
+                        language_meals[index].price
+                        for language_meals in matched.values()
+                        if index < len(language_meals)
+                    )
+
+                    meals.append(MultilingualMeal(kind=kind, names=names, price=price, type=_type))
+
+        return cls(
+            languages=list(menus),
+            open=any(menu.open for menu in menus.values()),
+            meals=meals,
+            vegetables={language: menu.vegetables for language, menu in menus.items()},
+            message={language: menu.message for language, menu in menus.items()},
+        )
+
+    def iter_meals(self, hidden: Collection[str] = ()) -> Iterator[MultilingualMeal]:
+        """Iterate over all meals in the order they should be displayed in, leaving out kinds in [hidden]"""
+        return (meal for meal in self.meals if meal.kind not in hidden)
+
+    def fingerprint(self) -> tuple:
+        """Hashable representation of the content of the menu, which is equal for menus with the same content"""
+        return (
+            tuple(self.languages),
+            self.open,
+            tuple((meal.kind, tuple(meal.names.items()), meal.price, meal.type) for meal in self.meals),
+            tuple((language, tuple(vegetables)) for language, vegetables in self.vegetables.items()),
+            tuple(self.message.items()),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Machine-readable representation of the menu, which can be turned back into a menu by decoding it"""
+        return {
+            "languages": self.languages,
+            "open": self.open,
+            "meals": [
+                {
+                    "kind": meal.kind.value,
+                    "names": meal.names,
+                    "price": str(meal.price) if meal.price is not None else "",
+                    "type": meal.type.value,
+                }
+                for meal in self.meals
+            ],
+            "vegetables": self.vegetables,
+            "message": self.message,
+        }
+
+    def table(self, config: Config) -> str:
+        """Table of all dishes with a name column for every language, without anything that depends on the day"""
+        from tabulate import tabulate
+
+        translator = config.translator
+        table_data: list[list[str]] = [
+            [
+                translator.type(meal.type),
+                translator.kind(meal.kind),
+                *(meal.names[language] or "" for language in self.languages),
+                translator.price(meal.price),
+            ]
+            for meal in self.iter_meals(config.hidden)
+        ]
+
+        # One name column per language
+        type_header, kind_header, name_header, price_header = translator.menu_table_headers()
+        headers = [
+            type_header,
+            kind_header,
+            *(f"{name_header} ({language})" for language in self.languages),
+            price_header,
+        ]
+
+        return tabulate(table_data, headers=headers)
+
+    def to_string(self, config: Config, day: date, *, table: Optional[str] = None) -> str:
+        """String representation of a menu: table of all dishes, with a name column for every language
+
+        The vegetables & message are shown in the configured language if possible. If the [table] was
+        already created using MultilingualMenu.table, it isn't created again.
+        """
+        translator = config.translator
+        primary = config.language if config.language in self.languages else self.languages[0]
+        aggregated = []
+
+        if not self.open:
+            aggregated.append(translator.message(Message.RESTO_CLOSED, day=day))
+
+        # Menu header
+        weekday = translator.weekday(day.weekday())
+        day_str = day.strftime("%d/%m/%Y")
+
+        aggregated.append(translator.message(Message.MENU_FOR, day=day_str, weekday=weekday))
+        aggregated.append("\n" + (table if table is not None else self.table(config)))
+
+        vegetables = self.vegetables.get(primary)
+        if vegetables:
+            vegetables_str = "\n".join(map(lambda x: f"- {x}", vegetables))
+            aggregated.append("\n" + translator.message(Message.VEGETABLES, vegetables=vegetables_str))
+
+        message = self.message.get(primary)
+        if message:
+            aggregated.append("\n" + translator.message(Message.EXTRA_MESSAGE, extra=message))
+
+        return "\n".join(aggregated)
+
+
+@_add_slots
 @dataclass
 class Sandwich:
-    """A sandwich available in the restaurants"""
+    """A sandwich available in the restaurants, the prices are None if it isn't available in that size"""
 
     name: str
     ingredients: list[str]
-    price_small: str
-    price_medium: str
-
-    def __post_init__(self):
-        """Add a € symbol to the prices"""
-        if self.price_small:
-            self.price_small = "€ " + self.price_small
-
-        if self.price_medium:
-            self.price_medium = "€ " + self.price_medium
+    price_small: Optional[Price]
+    price_medium: Optional[Price]
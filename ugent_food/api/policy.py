@@ -0,0 +1,92 @@
+import random
+import time
+from typing import Optional
+
+from aiohttp import ClientTimeout
+
+__all__ = ["DEFAULT_POLICY", "CircuitBreaker", "RequestPolicy"]
+
+
+class CircuitBreaker:
+    """Stop sending requests to the API for a while after it failed too many times in a row
+
+    Once [failure_threshold] requests have failed, the circuit "opens" and no requests are sent
+    for [reset_timeout] seconds. After that, requests are allowed again: the first successful one
+    closes the circuit, another failure opens it again immediately.
+    """
+
+    failure_threshold: int
+    reset_timeout: float
+    _failures: int
+    _opened_at: Optional[float]
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+
+    @property
+    def is_open(self) -> bool:
+        """Check if requests are currently being blocked"""
+        if self._opened_at is None:
+            return False
+
+        return time.monotonic() - self._opened_at < self.reset_timeout
+
+    def record_success(self):
+        """Close the circuit after a successful request"""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit if there were too many"""
+        self._failures += 1
+
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+class RequestPolicy:
+    """Settings for timeouts & retries of API requests
+
+    Requests that fail because of a connection error, a timeout, or a 5xx status code are retried
+    up to [retries] times. In between attempts, the policy waits for a random amount of time
+    that grows exponentially with every attempt, up to [backoff_max] seconds.
+    """
+
+    retries: int
+    backoff_base: float
+    backoff_max: float
+    timeout: ClientTimeout
+    breaker: CircuitBreaker
+
+    def __init__(
+        self,
+        *,
+        connect_timeout: float = 5,
+        read_timeout: float = 10,
+        retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 5,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = ClientTimeout(connect=connect_timeout, sock_read=read_timeout)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+    def backoff(self, attempt: int) -> float:
+        """Get the amount of seconds to wait before retrying a request for the [attempt]th time"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))  # noqa: S311
+
+    @staticmethod
+    def should_retry(status: int) -> bool:
+        """Check if a request that returned [status] should be retried"""
+        return status >= 500 or status == 429
+
+
+# The circuit breaker is shared by everything that doesn't pass a policy of its own,
+# so one failing call protects all the others in the same process
+DEFAULT_POLICY = RequestPolicy()
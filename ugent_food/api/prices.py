@@ -0,0 +1,26 @@
+import re
+from typing import Optional
+
+__all__ = ["format_cents", "parse_cents"]
+
+# "€ 5,20", "5.20", "€5" or "5,2", the whole string has to be a single price
+_PRICE = re.compile(r"\s*(?:€\s*)?(\d+)(?:[.,](\d{1,2}))?\s*")
+
+
+def parse_cents(price: str) -> Optional[int]:
+    """Turn a price like "€ 5,20" into an amount of cents (520)
+
+    Returns None for anything that isn't exactly one price, like "1.234,50" or "5,205", instead of guessing.
+    """
+    match = _PRICE.fullmatch(price)
+    if match is None:
+        return None
+
+    euros, cents = match.groups()
+    return int(euros) * 100 + int((cents or "0").ljust(2, "0"))
+
+
+def format_cents(cents: float) -> str:
+    """Turn an amount of cents (520) back into a price ("€ 5,20"), rounding to the nearest cent"""
+    euros, rest = divmod(round(cents), 100)
+    return f"€ {euros},{rest:02}"
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import functools
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import Collection, Iterable, Optional
+
+from ugent_food.api.archive_index import ArchiveIndex
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Menu, Sandwich
+
+__all__ = ["SearchIndex", "SearchResult", "SearchSource", "tokenize"]
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS search_entries (
+        id INTEGER PRIMARY KEY,
+        source TEXT NOT NULL,
+        language TEXT NOT NULL,
+        day TEXT,
+        name TEXT NOT NULL,
+        kind TEXT,
+        type TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS search_entries_day ON search_entries (language, day)",
+    """
+    CREATE TABLE IF NOT EXISTS search_terms (
+        term TEXT NOT NULL,
+        entry INTEGER NOT NULL,
+        PRIMARY KEY (term, entry)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS search_terms_entry ON search_terms (entry)",
+)
+
+_TOKEN = re.compile(r"\w+")
+
+# Sorts after every other character, so all terms starting with a prefix are in [prefix, prefix + _MAX_CHAR)
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class SearchSource(str, Enum):
+    """Enum for the things that can be found by searching"""
+
+    MEAL = "meal"
+    VEGETABLE = "vegetable"
+    SANDWICH = "sandwich"
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """A meal, vegetable or sandwich that matched a search
+
+    Sandwiches aren't tied to a day, so their [day] is None. Only meals have a [kind] and [type].
+    """
+
+    source: SearchSource
+    name: str
+    day: Optional[date] = None
+    kind: Optional[MealKind] = None
+    type: Optional[MealType] = None
+
+
+@functools.lru_cache(maxsize=4096)
+def tokenize(text: str) -> tuple[str, ...]:
+    """Split a text into lowercase terms without accents, for example "Vol-au-vent" becomes ("vol", "au", "vent")"""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return tuple(_TOKEN.findall(stripped))
+
+
+class SearchIndex(ArchiveIndex):
+    """Inverted index over the meals & vegetables of archived menus, and the archived sandwiches
+
+    Every meal, vegetable and sandwich is an entry, and every term in its name (or in the ingredients,
+    for sandwiches) points to that entry. The index lives in the same database as the archive, and
+    entries are replaced whenever the menu they came from changes.
+    """
+
+    name = "search"
+    version = 1
+
+    _schema = _SCHEMA
+    _tables = ("search_terms", "search_entries")
+
+    def _add(
+        self,
+        source: SearchSource,
+        language: str,
+        day: Optional[date],
+        name: str,
+        text: Iterable[str],
+        kind: Optional[MealKind] = None,
+        type_: Optional[MealType] = None,
+    ):
+        cursor = self._connection.execute(
+            "INSERT INTO search_entries (source, language, day, name, kind, type) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                source.value,
+                language,
+                day.isoformat() if day is not None else None,
+                name,
+                kind.value if kind is not None else None,
+                type_.value if type_ is not None else None,
+            ),
+        )
+
+        terms = {term for part in text for term in tokenize(part)}
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO search_terms (term, entry) VALUES (?, ?)",
+            ((term, cursor.lastrowid) for term in terms),
+        )
+
+    def _remove(self, condition: str, parameters: tuple):
+        self._connection.execute(
+            f"DELETE FROM search_terms WHERE entry IN (SELECT id FROM search_entries WHERE {condition})",  # noqa: S608
+            parameters,
+        )
+        self._connection.execute(f"DELETE FROM search_entries WHERE {condition}", parameters)  # noqa: S608
+
+    def index_menu(self, language: str, day: date, menu: Menu):
+        """Replace the entries for the menu of a day"""
+        self._remove("language = ? AND day = ?", (language, day.isoformat()))
+
+        for meal in menu.meals:
+            self._add(SearchSource.MEAL, language, day, meal.name, [meal.name], meal.kind, meal.type)
+
+        for vegetable in menu.vegetables:
+            self._add(SearchSource.VEGETABLE, language, day, vegetable, [vegetable])
+
+    def index_sandwiches(self, language: str, sandwiches: Iterable[Sandwich]):
+        """Replace the entries for the sandwiches, which can be found by their name or their ingredients"""
+        self._remove("source = ? AND language = ?", (SearchSource.SANDWICH.value, language))
+
+        for sandwich in sandwiches:
+            self._add(SearchSource.SANDWICH, language, None, sandwich.name, [sandwich.name, *sandwich.ingredients])
+
+    def search(
+        self,
+        query: str,
+        language: str,
+        *,
+        prefix: bool = True,
+        sources: Collection[SearchSource] = (),
+        kinds: Collection[MealKind] = (),
+        types: Collection[MealType] = (),
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> list[SearchResult]:
+        """Find the entries that contain every term in [query]
+
+        With [prefix] matching, terms in the query also match longer terms that start with them
+        ("tomaten" matches "Tomatensoep"). Results can be limited to some [sources], [kinds] and [types],
+        and to the days between [start] and [end] (inclusive). Sandwiches are found in every
+        language, as they're only available in Dutch.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        # Every term narrows the results down to the entries that (also) contain that term
+        matches = []
+        parameters: list = []
+        for term in terms:
+            if prefix:
+                matches.append("SELECT entry FROM search_terms WHERE term >= ? AND term < ?")
+                parameters.extend((term, term + _MAX_CHAR))
+            else:
+                matches.append("SELECT entry FROM search_terms WHERE term = ?")
+                parameters.append(term)
+
+        conditions = [f"id IN ({' INTERSECT '.join(matches)})", "(language = ? OR source = ?)"]
+        parameters.extend((language, SearchSource.SANDWICH.value))
+
+        for column, values in (("source", sources), ("kind", kinds), ("type", types)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters.extend(value.value for value in values)
+
+        # Sandwiches aren't tied to a day, so leave them out when looking for specific days
+        if start is not None:
+            conditions.append("day >= ?")
+            parameters.append(start.isoformat())
+
+        if end is not None:
+            conditions.append("day <= ?")
+            parameters.append(end.isoformat())
+
+        rows = self._connection.execute(
+            "SELECT source, name, day, kind, type FROM search_entries "  # noqa: S608
+            f"WHERE {' AND '.join(conditions)} ORDER BY day IS NULL, day, id",
+            parameters,
+        )
+
+        return [
+            SearchResult(
+                source=SearchSource(source),
+                name=name,
+                day=date.fromisoformat(day) if day is not None else None,
+                kind=MealKind(kind) if kind is not None else None,
+                type=MealType(type_) if type_ is not None else None,
+            )
+            for source, name, day, kind, type_ in rows
+        ]
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+__all__ = ["SingleFlight"]
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one
+
+    While a call for a key is in progress, everyone else asking for the same key waits for that
+    call to finish and receives its result (or exception), instead of starting a call of their own.
+    """
+
+    executed: int
+    coalesced: int
+    _in_flight: dict[str, "asyncio.Future[Any]"]
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._in_flight = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Call [func], unless a call for [key] is already in progress"""
+        future = self._in_flight.get(key)
+
+        if future is None:
+            self.executed += 1
+            future = asyncio.ensure_future(func())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # Shielded, so that one waiter being cancelled doesn't cancel the call for everyone else
+        return await asyncio.shield(future)
+
+    @property
+    def in_flight(self) -> int:
+        """The amount of calls that are currently in progress"""
+        return len(self._in_flight)
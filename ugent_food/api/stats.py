@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import operator
+import statistics
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable, Optional
+
+from ugent_food.api.archive import (
+    KIND_CODES,
+    KINDS,
+    NO_PRICE,
+    TYPE_CODES,
+    EncodedMeal,
+    MenuArchive,
+    encode_meal,
+)
+from ugent_food.api.archive_index import ArchiveIndex
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.api.models import Menu, Sandwich
+
+__all__ = ["MenuStats", "PriceSummary", "StatsIndex", "WeekShare", "compute_stats"]
+
+_SCHEMA = (
+    # Days are stored as ordinals, prices as cents
+    """
+    CREATE TABLE IF NOT EXISTS stats_days (
+        language TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        open INTEGER NOT NULL,
+        PRIMARY KEY (language, day)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stats_meals (
+        language TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        kind INTEGER NOT NULL,
+        type INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        price INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS stats_meals_day ON stats_meals (language, day)",
+)
+
+
+class StatsIndex(ArchiveIndex):
+    """Compact copy of the archived menus, which can be aggregated without decoding them again
+
+    The meals are stored encoded in the same way a MenuArchive stores them, and loaded into one.
+    """
+
+    name = "stats"
+    version = 2
+
+    _schema = _SCHEMA
+    _tables = ("stats_days", "stats_meals")
+
+    def index_menu(self, language: str, day: date, menu: Menu):
+        """Replace the meals of a day"""
+        ordinal = day.toordinal()
+
+        self._connection.execute("DELETE FROM stats_meals WHERE language = ? AND day = ?", (language, ordinal))
+        self._connection.execute(
+            "INSERT OR REPLACE INTO stats_days (language, day, open) VALUES (?, ?, ?)", (language, ordinal, menu.open)
+        )
+        self._connection.executemany(
+            "INSERT INTO stats_meals (language, day, kind, type, name, price) VALUES (?, ?, ?, ?, ?, ?)",
+            ((language, ordinal, *encode_meal(meal)) for meal in menu.meals),
+        )
+
+    def index_sandwiches(self, language: str, sandwiches: Iterable[Sandwich]):
+        """Sandwiches aren't part of the statistics"""
+
+    def load(self, language: str, start: Optional[date] = None, end: Optional[date] = None) -> MenuArchive:
+        """Load the menus of the days between [start] and [end] (inclusive, everything if they're left out)
+
+        Only what the statistics need is stored, so the menus don't have any vegetables or messages.
+        """
+        first = start.toordinal() if start is not None else 0
+        last = end.toordinal() if end is not None else date.max.toordinal()
+        archive = MenuArchive()
+
+        days = self._connection.execute(
+            "SELECT day, open FROM stats_days WHERE language = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (language, first, last),
+        )
+        rows = self._connection.execute(
+            "SELECT day, kind, type, name, price FROM stats_meals "
+            "WHERE language = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (language, first, last),
+        )
+
+        # Both are sorted by day, so the meals of every day can be added while walking over the days
+        groups = itertools.groupby(rows, key=operator.itemgetter(0))
+        group = next(groups, None)
+
+        for day, is_open in days:
+            meals: Iterable[EncodedMeal] = ()
+            if group is not None and group[0] == day:
+                meals = (row[1:] for row in group[1])
+
+            archive.add_encoded(date.fromordinal(day), bool(is_open), meals)
+
+            if group is not None and group[0] == day:
+                group = next(groups, None)
+
+        return archive
+
+
+@dataclass(frozen=True)
+class PriceSummary:
+    """Distribution of the prices (in cents) of a group of meals"""
+
+    count: int
+    minimum: int
+    median: float
+    mean: float
+    maximum: int
+
+    @classmethod
+    def of(cls, prices: list[int]) -> PriceSummary:
+        """Summarize a (non-empty) list of prices"""
+        prices = sorted(prices)
+        return cls(
+            count=len(prices),
+            minimum=prices[0],
+            median=statistics.median(prices),
+            mean=sum(prices) / len(prices),
+            maximum=prices[-1],
+        )
+
+
+@dataclass(frozen=True)
+class WeekShare:
+    """The amount of vegan & vegetarian main courses (without soups) in an ISO week"""
+
+    year: int
+    week: int
+    meals: int
+    vegan: int
+    vegetarian: int
+
+    @property
+    def vegan_share(self) -> float:
+        """The fraction of main courses that were vegan"""
+        return self.vegan / self.meals if self.meals else 0
+
+    @property
+    def vegetarian_share(self) -> float:
+        """The fraction of main courses that were vegetarian"""
+        return self.vegetarian / self.meals if self.meals else 0
+
+
+@dataclass
+class MenuStats:
+    """Statistics about the menus of a range of days
+
+    [days] is the amount of days in the archive, [closed] the days on which the restaurants were closed,
+    and [dishes] the most frequently served dishes along with how often they were served.
+    """
+
+    start: Optional[date]
+    end: Optional[date]
+    days: int
+    closed: list[date]
+    prices: dict[MealKind, PriceSummary]
+    weeks: list[WeekShare]
+    dishes: list[tuple[str, int]]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Machine-readable representation of the statistics, with all prices in cents"""
+        return {
+            "start": self.start.isoformat() if self.start is not None else None,
+            "end": self.end.isoformat() if self.end is not None else None,
+            "days": self.days,
+            "closed": [day.isoformat() for day in self.closed],
+            "prices": {
+                kind.value: {
+                    "count": summary.count,
+                    "minimum": summary.minimum,
+                    "median": summary.median,
+                    "mean": round(summary.mean, 2),
+                    "maximum": summary.maximum,
+                }
+                for kind, summary in self.prices.items()
+            },
+            "weeks": [
+                {
+                    "year": week.year,
+                    "week": week.week,
+                    "meals": week.meals,
+                    "vegan": week.vegan,
+                    "vegetarian": week.vegetarian,
+                }
+                for week in self.weeks
+            ],
+            "dishes": [{"name": name, "count": count} for name, count in self.dishes],
+        }
+
+
+def compute_stats(
+    archive: MenuArchive, *, start: Optional[date] = None, end: Optional[date] = None, top: int = 10
+) -> MenuStats:
+    """Aggregate the meals in [archive] in a single pass over its columns, keeping the [top] most served dishes
+
+    [start] and [end] are the range that was asked for, without one the statistics cover the days in the archive.
+    """
+    prices: dict[int, list[int]] = {}
+    weeks: dict[tuple[int, int], list[int]] = {}
+    counts: Counter[str] = Counter()
+    closed: list[date] = []
+
+    main, soup = TYPE_CODES[MealType.MAIN], KIND_CODES[MealKind.SOUP]
+    vegan, vegetarian = KIND_CODES[MealKind.VEGAN], KIND_CODES[MealKind.VEGETARIAN]
+
+    days = archive.days()
+
+    for day in days:
+        if not archive.is_open(day):
+            closed.append(day)
+
+        kinds, types, names, day_prices = archive.encoded_meals(day)
+        counts.update(names)
+        week: Optional[list[int]] = None
+
+        for kind, type_, price in zip(kinds, types, day_prices):
+            if price != NO_PRICE:
+                prices.setdefault(kind, []).append(price)
+
+            if type_ == main and kind != soup:
+                if week is None:
+                    week = weeks.setdefault(day.isocalendar()[:2], [0, 0, 0])
+
+                week[0] += 1
+                week[1] += kind == vegan
+                week[2] += kind == vegetarian
+
+    dishes = heapq.nsmallest(top, counts, key=lambda name: (-counts[name], name))
+
+    return MenuStats(
+        start=start if start is not None or not days else days[0],
+        end=end if end is not None or not days else days[-1],
+        days=len(days),
+        closed=closed,
+        prices={KINDS[kind]: PriceSummary.of(prices[kind]) for kind in sorted(prices)},
+        weeks=[WeekShare(year, week, *counts_) for (year, week), counts_ in sorted(weeks.items())],
+        dishes=[(name, counts[name]) for name in dishes],
+    )
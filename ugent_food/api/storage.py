@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from ugent_food.api.archive_index import ArchiveIndex
+from ugent_food.api.decoding import decode_menu, decode_sandwiches
+from ugent_food.api.models import Menu
+from ugent_food.api.search import SearchIndex
+from ugent_food.api.stats import StatsIndex
+
+__all__ = ["STORAGE_PATH", "MenuStorage"]
+
+STORAGE_PATH = Path.home() / ".ugent_food_archive.sqlite3"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS menus (
+        language TEXT NOT NULL,
+        day TEXT NOT NULL,
+        data TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (language, day)
+    )
+    """,
+    # Only the latest list of sandwiches is kept
+    """
+    CREATE TABLE IF NOT EXISTS sandwiches (
+        language TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    )
+    """,
+)
+
+
+class MenuStorage:
+    """Local archive of every menu that was fetched, indexed by language and date
+
+    Unlike the cache, entries in the archive never expire. This allows looking up menus
+    without an internet connection. Everything in the archive can be searched using the [index],
+    and aggregated using the [stats]. Both are kept up-to-date whenever something is stored.
+    """
+
+    path: Path
+    index: SearchIndex
+    stats: StatsIndex
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: Path = STORAGE_PATH):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self.index = SearchIndex(self._connection)
+        self.stats = StatsIndex(self._connection)
+
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+            # Indexes that didn't exist yet (or changed) have to be filled with everything at once
+            outdated = [index for index in self._indexes if index.create()]
+            if outdated:
+                self._reindex(outdated)
+
+    @property
+    def _indexes(self) -> tuple[ArchiveIndex, ...]:
+        return self.index, self.stats
+
+    def __enter__(self) -> MenuStorage:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the connection to the database"""
+        self._connection.close()
+
+    def _reindex(self, indexes: list[ArchiveIndex]):
+        """Add everything in the archive to some [indexes]"""
+        for language, day, data in self._connection.execute("SELECT language, day, data FROM menus"):
+            menu = decode_menu(json.loads(data))
+
+            for index in indexes:
+                index.index_menu(language, date.fromisoformat(day), menu)
+
+        for language, data in self._connection.execute("SELECT language, data FROM sandwiches"):
+            sandwiches = decode_sandwiches(json.loads(data))
+
+            for index in indexes:
+                index.index_sandwiches(language, sandwiches)
+
+    def put(self, language: str, day: date, data: Any):
+        """Store the API response for the menu of a day, replacing the previous one"""
+        serialized = json.dumps(data)
+
+        with self._connection:
+            # The index only has to be updated when the menu changed
+            unchanged = self._connection.execute(
+                "UPDATE menus SET fetched_at = ? WHERE language = ? AND day = ? AND data = ?",
+                (time.time(), language, day.isoformat(), serialized),
+            ).rowcount
+
+            if unchanged:
+                return
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO menus (language, day, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (language, day.isoformat(), serialized, time.time()),
+            )
+            menu = decode_menu(data)
+
+            for index in self._indexes:
+                index.index_menu(language, day, menu)
+
+    def put_sandwiches(self, language: str, data: Any):
+        """Store the API response for the list of sandwiches, replacing the previous one"""
+        serialized = json.dumps(data)
+
+        with self._connection:
+            unchanged = self._connection.execute(
+                "UPDATE sandwiches SET fetched_at = ? WHERE language = ? AND data = ?",
+                (time.time(), language, serialized),
+            ).rowcount
+
+            if unchanged:
+                return
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sandwiches (language, data, fetched_at) VALUES (?, ?, ?)",
+                (language, serialized, time.time()),
+            )
+            sandwiches = decode_sandwiches(data)
+
+            for index in self._indexes:
+                index.index_sandwiches(language, sandwiches)
+
+    def get(self, language: str, day: date) -> Optional[Any]:
+        """Get the stored API response for the menu of a day, if there is one"""
+        row = self._connection.execute(
+            "SELECT data FROM menus WHERE language = ? AND day = ?", (language, day.isoformat())
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def get_range(self, language: str, start: date, end: date) -> dict[date, Any]:
+        """Get all stored API responses for the menus between [start] and [end] (inclusive)"""
+        rows = self._connection.execute(
+            "SELECT day, data FROM menus WHERE language = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (language, start.isoformat(), end.isoformat()),
+        )
+
+        return {date.fromisoformat(day): json.loads(data) for day, data in rows}
+
+    def menus(self, language: str, days: Iterable[date]) -> list[Optional[Menu]]:
+        """Get the stored menus for a list of days, days that aren't in the archive are None"""
+        days = list(days)
+        if not days:
+            return []
+
+        stored = self.get_range(language, min(days), max(days))
+        return [decode_menu(stored[day]) if day in stored else None for day in days]
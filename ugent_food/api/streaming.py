@@ -0,0 +1,165 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional
+
+from ugent_food.exceptions import DecodingError
+
+__all__ = ["JSON_BACKEND", "iter_json_array", "loads"]
+
+
+def _load_backend() -> tuple[str, Callable[[bytes], Any]]:
+    """Get the fastest JSON parser that is installed
+
+    orjson is used when it's available, it parses bytes directly without decoding them to a str first.
+    """
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return "json", json.loads
+
+    return "orjson", orjson.loads
+
+
+JSON_BACKEND, loads = _load_backend()
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+# Numbers & literals, which end at the first character that can't be part of them
+_SCALAR = re.compile(r"[^ \t\n\r,\]}]*")
+# The only parts of an object or array that matter to find where it ends: complete strings (which can contain
+# brackets), and brackets. A quote by itself is the start of a string that isn't complete yet.
+_CONTAINER_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]|"')
+
+# Parts of the array that the parser can be waiting for
+_START, _FIRST_ITEM, _ITEM, _SEPARATOR, _END = range(5)
+
+
+def _element_end(text: str, pos: int) -> Optional[int]:
+    """Find where the JSON element that starts at [pos] ends, or None if it isn't complete yet
+
+    This only looks at the brackets & strings of the element without parsing it, so an element that isn't
+    complete can be told apart from one that is invalid.
+    """
+    char = text[pos]
+
+    if char in "[{":
+        depth = 0
+
+        for match in _CONTAINER_TOKENS.finditer(text, pos):
+            token = match.group()
+
+            if token == '"':
+                return None
+
+            if token in "[{":
+                depth += 1
+            elif token in "]}":
+                depth -= 1
+
+                if depth == 0:
+                    return match.end()
+
+        return None
+
+    if char == '"':
+        string = _STRING.match(text, pos)
+        return string.end() if string is not None else None
+
+    # Numbers can be cut off anywhere (like "1." or "1e"), so they're only complete once something follows them
+    end = _SCALAR.match(text, pos).end()  # type: ignore[union-attr]
+    return end if end < len(text) else None
+
+
+class _ArrayParser:
+    """Splits the text of a JSON array into its items, while the text is still coming in
+
+    Only the part of the text that hasn't been parsed yet is kept around. Every item is only decoded once
+    it's complete, and an item that is complete but isn't valid JSON is an error right away.
+    """
+
+    _buffer: str
+    _state: int
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = _START
+
+    def feed(self, text: str, *, final: bool = False) -> list[Any]:
+        """Add the next part of the text, and get the items that are complete now
+
+        Pass [final] for the last part, which makes incomplete items an error instead of
+        waiting for the rest of them.
+        """
+        buffer = self._buffer + text
+        pos = 0
+        items = []
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+
+            if self._state == _START:
+                if char != "[":
+                    raise DecodingError("Expected a JSON array.")
+
+                self._state = _FIRST_ITEM
+                pos += 1
+            elif self._state == _END:
+                raise DecodingError("Unexpected data after the end of the JSON array.")
+            elif self._state == _SEPARATOR:
+                if char not in ",]":
+                    raise DecodingError(f'Expected "," or "]" in JSON array, got "{char}".')
+
+                self._state = _ITEM if char == "," else _END
+                pos += 1
+            elif char == "]" and self._state == _FIRST_ITEM:
+                self._state = _END
+                pos += 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    # Only wait for the rest of the item if it isn't complete yet, a complete item is invalid
+                    if not final and _element_end(buffer, pos) is None:
+                        break
+
+                    raise DecodingError(f"Invalid JSON: {e}.") from e
+
+                # Numbers & literals can be cut off anywhere (like "1." or "1e"), they might continue in the next part
+                if not final and char not in '[{"' and _element_end(buffer, pos) is None:
+                    break
+
+                items.append(item)
+                self._state = _SEPARATOR
+                pos = end
+
+        self._buffer = buffer[pos:]
+
+        if final and self._state != _END:
+            raise DecodingError("Incomplete JSON array.")
+
+        return items
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Parse a JSON array from a stream of bytes, yielding every item as soon as it's complete
+
+    Instead of the entire body, only the item that is currently coming in is kept in memory.
+    """
+    parser = _ArrayParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    try:
+        async for chunk in chunks:
+            for item in parser.feed(decoder.decode(chunk)):
+                yield item
+
+        for item in parser.feed(decoder.decode(b"", final=True), final=True):
+            yield item
+    except UnicodeDecodeError as e:
+        raise DecodingError(f"Invalid JSON: {e}.") from e
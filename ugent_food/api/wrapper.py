@@ -1,39 +1,572 @@
-from datetime import date
-from enum import Enum
+import asyncio
+import importlib.util
+import os
+from datetime import date, timedelta
 from http import HTTPStatus
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Mapping, Optional
 
-from aiohttp import ClientSession
-from dacite import Config, from_dict
+from aiohttp import ClientError, ClientSession
 
-from ugent_food.api.models import Menu, Sandwich
-from ugent_food.exceptions import APIException, NoMenuFound
+from ugent_food.api.cache import (
+    SANDWICHES_KEY,
+    SANDWICHES_TTL,
+    Cache,
+    CacheEntry,
+    menu_key,
+    menu_ttl,
+)
+from ugent_food.api.decoding import (
+    decode_menu,
+    decode_multilingual_menu,
+    decode_sandwich,
+    decode_sandwiches,
+)
+from ugent_food.api.models import Menu, MultilingualMenu, Sandwich
+from ugent_food.api.policy import DEFAULT_POLICY, RequestPolicy
+from ugent_food.api.singleflight import SingleFlight
+from ugent_food.api.storage import MenuStorage
+from ugent_food.api.streaming import JSON_BACKEND, iter_json_array, loads
+from ugent_food.exceptions import (
+    APIException,
+    APIUnavailable,
+    DecodingError,
+    NoMenuFound,
+    UGentFoodException,
+)
+from ugent_food.tracing import span
 from ugent_food.version import __version__
 
-__all__ = ["fetch_menu", "fetch_sandwiches"]
+__all__ = [
+    "fetch_menu",
+    "fetch_menus",
+    "fetch_multilingual_menu",
+    "fetch_multilingual_menus",
+    "fetch_sandwiches",
+    "iter_sandwiches",
+]
 
-headers = {"User-Agent": f"ugent-food (v{__version__})"}
+# Can be pointed at a different server, for example a local stand-in for the API in the benchmarks
+API_URL = os.environ.get("UGENT_FOOD_API_URL", "https://hydra.ugent.be/api/2.0/resto")
 
+# The list of sandwiches is only available in Dutch
+SANDWICHES_LANGUAGE = "nl"
 
-async def fetch_menu(client_session: ClientSession, day: date, language: str) -> Menu:
-    """Get the menu for a given day"""
-    endpoint = f"https://hydra.ugent.be/api/2.0/resto/menu/{language}/{day.year}/{day.month}/{day.day}.json"
-    async with client_session.get(endpoint, headers=headers) as response:
-        if response.status == HTTPStatus.NOT_FOUND:
-            raise NoMenuFound
 
-        if response.status != HTTPStatus.OK:
-            raise APIException(response.status)
+def _accept_encoding() -> str:
+    """Get the compression algorithms that the responses can be decoded from"""
+    # aiohttp can only decode Brotli when one of these is installed
+    if importlib.util.find_spec("brotli") is not None or importlib.util.find_spec("brotlicffi") is not None:
+        return "gzip, deflate, br"
 
-        data = await response.json()
-        return from_dict(Menu, data, config=Config(cast=[Enum]))
+    return "gzip, deflate"
 
 
-async def fetch_sandwiches(client_session: ClientSession) -> list[Sandwich]:
-    """Get the list of available sandwiches"""
-    endpoint = "https://hydra.ugent.be/api/2.0/resto/sandwiches.json"
-    async with client_session.get(endpoint, headers=headers) as response:
-        if response.status != HTTPStatus.OK:
-            raise APIException(response.status)
+# Built once & shared by every request, conditional requests make a copy to add their own headers
+headers: Mapping[str, str] = MappingProxyType(
+    {"User-Agent": f"ugent-food (v{__version__})", "Accept-Encoding": _accept_encoding()}
+)
 
-        data = await response.json()
-        return list(map(lambda x: from_dict(Sandwich, x), data))
+
+async def _fetch_json(
+    client_session: ClientSession,
+    endpoint: str,
+    *,
+    cache: Optional[Cache],
+    key: str,
+    ttl: timedelta,
+    refresh: bool = False,
+    revalidate: bool = False,
+    policy: Optional[RequestPolicy] = None,
+    single_flight: Optional[SingleFlight] = None,
+) -> Any:
+    """Get the JSON response of an endpoint, using the cache if possible
+
+    Stale entries are revalidated using a conditional request, so the response body
+    only has to be sent again when it actually changed. Passing [revalidate] does this
+    for fresh entries as well, while passing [refresh] ignores whatever is currently
+    in the cache.
+
+    Failing requests are retried according to the [policy]. If the API is unavailable,
+    the last cached response is used instead (even if it's stale, or [refresh] was passed).
+
+    If a [single_flight] is passed, concurrent requests to the same endpoint are combined into one.
+    """
+    with span("cache.get"):
+        entry = cache.get(key) if cache is not None else None
+
+    if entry is not None and entry.is_fresh and not (refresh or revalidate):
+        return entry.data
+
+    def _request() -> Awaitable[Any]:
+        return _request_json(
+            client_session,
+            endpoint,
+            cache=cache,
+            key=key,
+            ttl=ttl,
+            entry=entry,
+            refresh=refresh,
+            policy=policy if policy is not None else DEFAULT_POLICY,
+        )
+
+    if single_flight is not None:
+        return await single_flight.do(endpoint, _request)
+
+    return await _request()
+
+
+def _conditional_headers(entry: Optional[CacheEntry], refresh: bool) -> Mapping[str, str]:
+    """Get the headers for a request, which only sends the response if it differs from the cached [entry]"""
+    if entry is None or not entry.can_revalidate or refresh:
+        return headers
+
+    request_headers = dict(headers)
+
+    if entry.etag is not None:
+        request_headers["If-None-Match"] = entry.etag
+
+    if entry.last_modified is not None:
+        request_headers["If-Modified-Since"] = entry.last_modified
+
+    return request_headers
+
+
+async def _request(
+    client_session: ClientSession,
+    endpoint: str,
+    *,
+    cache: Optional[Cache],
+    key: str,
+    ttl: timedelta,
+    entry: Optional[CacheEntry],
+    refresh: bool,
+    policy: RequestPolicy,
+    stream: bool = False,
+) -> AsyncIterator[Any]:
+    """Send a request to an endpoint, with [entry] being the current cache entry (if any)
+
+    This yields the JSON response. If [stream] is set, the response is an array and its items are yielded instead,
+    as soon as they arrive. The response is cached once it has been read entirely.
+
+    Failing requests are retried according to the [policy], but only until the first item was yielded (which
+    can't be taken back). If the API is unavailable, the data of [entry] is used instead.
+    """
+    request_headers = _conditional_headers(entry, refresh)
+    error: UGentFoodException = APIUnavailable("The API is unavailable, try again later.")
+
+    # Don't even try if the API has been failing
+    attempts = 0 if policy.breaker.is_open else policy.retries + 1
+
+    for attempt in range(attempts):
+        if attempt > 0:
+            with span("api.backoff", attempt=attempt):
+                await asyncio.sleep(policy.backoff(attempt))
+
+        received = False
+
+        try:
+            async with client_session.get(endpoint, headers=request_headers, timeout=policy.timeout) as response:
+                if policy.should_retry(response.status):
+                    error = APIException(response.status)
+                    continue
+
+                policy.breaker.record_success()
+
+                # Cached data is still up-to-date
+                if response.status == HTTPStatus.NOT_MODIFIED and cache is not None and entry is not None:
+                    cache.put(key, entry.renewed(ttl))
+                    break
+
+                if response.status != HTTPStatus.OK:
+                    raise APIException(response.status)
+
+                if stream:
+                    items = []
+                    async for item in iter_json_array(response.content.iter_any()):
+                        received = True
+
+                        # Nothing has to be kept around if it isn't cached
+                        if cache is not None:
+                            items.append(item)
+
+                        yield item
+
+                    data: Any = items
+                else:
+                    with span("api.read", backend=JSON_BACKEND):
+                        body = await response.read()
+
+                        try:
+                            data = loads(body)
+                        except ValueError as e:
+                            raise DecodingError(f"Invalid JSON in the response of {endpoint}: {e}.") from e
+        except (ClientError, asyncio.TimeoutError) as e:
+            error = APIUnavailable(f"Unable to reach the API: {str(e) or type(e).__name__}.")
+
+            # Items that were already yielded can't be taken back
+            if received:
+                raise error from e
+
+            continue
+
+        if cache is not None:
+            entry = CacheEntry.create(
+                data, ttl, etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified")
+            )
+            with span("cache.put"):
+                cache.put(key, entry)
+
+        if not stream:
+            yield data
+
+        return
+    else:
+        if attempts > 0:
+            policy.breaker.record_failure()
+
+        # Fall back to the last known response
+        if entry is None:
+            raise error
+
+    if stream:
+        for item in entry.data:
+            yield item
+    else:
+        yield entry.data
+
+
+async def _request_json(
+    client_session: ClientSession,
+    endpoint: str,
+    *,
+    cache: Optional[Cache],
+    key: str,
+    ttl: timedelta,
+    entry: Optional[CacheEntry],
+    refresh: bool,
+    policy: RequestPolicy,
+) -> Any:
+    """Send the request for _fetch_json, see _request"""
+    responses = [
+        data
+        async for data in _request(
+            client_session, endpoint, cache=cache, key=key, ttl=ttl, entry=entry, refresh=refresh, policy=policy
+        )
+    ]
+    return responses[0]
+
+
+async def _iter_json_array(
+    client_session: ClientSession,
+    endpoint: str,
+    *,
+    cache: Optional[Cache],
+    key: str,
+    ttl: timedelta,
+    refresh: bool = False,
+    policy: Optional[RequestPolicy] = None,
+) -> AsyncIterator[Any]:
+    """Get the items of the JSON array returned by an endpoint as soon as they arrive, using the cache if possible
+
+    This works the same way as _fetch_json, except that the response body is parsed while it's being
+    received instead of all at once (see _request).
+    """
+    with span("cache.get"):
+        entry = cache.get(key) if cache is not None else None
+
+    if entry is not None and entry.is_fresh and not refresh:
+        for item in entry.data:
+            yield item
+
+        return
+
+    async for item in _request(
+        client_session,
+        endpoint,
+        cache=cache,
+        key=key,
+        ttl=ttl,
+        entry=entry,
+        refresh=refresh,
+        policy=policy if policy is not None else DEFAULT_POLICY,
+        stream=True,
+    ):
+        yield item
+
+
+async def fetch_menu(
+    client_session: ClientSession,
+    day: date,
+    language: str,
+    *,
+    cache: Optional[Cache] = None,
+    refresh: bool = False,
+    revalidate: bool = False,
+    strict: bool = False,
+    storage: Optional[MenuStorage] = None,
+    policy: Optional[RequestPolicy] = None,
+    single_flight: Optional[SingleFlight] = None,
+) -> Menu:
+    """Get the menu for a given day
+
+    In [strict] mode, the types of all fields in the response are validated.
+    If a [storage] is passed, the menu is added to that archive.
+    See _fetch_json for the meaning of [revalidate], [policy] and [single_flight].
+    """
+    endpoint = f"{API_URL}/menu/{language}/{day.year}/{day.month}/{day.day}.json"
+
+    with span("api.fetch_menu", day=day.isoformat(), language=language):
+        try:
+            data = await _fetch_json(
+                client_session,
+                endpoint,
+                cache=cache,
+                key=menu_key(language, day),
+                ttl=menu_ttl(day),
+                refresh=refresh,
+                revalidate=revalidate,
+                policy=policy,
+                single_flight=single_flight,
+            )
+        except APIException as e:
+            if e.status_code == HTTPStatus.NOT_FOUND:
+                raise NoMenuFound from e
+
+            raise
+
+        with span("api.decode"):
+            menu = decode_menu(data, strict=strict)
+
+        if storage is not None:
+            with span("storage.put"):
+                storage.put(language, day, data)
+
+        return menu
+
+
+async def fetch_menus(
+    client_session: ClientSession,
+    days: list[date],
+    language: str,
+    *,
+    concurrency: int = 4,
+    cache: Optional[Cache] = None,
+    refresh: bool = False,
+    revalidate: bool = False,
+    strict: bool = False,
+    storage: Optional[MenuStorage] = None,
+    policy: Optional[RequestPolicy] = None,
+    single_flight: Optional[SingleFlight] = None,
+) -> list[Optional[Menu]]:
+    """Get the menus for multiple days at once
+
+    At most [concurrency] requests are sent at the same time. The menus are returned in the
+    same order as [days], days that don't have a menu are None.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch(day: date) -> Optional[Menu]:
+        async with semaphore:
+            try:
+                return await fetch_menu(
+                    client_session,
+                    day,
+                    language,
+                    cache=cache,
+                    refresh=refresh,
+                    revalidate=revalidate,
+                    strict=strict,
+                    storage=storage,
+                    policy=policy,
+                    single_flight=single_flight,
+                )
+            except NoMenuFound:
+                return None
+
+    return list(await asyncio.gather(*map(_fetch, days)))
+
+
+async def fetch_multilingual_menu(
+    client_session: ClientSession,
+    day: date,
+    languages: list[str],
+    *,
+    cache: Optional[Cache] = None,
+    refresh: bool = False,
+    strict: bool = False,
+    storage: Optional[MenuStorage] = None,
+    policy: Optional[RequestPolicy] = None,
+    single_flight: Optional[SingleFlight] = None,
+) -> MultilingualMenu:
+    """Get the menu for a given day in multiple languages at once
+
+    The languages are fetched concurrently, and merged into one menu with the meals aligned across languages.
+    The merged menu is cached as well, so it doesn't have to be merged again as long as it's fresh.
+    Languages that don't have a menu for this day are left out, if none of them have one NoMenuFound is raised.
+
+    See fetch_menu for the meaning of the other arguments.
+    """
+    key = menu_key("+".join(languages), day)
+
+    if cache is not None and not refresh:
+        entry = cache.get(key)
+
+        if entry is not None and entry.is_fresh:
+            return decode_multilingual_menu(entry.data)
+
+    results = await asyncio.gather(
+        *(
+            fetch_menu(
+                client_session,
+                day,
+                language,
+                cache=cache,
+                refresh=refresh,
+                strict=strict,
+                storage=storage,
+                policy=policy,
+                single_flight=single_flight,
+            )
+            for language in languages
+        ),
+        return_exceptions=True,
+    )
+
+    menus = {}
+    for language, result in zip(languages, results):
+        if isinstance(result, NoMenuFound):
+            continue
+
+        if isinstance(result, BaseException):
+            raise result
+
+        menus[language] = result
+
+    if not menus:
+        raise NoMenuFound
+
+    menu = MultilingualMenu.merge(menus)
+
+    if cache is not None:
+        cache.put(key, CacheEntry.create(menu.to_dict(), menu_ttl(day)))
+
+    return menu
+
+
+async def fetch_multilingual_menus(
+    client_session: ClientSession,
+    days: list[date],
+    languages: list[str],
+    *,
+    concurrency: int = 4,
+    cache: Optional[Cache] = None,
+    refresh: bool = False,
+    strict: bool = False,
+    storage: Optional[MenuStorage] = None,
+    policy: Optional[RequestPolicy] = None,
+    single_flight: Optional[SingleFlight] = None,
+) -> list[Optional[MultilingualMenu]]:
+    """Get the menus for multiple days at once, in multiple languages
+
+    At most [concurrency] days are fetched at the same time. The menus are returned in the
+    same order as [days], days that don't have a menu are None.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch(day: date) -> Optional[MultilingualMenu]:
+        async with semaphore:
+            try:
+                return await fetch_multilingual_menu(
+                    client_session,
+                    day,
+                    languages,
+                    cache=cache,
+                    refresh=refresh,
+                    strict=strict,
+                    storage=storage,
+                    policy=policy,
+                    single_flight=single_flight,
+                )
+            except NoMenuFound:
+                return None
+
+    return list(await asyncio.gather(*map(_fetch, days)))
+
+
+async def fetch_sandwiches(
+    client_session: ClientSession,
+    *,
+    cache: Optional[Cache] = None,
+    refresh: bool = False,
+    strict: bool = False,
+    storage: Optional[MenuStorage] = None,
+    policy: Optional[RequestPolicy] = None,
+    single_flight: Optional[SingleFlight] = None,
+) -> list[Sandwich]:
+    """Get the list of available sandwiches
+
+    In [strict] mode, the types of all fields in the response are validated.
+    If a [storage] is passed, the list is added to that archive.
+    See _fetch_json for the meaning of [policy] and [single_flight].
+    """
+    endpoint = f"{API_URL}/sandwiches.json"
+
+    with span("api.fetch_sandwiches"):
+        data = await _fetch_json(
+            client_session,
+            endpoint,
+            cache=cache,
+            key=SANDWICHES_KEY,
+            ttl=SANDWICHES_TTL,
+            refresh=refresh,
+            policy=policy,
+            single_flight=single_flight,
+        )
+
+        with span("api.decode"):
+            sandwiches = decode_sandwiches(data, strict=strict)
+
+        if storage is not None:
+            with span("storage.put"):
+                storage.put_sandwiches(SANDWICHES_LANGUAGE, data)
+
+        return sandwiches
+
+
+async def iter_sandwiches(
+    client_session: ClientSession,
+    *,
+    cache: Optional[Cache] = None,
+    refresh: bool = False,
+    strict: bool = False,
+    storage: Optional[MenuStorage] = None,
+    policy: Optional[RequestPolicy] = None,
+) -> AsyncIterator[Sandwich]:
+    """Get the available sandwiches one by one, as soon as they are received
+
+    Unlike fetch_sandwiches, the response is never kept in memory as a whole. This shares
+    its cache entry with fetch_sandwiches. If a [storage] is passed, the list is added to
+    that archive once all sandwiches were received. See _iter_json_array for the meaning of [policy].
+    """
+    endpoint = f"{API_URL}/sandwiches.json"
+    received = []
+
+    async for data in _iter_json_array(
+        client_session,
+        endpoint,
+        cache=cache,
+        key=SANDWICHES_KEY,
+        ttl=SANDWICHES_TTL,
+        refresh=refresh,
+        policy=policy,
+    ):
+        sandwich = decode_sandwich(data, strict=strict)
+
+        if storage is not None:
+            received.append(data)
+
+        yield sandwich
+
+    if storage is not None:
+        storage.put_sandwiches(SANDWICHES_LANGUAGE, received)
@@ -1,36 +1,169 @@
+from __future__ import annotations
+
+import functools
 import sys
-from typing import Optional
+from datetime import date
+from pathlib import Path
+from typing import Optional, TextIO
 
 import click
-from aiohttp import ClientSession
 
-from ugent_food.api.wrapper import fetch_menu, fetch_sandwiches
-from ugent_food.exceptions import APIException, NoMenuFound
+from ugent_food.api.enums import MealKind, MealType
+from ugent_food.exceptions import (
+    APIException,
+    APIUnavailable,
+    DecodingError,
+    InvalidArgument,
+)
+from ugent_food.i18n import Language
+from ugent_food.tracing import span
 from ugent_food.version import __version__
 
 from .async_command import async_command
-from .config import CONFIG_CHOICES, Config
+from .config import CONFIG_CHOICES, PROFILE_ENV, Config
 from .default_group import DefaultGroup
-from .parsers import parse_date_argument
-from .tables import sandwich_table
+from .parsers import expand_days, parse_date_argument, parse_range_end
+from .renderers import (
+    FORMAT_CHOICES,
+    SANDWICH_SORT_CHOICES,
+    RenderCache,
+    get_renderer,
+)
 
 __all__ = ["cli"]
 
+# Heavy dependencies (aiohttp, dacite, tabulate) are imported inside the commands that need them,
+# so that commands like --version & config don't have to pay for them on every startup
+
+
+def get_profile() -> Optional[str]:
+    """Get the profile that was chosen using --profile, if any"""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+
+    return ctx.find_root().params.get("profile")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config(profile: Optional[str]) -> Config:
+    with span("config.load"):
+        return Config.load(profile)
+
+
+def get_user_config() -> Config:
+    """Load the user's config (for the chosen profile) the first time it's needed"""
+    return _load_config(get_profile())
+
+
+def cache_options(func):
+    """Decorator that adds the options to control the cache to a command"""
+    func = click.option("--no-cache", is_flag=True, default=False, help="Don't read from or write to the cache.")(func)
+    func = click.option(
+        "--refresh", is_flag=True, default=False, help="Ignore cached data and fetch it from the API again."
+    )(func)
+    return func
+
+
+def format_option(func):
+    """Decorator that adds the option to choose the output format to a command"""
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(FORMAT_CHOICES),
+        default="table",
+        show_default=True,
+        help="The format to print the output in.",
+    )(func)
+
+
+def concurrency_option(func):
+    """Decorator that adds the option to limit the amount of concurrent requests to a command"""
+    return click.option(
+        "--concurrency",
+        type=click.IntRange(min=1),
+        default=4,
+        show_default=True,
+        help="The maximum amount of menus to fetch at the same time.",
+    )(func)
+
+
+def _parse_archive_range(
+    start: Optional[str], end: Optional[str], config: Config
+) -> tuple[Optional[date], Optional[date]]:
+    """Parse the --from & --to options of the commands that look through the archive, exiting if they're invalid
+
+    Both are optional, and the end is resolved relative to the start (or today) the same way ranges are.
+    """
+    start_date = None
+    if start is not None:
+        start_date = parse_date_argument(start, skip_weekends=config.skip_weekends)
+        if start_date is None:
+            click.echo(f'Unable to parse argument "{start}".')
+            sys.exit(1)
+
+    end_date = None
+    if end is not None:
+        end_date = parse_range_end(end, start_date or date.today(), skip_weekends=config.skip_weekends)
+        if end_date is None:
+            click.echo(f'Unable to parse argument "{end}".')
+            sys.exit(1)
+
+    return start_date, end_date
+
+
+def timings_options(func):
+    """Decorator that adds the options to measure how long every phase of a command takes
+
+    Has to be applied to the synchronous function, so above async_command.
+    """
+
+    @functools.wraps(func)
+    def _wrapper(*args, timings: bool = False, trace_file: Optional[Path] = None, **kwargs):
+        if not timings and trace_file is None:
+            return func(*args, **kwargs)
 
-# Load config by default because every command needs it
-user_config = Config.load()
+        from ugent_food.tracing import Tracer
+
+        tracer = Tracer()
+
+        # Also report the timings when the command exits early
+        try:
+            with tracer.activate(click.get_current_context().info_name or func.__name__):
+                return func(*args, **kwargs)
+        finally:
+            if timings:
+                click.echo(tracer.format_summary(), err=True)
+
+            if trace_file is not None:
+                tracer.export(trace_file)
+
+    _wrapper = click.option(
+        "--timings", is_flag=True, default=False, help="Print how long every phase of the command took to stderr."
+    )(_wrapper)
+    _wrapper = click.option(
+        "--trace-file",
+        type=click.Path(dir_okay=False, writable=True, path_type=Path),
+        default=None,
+        help="Append the timings of every phase to this file, as JSON lines.",
+    )(_wrapper)
+    return _wrapper
 
 
 @click.group(cls=DefaultGroup, default="menu", invoke_without_command=True)
 @click.option(
     "-V", "--version", is_flag=True, show_default=False, default=False, help="Show the version number and exit."
 )
+@click.option(
+    "--profile", envvar=PROFILE_ENV, default=None, help="Use the settings of this profile on top of the regular ones."
+)
 @click.pass_context
-@async_command
-async def cli(ctx: click.Context, version: bool = False):
+def cli(ctx: click.Context, version: bool = False, profile: Optional[str] = None):
     """Command-line tool to get the current menu for Ghent University restaurants
 
     Running this command without any subcommands is an alias to "menu".
+
+    Settings can be overridden for a single run using environment variables, for example UGENT_FOOD_LANGUAGE=nl.
     """
     # If a subcommand was invoked as well, do nothing here
     # let that subcommand handle it
@@ -55,64 +188,517 @@ def config(ctx: click.Context):
 @config.command(name="ls")
 def config_ls():
     """Display a list of settings, along with their current and accepted values."""
-    user_config.ls()
+    get_user_config().ls()
 
 
 @config.command(name="reset")
 @click.argument("name", type=click.Choice(CONFIG_CHOICES))
 def config_reset(name: str):
-    """Reset setting NAME back to its default value."""
-    Config.reset(name)
+    """Reset setting NAME back to its default value.
+
+    When using a profile, the setting is removed from the profile instead.
+    """
+    Config.reset(name, get_profile())
+    _load_config.cache_clear()
 
 
 @config.command(name="set")
 @click.argument("name", type=click.Choice(CONFIG_CHOICES))
 @click.argument("value")
 def config_set(name: str, value: str):
-    """Change the value of setting NAME to VALUE."""
-    Config.set(name, value)
+    """Change the value of setting NAME to VALUE, in the current profile if there is one."""
+    Config.set(name, value, get_profile())
+    _load_config.cache_clear()
 
 
 @cli.command(name="menu")
 @click.argument("day", required=False)
+@click.option("--week", is_flag=True, default=False, help="Fetch the menus for the entire week that DAY is in.")
+@click.option(
+    "--days", type=click.IntRange(min=1), default=None, help="Fetch the menus for DAYS days, starting at DAY."
+)
+@click.option("--offline", is_flag=True, default=False, help="Only look in the local archive of fetched menus.")
+@click.option(
+    "-l",
+    "--language",
+    "languages",
+    multiple=True,
+    type=click.Choice([language.value for language in Language]),
+    help="The language to fetch the menus in, defaults to the configured language. Pass more than once to show "
+    "the menus in multiple languages side by side.",
+)
+@concurrency_option
+@format_option
+@cache_options
+@timings_options
 @async_command
-async def menu_fetcher(day: Optional[str] = None):
+async def menu_fetcher(
+    day: Optional[str] = None,
+    week: bool = False,
+    days: Optional[int] = None,
+    offline: bool = False,
+    languages: tuple[str, ...] = (),
+    concurrency: int = 4,
+    output_format: str = "table",
+    no_cache: bool = False,
+    refresh: bool = False,
+):
     """Fetch the menu for DAY.
 
-    The DAY-argument supports DD/MM(/YYYY) formats, as well as Dutch and English weekdays and relative offsets.
+    The DAY-argument supports DD/MM(/YYYY) formats, as well as Dutch and English weekdays and relative offsets
+    (like "tomorrow" or "+3").
     If no value is provided, the menu for today is fetched instead.
+
+    Ranges of days can be fetched using START..END (for example "monday..friday" or "today..+4"), "next week",
+    --week, or --days.
+
+    Every menu that is fetched is stored in a local archive, which can be used later on with --offline.
+
+    Passing --language more than once fetches the menu in all of those languages at the same time, and shows them
+    side by side.
     """
-    # Try to parse the date arg
-    date_instance = parse_date_argument(day, skip_weekends=user_config.skip_weekends)
+    with span("cli.import"):
+        from .core import get_menus, resolve_days
+
+    user_config = get_user_config()
+
+    try:
+        dates = resolve_days(day, user_config, week=week, days=days)
+        menus = await get_menus(
+            dates,
+            user_config,
+            languages=languages,
+            offline=offline,
+            concurrency=concurrency,
+            no_cache=no_cache,
+            refresh=refresh,
+        )
+    except (APIException, APIUnavailable, DecodingError, InvalidArgument) as e:
+        click.echo(e)
+        sys.exit(1)
+
+    # Only one day was requested and it has no menu
+    if len(dates) == 1 and menus[0] is None:
+        click.echo(f"No menu found for {dates[0]} (parsed from {day}).")
+        sys.exit(1)
+
+    # Machine-readable formats leave out missing days, so mention them separately
+    if output_format != "table":
+        for date_instance, menu in zip(dates, menus):
+            if menu is None:
+                click.echo(f"No menu found for {date_instance}.", err=True)
+
+    # Days with the same menu (like the days the restaurants are closed) share their rendered table
+    cache = RenderCache() if len(dates) > 1 else None
+
+    with span("cli.render", format=output_format):
+        for chunk in get_renderer(output_format, cache).menus(zip(dates, menus), user_config):
+            click.echo(chunk)
+
+
+@cli.command()
+@click.option(
+    "--from", "start", default=None, help="The first day to fetch, in any format supported by menu. Defaults to today."
+)
+@click.option("--to", "end", required=True, help="The last day to fetch, in any format supported by menu.")
+@concurrency_option
+@timings_options
+@async_command
+async def sync(end: str, start: Optional[str] = None, concurrency: int = 4):
+    """Store the menus for a range of days (and the list of sandwiches) in the local archive.
+
+    Afterwards, these menus can be looked up without an internet connection using "menu --offline", and
+    searched through using "search".
+    """
+    with span("cli.import"):
+        from ugent_food.api.storage import STORAGE_PATH
+
+        from .core import resolve_range, sync_menus
+
+    user_config = get_user_config()
+
+    try:
+        dates = resolve_range(start, end, user_config)
+        menus = await sync_menus(dates, user_config, concurrency=concurrency)
+    except (APIException, APIUnavailable, DecodingError, InvalidArgument) as e:
+        click.echo(e)
+        sys.exit(1)
+
+    stored = sum(menu is not None for menu in menus)
+    click.echo(f"Stored {stored} menu(s) between {dates[0]} and {dates[-1]} in {STORAGE_PATH}.")
+
+
+@cli.command()
+@click.argument("day", required=False)
+@click.option(
+    "--days", type=click.IntRange(min=1), default=1, show_default=True, help="Watch DAYS days, starting at DAY."
+)
+@click.option(
+    "--interval", type=click.FloatRange(min=1), default=300, show_default=True, help="Seconds in between two polls."
+)
+@click.option(
+    "--max-interval",
+    type=click.FloatRange(min=1),
+    default=3600,
+    show_default=True,
+    help="Maximum amount of seconds in between two polls while the API is failing.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "ndjson"]),
+    default="text",
+    show_default=True,
+    help="The format to print the changes in.",
+)
+@click.option("--webhook", "webhooks", multiple=True, help="Also send the changes to this URL, in a POST request.")
+@click.option(
+    "--file",
+    "files",
+    multiple=True,
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Also append the changes to this file, as JSON lines.",
+)
+@async_command
+async def watch(
+    day: Optional[str] = None,
+    days: int = 1,
+    interval: float = 300,
+    max_interval: float = 3600,
+    output_format: str = "text",
+    webhooks: tuple[str, ...] = (),
+    files: tuple[Path, ...] = (),
+):
+    """Keep watching the menus for changes, and only report what changed.
+
+    Every poll checks if the menus for DAYS days starting at DAY changed since the previous one, without having
+    to download them again if they didn't. Added & removed meals, changed prices, closures and messages are printed,
+    and can be sent to webhooks or files as well. Relative days like "today" move along with the date.
+    """
+    from ugent_food.api.cache import MemoryCache
+    from ugent_food.watch import (
+        Emitter,
+        FileEmitter,
+        MenuWatcher,
+        StreamEmitter,
+        WebhookEmitter,
+    )
+
+    from .core import open_client
+
+    user_config = get_user_config()
+
+    def _days() -> list[date]:
+        # The argument is parsed again before every poll, and dates without a year can stop existing (29/02)
+        start = parse_date_argument(day, skip_weekends=user_config.skip_weekends)
+        if start is None:
+            raise click.ClickException(f'Unable to parse argument "{day}".')
+
+        return expand_days(start, days, skip_weekends=user_config.skip_weekends)
 
     # Parsing failed
-    if date_instance is None:
+    if parse_date_argument(day, skip_weekends=user_config.skip_weekends) is None:
         click.echo(f'Unable to parse argument "{day}".')
         sys.exit(1)
 
-    async with ClientSession() as session:
-        try:
-            menu = await fetch_menu(session, date_instance, "nl")
-            click.echo(menu.to_string(user_config, date_instance))
-        except APIException as e:
-            click.echo(e)
-            sys.exit(1)
-        except NoMenuFound:
-            click.echo(f"No menu found for {date_instance} (parsed from {day}).")
-            sys.exit(1)
+    async with open_client(user_config, cache=MemoryCache()) as client:
+        emitters: list[Emitter] = [StreamEmitter(user_config.translator, as_json=output_format == "ndjson")]
+        emitters.extend(WebhookEmitter(client, url) for url in webhooks)
+        emitters.extend(map(FileEmitter, files))
+
+        watcher = MenuWatcher(client, _days, interval=interval, max_interval=max_interval)
+        await watcher.run(emitters)
 
 
 @cli.command()
+@click.option(
+    "--sort",
+    type=click.Choice(SANDWICH_SORT_CHOICES),
+    default="name",
+    show_default=True,
+    help="Sort the sandwiches by their name, or by their price (from cheap to expensive).",
+)
+@format_option
+@cache_options
+@timings_options
 @async_command
-async def sandwiches():
+async def sandwiches(sort: str = "name", output_format: str = "table", no_cache: bool = False, refresh: bool = False):
     """Show the list of sandwiches available in restaurants.
 
     Note: this endpoint is only available in Dutch.
     """
-    async with ClientSession() as session:
-        try:
-            sandwich_list = await fetch_sandwiches(session)
-            click.echo(sandwich_table(sandwich_list, user_config.translator))
-        except APIException as e:
-            click.echo(e)
-            sys.exit(1)
+    with span("cli.import"):
+        from .core import get_sandwiches
+
+    user_config = get_user_config()
+
+    try:
+        sandwich_list = await get_sandwiches(user_config, no_cache=no_cache, refresh=refresh)
+    except (APIException, APIUnavailable, DecodingError) as e:
+        click.echo(e)
+        sys.exit(1)
+
+    with span("cli.render", format=output_format):
+        for chunk in get_renderer(output_format).sandwiches(sandwich_list, user_config, sort=sort):
+            click.echo(chunk)
+
+
+@cli.command()
+@click.argument("query", nargs=-1, required=True)
+@click.option(
+    "--kind",
+    "kinds",
+    multiple=True,
+    type=click.Choice([kind.value for kind in MealKind]),
+    help="Only find meals of this kind.",
+)
+@click.option(
+    "--type",
+    "types",
+    multiple=True,
+    type=click.Choice([type_.value for type_ in MealType]),
+    help="Only find meals of this type.",
+)
+@click.option(
+    "--from", "start", default=None, help="Only look at menus starting from this day, in any format supported by menu."
+)
+@click.option(
+    "--to", "end", default=None, help="Only look at menus up until this day, in any format supported by menu."
+)
+@click.option("--exact", is_flag=True, default=False, help="Only match entire words, instead of the start of words.")
+@click.option(
+    "-l",
+    "--language",
+    type=click.Choice([language.value for language in Language]),
+    default=None,
+    help="The language of the menus to search in, defaults to the configured language.",
+)
+@format_option
+@timings_options
+def search(
+    query: tuple[str, ...],
+    kinds: tuple[str, ...] = (),
+    types: tuple[str, ...] = (),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    exact: bool = False,
+    language: Optional[str] = None,
+    output_format: str = "table",
+):
+    """Find the days that serve a dish, and the sandwiches with an ingredient.
+
+    Every word in QUERY has to be in the name of a meal or vegetable (or the name or ingredients of a sandwich),
+    matching the start of words unless --exact is passed. For example, "search vol-au-vent" or "search tomaten".
+
+    Only the menus in the local archive are searched, use "sync" to add the menus for some days to it in advance.
+    """
+    with span("cli.import"):
+        from ugent_food.api.storage import MenuStorage
+
+    user_config = get_user_config()
+
+    start_date, end_date = _parse_archive_range(start, end, user_config)
+
+    with MenuStorage() as storage, span("search.query"):
+        results = storage.index.search(
+            " ".join(query),
+            language or user_config.language,
+            prefix=not exact,
+            kinds=[MealKind(kind) for kind in kinds],
+            types=[MealType(type_) for type_ in types],
+            start=start_date,
+            end=end_date,
+        )
+
+    if not results:
+        click.echo(f'Nothing found for "{" ".join(query)}".')
+        sys.exit(1)
+
+    with span("cli.render", format=output_format):
+        for chunk in get_renderer(output_format).search_results(results, user_config):
+            click.echo(chunk)
+
+
+@cli.command()
+@click.option(
+    "--from",
+    "start",
+    default=None,
+    help="The first day, in any format supported by menu. Defaults to the first archived day.",
+)
+@click.option(
+    "--to",
+    "end",
+    default=None,
+    help="The last day, in any format supported by menu. Defaults to the last archived day.",
+)
+@click.option(
+    "-l",
+    "--language",
+    type=click.Choice([language.value for language in Language]),
+    default=None,
+    help="The language of the menus, defaults to the configured language.",
+)
+@click.option(
+    "--top", type=click.IntRange(min=0), default=10, show_default=True, help="Show the TOP most served dishes."
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "json"]),
+    default="table",
+    show_default=True,
+    help="The format to print the output in.",
+)
+@timings_options
+def stats(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    language: Optional[str] = None,
+    top: int = 10,
+    output_format: str = "table",
+):
+    """Show statistics about the menus of a range of days.
+
+    This shows the distribution of the prices of every kind of meal, the share of vegan & vegetarian main courses
+    in every week, the most served dishes, and the days on which the restaurants were closed.
+
+    Only the menus in the local archive are used, use "sync" to add the menus for some days to it in advance.
+    """
+    with span("cli.import"):
+        from ugent_food.api.stats import compute_stats
+        from ugent_food.api.storage import MenuStorage
+
+    user_config = get_user_config()
+
+    start_date, end_date = _parse_archive_range(start, end, user_config)
+
+    with MenuStorage() as storage, span("stats.aggregate"):
+        archive = storage.stats.load(language or user_config.language, start_date, end_date)
+        menu_stats = compute_stats(archive, start=start_date, end=end_date, top=top)
+
+    if menu_stats.days == 0:
+        click.echo("There are no archived menus for these days.")
+        sys.exit(1)
+
+    with span("cli.render", format=output_format):
+        if output_format == "json":
+            import json
+
+            click.echo(json.dumps(menu_stats.to_dict(), ensure_ascii=False))
+        else:
+            from .tables import stats_tables
+
+            click.echo(stats_tables(menu_stats, user_config.translator))
+
+
+def _run_batch_line(ctx: click.Context, line: str) -> Optional[int]:
+    """Run the command on one line of a batch in a context of its own, returning its exit code
+
+    Returns None for lines without a command.
+    """
+    import shlex
+
+    try:
+        args = shlex.split(line, comments=True)
+    except ValueError as e:
+        click.echo(f"Unable to parse command: {e}.", err=True)
+        return 2
+
+    if not args:
+        return None
+
+    profile = get_profile()
+
+    try:
+        result = cli.main(
+            args,
+            prog_name=ctx.find_root().info_name,
+            standalone_mode=False,
+            default_map={"profile": profile} if profile is not None else None,
+        )
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+
+        click.echo(e.code, err=True)
+        return 1
+
+    # Commands return None, but --version (and --help) exit with a code
+    return result if isinstance(result, int) else 0
+
+
+@cli.command()
+@click.argument("file", type=click.File("r"), default="-")
+@click.option("--fail-fast", is_flag=True, default=False, help="Stop at the first command that fails.")
+@click.pass_context
+def batch(ctx: click.Context, file: TextIO, fail_fast: bool = False):
+    """Run the commands in FILE (or stdin), one per line, on one event loop and one session.
+
+    Every line holds the arguments of a command the way they would be passed to this tool, for example
+    "menu tomorrow --format json" or "sandwiches --sort price". Empty lines and comments (#) are skipped.
+    All commands share the same connections to the API, and the exit code is 1 if any of them failed.
+    """
+    with span("cli.import"):
+        import asyncio
+
+        from ugent_food.api.client import HydraClient
+        from ugent_food.tracing import shared_trace_config
+
+        from .core import use_session
+        from .runner import get_runner
+
+    # The commands would run on a separate thread with a loop of their own (see Runner.run), where they can't use
+    # a session that belongs to the loop of the runner
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise click.ClickException("The batch command can't be used while an event loop is running.")
+
+    runner = get_runner()
+
+    # Only used for its session, every command creates a client of its own on top of it. The requests of commands
+    # with --timings are recorded in their own tracer
+    session_client = HydraClient(trace_configs=[shared_trace_config()])
+    runner.run(session_client.open())
+
+    failed = False
+    try:
+        with use_session(session_client.session):
+            for line_number, line in enumerate(file, start=1):
+                exit_code = _run_batch_line(ctx, line)
+                if not exit_code:
+                    continue
+
+                failed = True
+                click.echo(f"Command on line {line_number} failed with exit code {exit_code}: {line.strip()}", err=True)
+
+                if fail_fast:
+                    break
+    finally:
+        runner.run(session_client.close())
+
+    if failed:
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="The host to listen on.")
+@click.option("--port", type=int, default=8080, show_default=True, help="The port to listen on.")
+@click.option(
+    "--unix-socket", type=click.Path(dir_okay=False), default=None, help="Listen on a Unix socket instead of a port."
+)
+def serve(host: str, port: int, unix_socket: Optional[str] = None):
+    """Run a local HTTP server that serves menus as JSON.
+
+    The server keeps one connection to the API and an in-memory cache alive, so clients can get menus
+    without having to start the tool every time. Available endpoints are /menu, /menu/DAY and /sandwiches.
+    """
+    from ugent_food.server import run_server
+
+    run_server(get_user_config(), host=host, port=port, path=unix_socket)
@@ -1,28 +1,33 @@
-import asyncio
 import functools
-from typing import Any, Callable
+from typing import Any, Callable, Coroutine, Optional
+
+import click
 
 __all__ = ["async_command"]
 
 
-def async_command(func: Callable[..., Any]):
+async def _in_context(ctx: Optional[click.Context], coro: Coroutine[Any, Any, Any]) -> Any:
+    """Make [ctx] the current Click context while [coro] runs, even if it runs on another thread"""
+    if ctx is None:
+        return await coro
+
+    with ctx.scope(cleanup=False):
+        return await coro
+
+
+def async_command(func: Callable[..., Coroutine[Any, Any, Any]]):
     """Decorator to make Click support async commands
 
-    Based on https://github.com/pallets/click/issues/85#issuecomment-503464628
+    Commands are run by the shared Runner, so commands that are invoked one after the other (for example by
+    batch) reuse the same event loop instead of creating a new one every time. Commands always run until
+    they're done, also when they're invoked while an event loop is already running.
     """
 
     @functools.wraps(func)
     def _wrapper(*args, **kwargs):
-        # Run in active event loop if one exists, otherwise create a new one
-
-        try:
-            loop = asyncio.get_running_loop()
-
-            if loop and loop.is_running():
-                return loop.create_task(func(*args, **kwargs))
-        except RuntimeError:
-            pass
+        from .runner import get_runner
 
-        return asyncio.run(func(*args, **kwargs))
+        ctx = click.get_current_context(silent=True)
+        return get_runner().run(_in_context(ctx, func(*args, **kwargs)))
 
     return _wrapper
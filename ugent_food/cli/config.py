@@ -1,40 +1,53 @@
 from __future__ import annotations
 
-import json
+import os
 import sys
 import textwrap
 from dataclasses import MISSING, Field, dataclass, field, fields
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, get_type_hints
 
 import click
-from dacite import from_dict
-from tabulate import tabulate
 
+from ugent_food.cli.config_store import ConfigStore
 from ugent_food.cli.parsers import parse_arg_to_type
 from ugent_food.i18n import Language, Translator
 
-__all__ = ["CONFIG_CHOICES", "Config"]
+__all__ = ["CONFIG_CHOICES", "ENV_PREFIX", "PROFILE_ENV", "Config"]
 
 CONFIG_PATH = Path.home() / ".ugent_food"
 CONFIG_CHOICES = ["hidden", "language", "skip_weekends"]
 CONFIG_DEFAULTS = {"hidden": [], "language": "en", "skip_weekends": True}
 
+# Settings can be overridden using environment variables, for example UGENT_FOOD_LANGUAGE=nl
+ENV_PREFIX = "UGENT_FOOD_"
+PROFILE_ENV = f"{ENV_PREFIX}PROFILE"
+
+# Profiles are stored in the config file as well, under this key
+PROFILES_KEY = "profiles"
+
+_store = ConfigStore(CONFIG_PATH)
+
 
 def ensure_config_file():
     """Make an empty config file if there's none present."""
-    if not CONFIG_PATH.exists():
-        with CONFIG_PATH.open("w+", encoding="utf-8") as fp:
-            json.dump({}, fp)
-
+    if not _store.exists():
+        _store.update(lambda content: None)
         click.echo(f"Created configuration file {CONFIG_PATH}.")
 
 
 def load_config_file() -> dict:
     """Load the config file"""
     ensure_config_file()
-    with CONFIG_PATH.open("r", encoding="utf-8") as fp:
-        return json.load(fp)
+    return _store.read()
+
+
+def _section(content: dict, profile: Optional[str]) -> dict:
+    """Get the part of the config file that holds the settings of a [profile] (or the top level if it's None)"""
+    if profile is None:
+        return content
+
+    return content.setdefault(PROFILES_KEY, {}).setdefault(profile, {})
 
 
 @dataclass
@@ -76,7 +89,7 @@ class Config:
         """Initialize fields that depend on the config settings"""
         # Find the Language instance that matches the setting
         self._language = Language.from_str(self.language)
-        self.translator = Translator(language=self._language)
+        self.translator = Translator.for_language(self._language)
 
         # Make sure "hidden" values are lowercase
         self.hidden = list(map(str.lower, self.hidden))
@@ -100,6 +113,28 @@ class Config:
 
         return matched_field
 
+    @classmethod
+    def _convert(cls, field_: Field, value: str) -> Any:
+        """Convert a string to a value for a field, exiting if it's not valid"""
+        field_type = field_.metadata.get("comparable_type", get_type_hints(cls)[field_.name])
+
+        try:
+            converted_value = parse_arg_to_type(value, field_type)
+        except ValueError:
+            click.echo(f'Unable to parse "{value}" to type {field_type.__name__}.')
+            sys.exit(1)
+
+        # Value is not allowed for this field
+        allowed_values = field_.metadata.get("allowed", [])
+        if allowed_values and value not in allowed_values:
+            click.echo(
+                f'Illegal value "{value}" for setting "{field_.name}".\n'
+                f"Accepted values are: {', '.join(allowed_values)}"
+            )
+            sys.exit(1)
+
+        return converted_value
+
     @classmethod
     def _get_field_default(cls, field_: Field) -> Any:
         """Get the default value for a field"""
@@ -114,6 +149,8 @@ class Config:
 
     def ls(self):
         """Print the user's configuration settings."""
+        from tabulate import tabulate
+
         table_data = []
         for _field in fields(self):
             if not _field.init:
@@ -134,15 +171,34 @@ class Config:
         click.echo(tabulate(table_data, headers=["name", "description", "default", "value"]))
 
     @classmethod
-    def load(cls) -> Config:
-        """Create a Config instance by loading the configuration file"""
+    def load(cls, profile: Optional[str] = None) -> Config:
+        """Create a Config instance by loading the configuration file
+
+        Settings are looked up in the environment variables first, then in the [profile] (if any),
+        and finally in the top level of the configuration file.
+        """
+        from dacite import from_dict
+
         content = load_config_file()
 
-        return from_dict(cls, content)
+        settings = {name: content[name] for name in CONFIG_CHOICES if name in content}
+        if profile is not None:
+            settings.update(content.get(PROFILES_KEY, {}).get(profile, {}))
+
+        for _field in fields(cls):
+            value = os.environ.get(f"{ENV_PREFIX}{_field.name.upper()}")
+            if _field.init and value is not None:
+                settings[_field.name] = cls._convert(_field, value)
+
+        return from_dict(cls, settings)
 
     @classmethod
-    def reset(cls, name: str):
-        """Reset a setting back to its default value"""
+    def reset(cls, name: str, profile: Optional[str] = None):
+        """Reset a setting back to its default value
+
+        For a [profile], the setting is removed from the profile instead, so it uses the
+        top-level value again.
+        """
         matched_field = Config._find_field(name)
 
         # Found no field
@@ -150,17 +206,20 @@ class Config:
             click.echo(f"Unknown setting: {name}.")
             sys.exit(1)
 
-        config = load_config_file()
-        config[matched_field.name] = CONFIG_DEFAULTS[matched_field.name]
+        if profile is not None:
+            _store.update(lambda content: _section(content, profile).pop(matched_field.name, None))
+            click.echo(f'Removed setting "{matched_field.name}" from profile "{profile}".')
+            return
 
-        with CONFIG_PATH.open("w", encoding="utf-8") as fp:
-            json.dump(config, fp)
+        def _reset(content: dict):
+            content[matched_field.name] = CONFIG_DEFAULTS[matched_field.name]
 
+        _store.update(_reset)
         click.echo(f'Restored setting "{matched_field.name}" back to "{CONFIG_DEFAULTS[matched_field.name]}".')
 
     @classmethod
-    def set(cls, name: str, value: str):
-        """Change a setting"""
+    def set(cls, name: str, value: str, profile: Optional[str] = None):
+        """Change a setting, in a [profile] if one is passed"""
         matched_field = Config._find_field(name)
 
         # Found no field
@@ -168,25 +227,9 @@ class Config:
             click.echo(f"Unknown setting: {name}.")
             sys.exit(1)
 
-        field_type = matched_field.metadata.get("comparable_type", matched_field.type)
-
-        try:
-            converted_value = parse_arg_to_type(value, field_type)
-        except ValueError:
-            click.echo(f'Unable to parse "{value}" to type {field_type}.')
-            sys.exit(1)
-
-        # Value is not allowed for this field
-        allowed_values = matched_field.metadata.get("allowed", [])
-        if allowed_values and value not in allowed_values:
-            click.echo(
-                f'Illegal value "{value}" for setting "{matched_field.name}".\n'
-                f"Accepted values are: {', '.join(allowed_values)}"
-            )
-            sys.exit(1)
+        converted_value = cls._convert(matched_field, value)
 
-        config = load_config_file()
-        config[matched_field.name] = converted_value
+        def _set(content: dict):
+            _section(content, profile)[matched_field.name] = converted_value
 
-        with CONFIG_PATH.open("w", encoding="utf-8") as fp:
-            json.dump(config, fp)
+        _store.update(_set)
@@ -0,0 +1,127 @@
+import copy
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+__all__ = ["ConfigStore"]
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on [path] for as long as the block runs
+
+    Platforms without fcntl (Windows) fall back to msvcrt, which can only lock a region of the file.
+    """
+    with path.open("a+b") as fp:
+        if fcntl is not None:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            import msvcrt
+
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)  # type: ignore[attr-defined]
+
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore[attr-defined]
+
+
+class ConfigStore:
+    """The config file, kept in memory for as long as it doesn't change on disk
+
+    Reading only has to check if the file changed since the last time it was parsed. Changes are
+    made while holding a lock, and written to a temporary file that replaces the config file in one
+    go, so concurrent processes never see a half-written file or overwrite each other's changes.
+    """
+
+    path: Path
+    lock_path: Path
+
+    _content: Optional[dict]
+    _signature: Optional[tuple[int, int, int]]
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_path = path.with_name(f"{path.name}.lock")
+
+        self._content = None
+        self._signature = None
+
+    @staticmethod
+    def _signature_of(stat: os.stat_result) -> tuple[int, int, int]:
+        # Replacing the file always creates a new inode, even if the mtime & size happen to be the same
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> dict:
+        """Parse the file, and remember it along with the version of the file it came from"""
+        with self.path.open("r", encoding="utf-8") as fp:
+            signature = self._signature_of(os.fstat(fp.fileno()))
+
+            if signature != self._signature or self._content is None:
+                self._content = json.load(fp)
+                self._signature = signature
+
+        assert self._content is not None  # noqa: S101
+        return self._content
+
+    def exists(self) -> bool:
+        """Check if the config file exists"""
+        return self.path.exists()
+
+    def read(self) -> dict:
+        """Get the content of the config file, only parsing it again if it changed
+
+        Returns an empty dict if the file doesn't exist (yet).
+        """
+        try:
+            signature = self._signature_of(self.path.stat())
+        except FileNotFoundError:
+            return {}
+
+        if signature == self._signature and self._content is not None:
+            return copy.deepcopy(self._content)
+
+        try:
+            return copy.deepcopy(self._load())
+        except FileNotFoundError:
+            return {}
+
+    def update(self, changes: Callable[[dict], None]) -> dict:
+        """Apply [changes] to the content of the config file, and write it back
+
+        The file is locked in the meantime, and [changes] always get the latest content (not
+        whatever is in memory), so updates made by other processes aren't lost.
+        """
+        with _locked(self.lock_path):
+            try:
+                content = copy.deepcopy(self._load())
+            except FileNotFoundError:
+                content = {}
+
+            changes(content)
+
+            # Write to a temporary file first so that concurrent readers never see half a file
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            try:
+                with tmp_path.open("w", encoding="utf-8") as fp:
+                    json.dump(content, fp)
+                    fp.flush()
+                    os.fsync(fp.fileno())
+
+                os.replace(tmp_path, self.path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+        return copy.deepcopy(content)
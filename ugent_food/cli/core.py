@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, Optional, Union
+
+from ugent_food.api.cache import Cache, MenuCache
+from ugent_food.api.client import HydraClient
+from ugent_food.api.models import Menu, MultilingualMenu, Sandwich
+from ugent_food.api.storage import MenuStorage
+from ugent_food.exceptions import InvalidArgument
+
+from .config import Config
+from .parsers import (
+    RANGE_SEPARATOR,
+    date_range,
+    expand_days,
+    is_date_range,
+    parse_date_argument,
+    parse_date_range,
+    parse_range_end,
+    week_of,
+)
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+__all__ = [
+    "get_menus",
+    "get_sandwiches",
+    "open_client",
+    "resolve_days",
+    "resolve_range",
+    "sync_menus",
+    "use_session",
+]
+
+# The logic of the commands that talk to the API, without anything that is specific to the command line.
+# These raise exceptions instead of printing errors & exiting, so they can be awaited from other async code
+# (like a bot) as well, without going through Click.
+
+AnyMenu = Union[Menu, MultilingualMenu]
+
+# The session that clients use instead of creating their own, see use_session
+_shared_session: ContextVar[Optional[ClientSession]] = ContextVar("ugent_food_session", default=None)
+
+
+@contextmanager
+def use_session(session: ClientSession) -> Iterator[None]:
+    """Make every client that is opened inside the block use [session], instead of creating a new one
+
+    The session (and its pool of connections) is left open afterwards. It can only be used by clients
+    on the event loop it was created on.
+    """
+    token = _shared_session.set(session)
+    try:
+        yield
+    finally:
+        _shared_session.reset(token)
+
+
+@asynccontextmanager
+async def open_client(
+    config: Config,
+    *,
+    cache: Optional[Cache] = None,
+    storage: Optional[MenuStorage] = None,
+    concurrency: int = 4,
+) -> AsyncIterator[HydraClient]:
+    """Open a client for the configured language, using the shared session if there is one"""
+    async with HydraClient(
+        language=config.language,
+        cache=cache,
+        storage=storage,
+        concurrency=concurrency,
+        session=_shared_session.get(),
+    ) as client:
+        yield client
+
+
+def resolve_days(day: Optional[str], config: Config, *, week: bool = False, days: Optional[int] = None) -> list[date]:
+    """Get the days that the DAY argument of the menu command refers to
+
+    This is either a range (START..END), or a single day that is expanded to its [week] or to [days] days.
+    """
+    if day is not None and is_date_range(day):
+        dates = parse_date_range(day, skip_weekends=config.skip_weekends)
+    else:
+        date_instance = parse_date_argument(day, skip_weekends=config.skip_weekends)
+
+        if date_instance is None:
+            dates = None
+        elif week:
+            dates = week_of(date_instance, skip_weekends=config.skip_weekends)
+        elif days is not None:
+            dates = expand_days(date_instance, days, skip_weekends=config.skip_weekends)
+        else:
+            dates = [date_instance]
+
+    if not dates:
+        raise InvalidArgument(str(day))
+
+    return dates
+
+
+def resolve_range(start: Optional[str], end: str, config: Config) -> list[date]:
+    """Get the days between [start] (today if it's left out) and [end], which is resolved relative to the start
+
+    Like resolve_days, this never returns an empty list: a range without any days (like a weekend that is
+    skipped) raises InvalidArgument as well.
+    """
+    start_date = parse_date_argument(start, skip_weekends=config.skip_weekends)
+    if start_date is None:
+        raise InvalidArgument(str(start))
+
+    end_date = parse_range_end(end, start_date, skip_weekends=config.skip_weekends)
+    if end_date is None or end_date < start_date:
+        raise InvalidArgument(end)
+
+    dates = date_range(start_date, end_date, skip_weekends=config.skip_weekends)
+    if not dates:
+        raise InvalidArgument(f"{start or 'today'}{RANGE_SEPARATOR}{end}")
+
+    return dates
+
+
+def _read_menus(storage: MenuStorage, dates: list[date], languages: tuple[str, ...]) -> list[Optional[AnyMenu]]:
+    """Look up the menus in the archive, merging them if there are multiple languages"""
+    if len(languages) == 1:
+        return list(storage.menus(languages[0], dates))
+
+    stored = {language: storage.menus(language, dates) for language in languages}
+    menus: list[Optional[AnyMenu]] = []
+
+    for i in range(len(dates)):
+        day_menus = {language: stored[language][i] for language in languages}
+        available = {language: menu for language, menu in day_menus.items() if menu is not None}
+        menus.append(MultilingualMenu.merge(available) if available else None)
+
+    return menus
+
+
+async def get_menus(
+    dates: list[date],
+    config: Config,
+    *,
+    languages: tuple[str, ...] = (),
+    offline: bool = False,
+    concurrency: int = 4,
+    no_cache: bool = False,
+    refresh: bool = False,
+) -> list[Optional[AnyMenu]]:
+    """Get the menus for [dates] in the way the menu command does, days without a menu are None
+
+    Every menu is stored in the archive, [offline] only looks in there instead. Passing more than one
+    language returns MultilingualMenus, the configured language is used if [languages] is empty.
+    """
+    # Keep the order in which the languages were passed, but leave out duplicates
+    languages = tuple(dict.fromkeys(languages)) or (config.language,)
+
+    with MenuStorage() as storage:
+        if offline:
+            return _read_menus(storage, dates, languages)
+
+        cache = None if no_cache else MenuCache()
+        async with open_client(config, cache=cache, storage=storage, concurrency=concurrency) as client:
+            if len(languages) == 1:
+                return list(await client.get_menus(dates, languages[0], refresh=refresh))
+
+            return list(await client.get_multilingual_menus(dates, languages, refresh=refresh))
+
+
+async def sync_menus(dates: list[date], config: Config, *, concurrency: int = 4) -> list[Optional[Menu]]:
+    """Store the menus for [dates] and the list of sandwiches in the archive, and return the menus"""
+    with MenuStorage() as storage:
+        async with open_client(config, storage=storage, concurrency=concurrency) as client:
+            menus = await client.get_menus(dates)
+            await client.get_sandwiches()
+
+    return menus
+
+
+async def get_sandwiches(config: Config, *, no_cache: bool = False, refresh: bool = False) -> list[Sandwich]:
+    """Get the list of sandwiches, which is only available in Dutch"""
+    async with open_client(config, cache=None if no_cache else MenuCache()) as client:
+        return [sandwich async for sandwich in client.iter_sandwiches(refresh=refresh)]
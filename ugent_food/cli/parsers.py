@@ -1,7 +1,107 @@
-from datetime import date, datetime, timedelta
-from typing import Optional, Type, Union
+import functools
+import re
+from datetime import date, timedelta
+from typing import Callable, Optional, Pattern, Type, Union
 
-__all__ = ["parse_date_argument", "parse_arg_to_type"]
+__all__ = [
+    "date_range",
+    "expand_days",
+    "is_date_range",
+    "parse_arg_to_type",
+    "parse_date_argument",
+    "parse_date_range",
+    "parse_range_end",
+    "week_of",
+]
+
+RANGE_SEPARATOR = ".."
+
+# Everything below is built once, so parsing an argument only needs a couple of lookups
+
+_RELATIVE_OFFSETS = {
+    "today": 0,
+    "vandaag": 0,
+    "tomorrow": 1,
+    "morgen": 1,
+    "overmorgen": 2,
+}
+
+# Amount of weeks after the current one, these resolve to the Monday of that week
+_WEEK_OFFSETS = {
+    "this week": 0,
+    "deze week": 0,
+    "next week": 1,
+    "volgende week": 1,
+}
+
+_WEEKDAYS = {
+    # English
+    "monday": 0,
+    "tuesday": 1,
+    "wednesday": 2,
+    "thursday": 3,
+    "friday": 4,
+    "saturday": 5,
+    "sunday": 6,
+    # Dutch
+    "maandag": 0,
+    "dinsdag": 1,
+    "woensdag": 2,
+    "donderdag": 3,
+    "vrijdag": 4,
+    "zaterdag": 5,
+    "zondag": 6,
+}
+
+
+def _build_prefix_trie(words: dict[str, int]) -> dict[str, int]:
+    """Map every prefix of every word onto the value of that word
+
+    This is a prefix trie flattened into a single dict, so finding a word by its prefix is one lookup.
+    Prefixes that are shared by multiple words (like "d" for "dinsdag" & "donderdag") go to the
+    word that comes first.
+    """
+    trie: dict[str, int] = {}
+
+    for word, value in words.items():
+        for length in range(len(word) + 1):
+            trie.setdefault(word[:length], value)
+
+    return trie
+
+
+_WEEKDAY_PREFIXES = _build_prefix_trie(_WEEKDAYS)
+
+# A relative amount of days, for example "+3" or "-1"
+_OFFSET_PATTERN = re.compile(r"([+-])(\d+)")
+
+
+def _full_year(short_year: int) -> int:
+    """Get the full year for a two-digit year, the same way strptime does"""
+    return short_year + (1900 if short_year >= 69 else 2000)
+
+
+# One pattern per supported date format, along with a function that turns the groups into (year, month, day)
+# The year is None if the format doesn't contain it
+_DATE_FORMATS: list[tuple[Pattern[str], Callable[..., tuple[Optional[int], int, int]]]] = [
+    # DD/MM
+    (re.compile(r"(\d{1,2})/(\d{1,2})"), lambda d, m: (None, int(m), int(d))),
+    # DD/MM/YY
+    (re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2})"), lambda d, m, y: (_full_year(int(y)), int(m), int(d))),
+    # DD/MM/YYYY
+    (re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})"), lambda d, m, y: (int(y), int(m), int(d))),
+    # YYYY-MM-DD
+    (re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"), lambda y, m, d: (int(y), int(m), int(d))),
+    # YY-MM-DD
+    (re.compile(r"(\d{2})-(\d{1,2})-(\d{1,2})"), lambda y, m, d: (_full_year(int(y)), int(m), int(d))),
+    # MM-DD
+    (re.compile(r"(\d{1,2})-(\d{1,2})"), lambda m, d: (None, int(m), int(d))),
+]
+
+
+def _monday_of_week(today: date, weeks: int) -> date:
+    """Get the Monday of the week that is [weeks] weeks after the week of [today]"""
+    return today - timedelta(days=today.weekday()) + timedelta(weeks=weeks)
 
 
 def _forward_date_to(weekday: int, date_instance: date) -> date:
@@ -10,16 +110,69 @@ def _forward_date_to(weekday: int, date_instance: date) -> date:
     This always goes at least one day in the future, so if [date_instance]
     IS already a [weekday], it will go to next week.
     """
-    date_instance += timedelta(days=1)
-    while date_instance.weekday() != weekday:
-        date_instance += timedelta(days=1)
+    return date_instance + timedelta(days=(weekday - date_instance.weekday() - 1) % 7 + 1)
+
+
+def _parse_date_format(argument: str, today: date) -> Optional[date]:
+    """Try to parse an argument in one of the supported date formats"""
+    for pattern, to_parts in _DATE_FORMATS:
+        match = pattern.fullmatch(argument)
+        if match is None:
+            continue
+
+        year, month, day = to_parts(*match.groups())
+
+        if year is None:
+            # Requested a date that has already happened this year
+            # Skip to next year, presuming that this is called around NYE (e.g. you're studying in restaurants)
+            # There's not much use to calling an old menu, this is more likely
+            year = today.year + 1 if (month, day) < (today.month, today.day) else today.year
+
+        # The formats don't overlap, so if this isn't a valid date then nothing else will be either
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date_argument(argument: str, today: date) -> Optional[date]:
+    """Parse a lowercase argument, memoized because the same arguments are parsed over and over again"""
+    # Explicitly request today, or an offset relative to it
+    offset = _RELATIVE_OFFSETS.get(argument)
+    if offset is not None:
+        return today + timedelta(days=offset)
+
+    # A weekday is passed by (a prefix of) its name
+    weekday = _WEEKDAY_PREFIXES.get(argument)
+    if weekday is not None:
+        return _forward_date_to(weekday, today)
+
+    # Start of a week
+    weeks = _WEEK_OFFSETS.get(argument)
+    if weeks is not None:
+        return _monday_of_week(today, weeks)
 
-    return date_instance
+    # A relative amount of days
+    match = _OFFSET_PATTERN.fullmatch(argument)
+    if match is not None:
+        sign, days = match.groups()
+        return today + timedelta(days=int(days) if sign == "+" else -int(days))
 
+    return _parse_date_format(argument, today)
 
-def parse_date_argument(argument: Optional[str] = None, *, skip_weekends: bool = True) -> Optional[date]:
-    """Try to parse an argument into a date"""
-    today = date.today()
+
+def parse_date_argument(
+    argument: Optional[str] = None, *, skip_weekends: bool = True, today: Optional[date] = None
+) -> Optional[date]:
+    """Try to parse an argument into a date
+
+    Relative arguments are resolved relative to [today], which defaults to the current date.
+    """
+    if today is None:
+        today = date.today()
 
     # Default to today
     if argument is None:
@@ -29,76 +182,86 @@ def parse_date_argument(argument: Optional[str] = None, *, skip_weekends: bool =
 
         return today
 
-    argument = argument.lower()
+    return _parse_date_argument(argument.strip().lower(), today)
 
-    # Explicitly request today
-    # No idea why you would do this, but you can
-    if argument in (
-        "today",
-        "vandaag",
-    ):
-        return today
 
-    # Relative offset
-    relative_offsets = {
-        "tomorrow": 1,
-        "morgen": 1,
-        "overmorgen": 2,
-    }
-
-    if argument in relative_offsets:
-        return today + timedelta(relative_offsets[argument])
-
-    # A weekday is passed by name
-    weekdays = {
-        # English
-        "monday": 0,
-        "tuesday": 1,
-        "wednesday": 2,
-        "thursday": 3,
-        "friday": 4,
-        "saturday": 5,
-        "sunday": 6,
-        # Dutch
-        "maandag": 0,
-        "dinsdag": 1,
-        "woensdag": 2,
-        "donderdag": 3,
-        "vrijdag": 4,
-        "zaterdag": 5,
-        "zondag": 6,
-    }
-
-    for weekday in weekdays:
-        if weekday.startswith(argument):
-            return _forward_date_to(weekdays[weekday], today)
-
-    # Try various datetime formats
-    formats = ["%d/%m", "%d/%m/%y", "%d/%m/%Y", "%Y-%m-%d", "%y-%m-%d", "%m-%d"]
-    for _format in formats:
-        try:
-            dt_instance = datetime.strptime(argument, _format)
-
-            # Configure the year
-            if "y" in _format.lower():
-                # Explicitly requested the year in the format
-                year = dt_instance.year
-            elif dt_instance.month < today.month or (dt_instance.month == today.month and dt_instance.day < today.day):
-                # Requested a date that has already happened this year
-                # Skip to next year, presuming that this is called around NYE (e.g. you're studying in restaurants)
-                # There's not much use to calling an old menu, this is more likely
-                year = today.year + 1
-            else:
-                # Default to this year
-                year = today.year
-
-            return date(day=dt_instance.day, month=dt_instance.month, year=year)
-        except ValueError:
-            # This format didn't match, try the next
-            continue
+def is_date_range(argument: Optional[str]) -> bool:
+    """Check if an argument is a range of dates instead of a single date"""
+    return argument is not None and (RANGE_SEPARATOR in argument or argument.strip().lower() in _WEEK_OFFSETS)
 
-    # Can't be parsed
-    return None
+
+def parse_range_end(argument: str, start: date, *, skip_weekends: bool = True) -> Optional[date]:
+    """Try to parse the END of a range, which is resolved relative to its [start]
+
+    Relative keywords & offsets are counted from the [start], so "today..tomorrow" are two days and
+    "today..+4" are five. Weekdays & dates resolve to the first matching day on or after the [start],
+    so "monday..friday" is always the first Friday on or after that Monday.
+    """
+    normalized = argument.strip().lower()
+    if normalized in _RELATIVE_OFFSETS or normalized in _WEEK_OFFSETS or _OFFSET_PATTERN.fullmatch(normalized):
+        return parse_date_argument(normalized, skip_weekends=skip_weekends, today=start)
+
+    # Weekdays & dates are looked for starting from the day before, so the [start] itself can match as well
+    return parse_date_argument(normalized, skip_weekends=skip_weekends, today=start - timedelta(days=1))
+
+
+def parse_date_range(argument: str, *, skip_weekends: bool = True) -> Optional[list[date]]:
+    """Try to parse a range of dates, in the form of START..END, or a week like "next week"
+
+    Both ends support everything that parse_date_argument does, see parse_range_end for how
+    the END is resolved.
+    """
+    weeks = _WEEK_OFFSETS.get(argument.strip().lower())
+    if weeks is not None:
+        return week_of(_monday_of_week(date.today(), weeks), skip_weekends=skip_weekends)
+
+    start_arg, _, end_arg = argument.partition(RANGE_SEPARATOR)
+    if not start_arg or not end_arg:
+        return None
+
+    start = parse_date_argument(start_arg, skip_weekends=skip_weekends)
+    if start is None:
+        return None
+
+    end = parse_range_end(end_arg, start, skip_weekends=skip_weekends)
+    if end is None or end < start:
+        return None
+
+    return date_range(start, end, skip_weekends=skip_weekends)
+
+
+def date_range(start: date, end: date, *, skip_weekends: bool = True) -> list[date]:
+    """Get all days between [start] and [end] (inclusive)"""
+    return expand_days(start, (end - start).days + 1, skip_weekends=skip_weekends, count_weekends=True)
+
+
+def expand_days(start: date, amount: int, *, skip_weekends: bool = True, count_weekends: bool = False) -> list[date]:
+    """Get a list of [amount] consecutive days, starting at [start]
+
+    If [skip_weekends] is set, weekends are left out of the result. By default, they don't
+    count towards the [amount] either, so 5 days starting on a Monday means Monday until Friday.
+    """
+    days = []
+    current = start
+
+    while amount > 0:
+        is_weekend = current.weekday() > 4
+
+        if not (skip_weekends and is_weekend):
+            days.append(current)
+
+        if count_weekends or not (skip_weekends and is_weekend):
+            amount -= 1
+
+        current += timedelta(days=1)
+
+    return days
+
+
+def week_of(day: date, *, skip_weekends: bool = True) -> list[date]:
+    """Get all days in the week that [day] is in"""
+    monday = day - timedelta(days=day.weekday())
+    return expand_days(monday, 7, skip_weekends=skip_weekends, count_weekends=True)
 
 
 ARG_TYPES = Union[str, int, bool, list]
@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import csv
+import functools
+import io
+import itertools
+import json
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+    cast,
+)
+
+if TYPE_CHECKING:
+    from ugent_food.api.models import Menu, MultilingualMenu, Price, Sandwich
+    from ugent_food.api.search import SearchResult
+    from ugent_food.cli.config import Config
+
+    AnyMenu = Union[Menu, MultilingualMenu]
+
+__all__ = ["FORMAT_CHOICES", "SANDWICH_SORT_CHOICES", "RenderCache", "Renderer", "get_renderer", "render_menus"]
+
+MENU_COLUMNS = ["date", "type", "kind", "name", "price"]
+SANDWICH_COLUMNS = ["name", "ingredients", "price_small", "price_medium"]
+SEARCH_COLUMNS = ["date", "source", "type", "kind", "name"]
+
+
+def _price_str(price: Optional[Price]) -> str:
+    """Machine-readable representation of a price, in the format the API uses"""
+    return str(price) if price is not None else ""
+
+
+def _menu_object(day: date, menu: AnyMenu, config: Config) -> dict[str, Any]:
+    """Machine-readable representation of a menu"""
+    from ugent_food.api.models import MultilingualMenu
+
+    if isinstance(menu, MultilingualMenu):
+        return {
+            "date": day.isoformat(),
+            "languages": menu.languages,
+            "open": menu.open,
+            "meals": [
+                {"type": meal.type.value, "kind": meal.kind.value, "names": meal.names, "price": _price_str(meal.price)}
+                for meal in menu.iter_meals(config.hidden)
+            ],
+            "vegetables": menu.vegetables,
+            "message": menu.message,
+        }
+
+    return {
+        "date": day.isoformat(),
+        "open": menu.open,
+        "meals": [
+            {"type": meal.type.value, "kind": meal.kind.value, "name": meal.name, "price": _price_str(meal.price)}
+            for meal in menu.iter_meals(config.hidden)
+        ],
+        "vegetables": menu.vegetables,
+        "message": menu.message,
+    }
+
+
+def _menu_json(day: date, menu: AnyMenu, config: Config) -> str:
+    return json.dumps(_menu_object(day, menu, config), ensure_ascii=False)
+
+
+def _sandwich_object(sandwich: Sandwich) -> dict[str, Any]:
+    """Machine-readable representation of a sandwich"""
+    return {
+        "name": sandwich.name,
+        "ingredients": sandwich.ingredients,
+        "price_small": _price_str(sandwich.price_small),
+        "price_medium": _price_str(sandwich.price_medium),
+    }
+
+
+def _search_result_object(result: SearchResult) -> dict[str, Any]:
+    """Machine-readable representation of a search result"""
+    return {
+        "date": result.day.isoformat() if result.day is not None else None,
+        "source": result.source.value,
+        "type": result.type.value if result.type is not None else None,
+        "kind": result.kind.value if result.kind is not None else None,
+        "name": result.name,
+    }
+
+
+def _price_key(price: Optional[Price]) -> float:
+    # Sizes that aren't available (or whose price can't be parsed) go last
+    return price.cents if price is not None and price.cents is not None else math.inf
+
+
+_SANDWICH_SORT_KEYS: dict[str, Callable[[Sandwich], Any]] = {
+    "name": lambda sandwich: sandwich.name,
+    "price": lambda sandwich: (_price_key(sandwich.price_small), _price_key(sandwich.price_medium), sandwich.name),
+}
+SANDWICH_SORT_CHOICES = list(_SANDWICH_SORT_KEYS)
+
+
+def _sorted_sandwiches(sandwiches: list[Sandwich], sort: str) -> list[Sandwich]:
+    return sorted(sandwiches, key=_SANDWICH_SORT_KEYS[sort])
+
+
+class RenderCache:
+    """Rendered menus, so that rendering the same menu with the same settings again costs nothing
+
+    Entries are keyed by the content of the menu, its day, the output format and the settings that
+    change the output (the hidden kinds and the language). Parts of the output that don't depend on the
+    day are stored without one, so they're shared by all days with the same menu. When there are more
+    than [max_entries] entries, the least recently used ones are removed.
+    """
+
+    max_entries: int
+    hits: int
+    misses: int
+
+    _entries: OrderedDict[Hashable, str]
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(output_format: str, day: Optional[date], menu: AnyMenu, config: Config) -> Hashable:
+        """Get the key for a rendered menu"""
+        return output_format, day, menu.fingerprint(), tuple(sorted(set(config.hidden))), config.language
+
+    def get(self, key: Hashable, render: Callable[[], str]) -> str:
+        """Get the output for [key], calling [render] to create it if it isn't in the cache"""
+        output = self._entries.get(key)
+
+        if output is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return output
+
+        self.misses += 1
+        output = self._entries[key] = render()
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return output
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        self._entries.clear()
+
+
+class Renderer(ABC):
+    """Base class for output formats
+
+    Renderers yield their output in chunks (without trailing newlines), which can be written
+    as soon as they are produced instead of building the entire output in memory first.
+    Days without a menu are passed as None. Menus in multiple languages get a name for
+    every language instead of a single one.
+
+    When a [cache] is passed, the output for every menu is reused from it when possible.
+    """
+
+    cache: Optional[RenderCache]
+
+    def __init__(self, cache: Optional[RenderCache] = None):
+        self.cache = cache
+
+    def _render_menu(
+        self, output_format: str, day: Optional[date], menu: AnyMenu, config: Config, render: Callable[[], str]
+    ) -> str:
+        if self.cache is None:
+            return render()
+
+        return self.cache.get(RenderCache.key(output_format, day, menu, config), render)
+
+    @abstractmethod
+    def menus(self, menus: Iterable[tuple[date, Optional[AnyMenu]]], config: Config) -> Iterator[str]:
+        """Render a list of menus"""
+
+    @abstractmethod
+    def sandwiches(self, sandwiches: list[Sandwich], config: Config, *, sort: str = "name") -> Iterator[str]:
+        """Render the list of sandwiches, sorted by their name or their price (one of SANDWICH_SORT_CHOICES)"""
+
+    @abstractmethod
+    def search_results(self, results: list[SearchResult], config: Config) -> Iterator[str]:
+        """Render the results of a search"""
+
+
+class TableRenderer(Renderer):
+    """Human-readable tables"""
+
+    def menus(self, menus: Iterable[tuple[date, Optional[AnyMenu]]], config: Config) -> Iterator[str]:
+        """Render every menu as a separate table"""
+        for index, (day, menu) in enumerate(menus):
+            # Empty line in between menus
+            if index > 0:
+                yield ""
+
+            if menu is None:
+                yield f"No menu found for {day}."
+            else:
+                yield self._render_menu(
+                    "table", day, menu, config, functools.partial(self._menu_string, day, menu, config)
+                )
+
+    def _menu_string(self, day: date, menu: AnyMenu, config: Config) -> str:
+        # Days with the same menu have the same table, so it's only passed to tabulate once for all of them
+        table = self._render_menu("table", None, menu, config, functools.partial(menu.table, config))
+        return menu.to_string(config, day, table=table)
+
+    def sandwiches(self, sandwiches: list[Sandwich], config: Config, *, sort: str = "name") -> Iterator[str]:
+        """Render all sandwiches in one table"""
+        from .tables import sandwich_table
+
+        yield sandwich_table(_sorted_sandwiches(sandwiches, sort), config.translator)
+
+    def search_results(self, results: list[SearchResult], config: Config) -> Iterator[str]:
+        """Render all results in one table"""
+        from .tables import search_table
+
+        yield search_table(results, config.translator)
+
+
+class JSONRenderer(Renderer):
+    """A JSON array, with every item on a separate line"""
+
+    @staticmethod
+    def _array(items: Iterable[str]) -> Iterator[str]:
+        yield "["
+
+        # Look ahead by one item to know which one is the last (which can't have a trailing comma)
+        previous: Optional[str] = None
+        for item in items:
+            if previous is not None:
+                yield f"  {previous},"
+
+            previous = item
+
+        if previous is not None:
+            yield f"  {previous}"
+
+        yield "]"
+
+    def menus(self, menus: Iterable[tuple[date, Optional[AnyMenu]]], config: Config) -> Iterator[str]:
+        """Render an array of menus, leaving out days without a menu"""
+        return self._array(
+            self._render_menu("json", day, menu, config, functools.partial(_menu_json, day, menu, config))
+            for day, menu in menus
+            if menu is not None
+        )
+
+    def sandwiches(self, sandwiches: list[Sandwich], config: Config, *, sort: str = "name") -> Iterator[str]:
+        """Render an array of sandwiches"""
+        return self._array(
+            json.dumps(_sandwich_object(sandwich), ensure_ascii=False)
+            for sandwich in _sorted_sandwiches(sandwiches, sort)
+        )
+
+    def search_results(self, results: list[SearchResult], config: Config) -> Iterator[str]:
+        """Render an array of search results"""
+        return self._array(json.dumps(_search_result_object(result), ensure_ascii=False) for result in results)
+
+
+class NDJSONRenderer(Renderer):
+    """Newline-delimited JSON: one object per line"""
+
+    def menus(self, menus: Iterable[tuple[date, Optional[AnyMenu]]], config: Config) -> Iterator[str]:
+        """Render one menu per line, leaving out days without a menu"""
+        for day, menu in menus:
+            if menu is not None:
+                # The objects are the same as the items of a JSON array, so they share their cache entries
+                yield self._render_menu("json", day, menu, config, functools.partial(_menu_json, day, menu, config))
+
+    def sandwiches(self, sandwiches: list[Sandwich], config: Config, *, sort: str = "name") -> Iterator[str]:
+        """Render one sandwich per line"""
+        for sandwich in _sorted_sandwiches(sandwiches, sort):
+            yield json.dumps(_sandwich_object(sandwich), ensure_ascii=False)
+
+    def search_results(self, results: list[SearchResult], config: Config) -> Iterator[str]:
+        """Render one search result per line"""
+        for result in results:
+            yield json.dumps(_search_result_object(result), ensure_ascii=False)
+
+
+class CSVRenderer(Renderer):
+    """Comma-separated values, with a header row"""
+
+    @staticmethod
+    def _rows(header: list[str], rows: Iterable[list[Any]]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="")
+
+        for row in itertools.chain([header], rows):
+            writer.writerow(row)
+            yield buffer.getvalue()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+    def menus(self, menus: Iterable[tuple[date, Optional[AnyMenu]]], config: Config) -> Iterator[str]:
+        """Render one row per meal, leaving out days without a menu
+
+        Menus in multiple languages get a name column for every language.
+        """
+        from ugent_food.api.models import MultilingualMenu
+
+        present = [(day, menu) for day, menu in menus if menu is not None]
+
+        if not present or not isinstance(present[0][1], MultilingualMenu):
+            rows = (
+                [day.isoformat(), meal.type.value, meal.kind.value, meal.name, _price_str(meal.price)]
+                for day, menu in cast("list[tuple[date, Menu]]", present)
+                for meal in menu.iter_meals(config.hidden)
+            )
+
+            return self._rows(MENU_COLUMNS, rows)
+
+        multilingual = cast("list[tuple[date, MultilingualMenu]]", present)
+
+        # Languages without a menu on some days are left out of those menus, so use all of them
+        languages = list(dict.fromkeys(language for _, menu in multilingual for language in menu.languages))
+        header = MENU_COLUMNS[:3] + [f"name_{language}" for language in languages] + MENU_COLUMNS[4:]
+        multilingual_rows = (
+            [
+                day.isoformat(),
+                multilingual_meal.type.value,
+                multilingual_meal.kind.value,
+                *(multilingual_meal.names.get(language) for language in languages),
+                _price_str(multilingual_meal.price),
+            ]
+            for day, multilingual_menu in multilingual
+            for multilingual_meal in multilingual_menu.iter_meals(config.hidden)
+        )
+
+        return self._rows(header, multilingual_rows)
+
+    def sandwiches(self, sandwiches: list[Sandwich], config: Config, *, sort: str = "name") -> Iterator[str]:
+        """Render one row per sandwich"""
+        rows = (
+            [
+                sandwich.name,
+                ", ".join(sandwich.ingredients),
+                _price_str(sandwich.price_small),
+                _price_str(sandwich.price_medium),
+            ]
+            for sandwich in _sorted_sandwiches(sandwiches, sort)
+        )
+
+        return self._rows(SANDWICH_COLUMNS, rows)
+
+    def search_results(self, results: list[SearchResult], config: Config) -> Iterator[str]:
+        """Render one row per search result"""
+        rows = (list(_search_result_object(result).values()) for result in results)
+        return self._rows(SEARCH_COLUMNS, rows)
+
+
+_RENDERERS: dict[str, type[Renderer]] = {
+    "table": TableRenderer,
+    "json": JSONRenderer,
+    "ndjson": NDJSONRenderer,
+    "csv": CSVRenderer,
+}
+
+FORMAT_CHOICES = list(_RENDERERS)
+
+
+# Shared by every call to render_menus that doesn't pass a cache of its own
+_shared_cache = RenderCache()
+
+
+def get_renderer(name: str, cache: Optional[RenderCache] = None) -> Renderer:
+    """Get the renderer for an output format, reusing rendered menus from [cache] if it's passed"""
+    return _RENDERERS[name](cache)
+
+
+def render_menus(
+    menus: Iterable[tuple[date, Optional[AnyMenu]]],
+    config: Config,
+    output_format: str = "table",
+    *,
+    cache: Optional[RenderCache] = None,
+) -> str:
+    """Render a list of menus into one string, the same way the menu command prints them
+
+    Menus that were already rendered with the same settings are reused from [cache] (or from a cache
+    that is shared by every call if it isn't passed), so only menus that changed are rendered again.
+    """
+    renderer = get_renderer(output_format, cache if cache is not None else _shared_cache)
+    return "\n".join(renderer.menus(menus, config))
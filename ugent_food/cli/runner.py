@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Optional, TypeVar
+
+__all__ = ["Runner", "get_runner", "new_event_loop"]
+
+T = TypeVar("T")
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a new event loop, using uvloop when it's installed"""
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        return asyncio.new_event_loop()
+
+    return uvloop.new_event_loop()
+
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop):
+    """Cancel the tasks that are still running, and wait for them to finish (the same way asyncio.run does)"""
+    tasks = asyncio.all_tasks(loop)
+    if not tasks:
+        return
+
+    for task in tasks:
+        task.cancel()
+
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            loop.call_exception_handler(
+                {"message": "Unhandled exception while closing the runner", "exception": task.exception(), "task": task}
+            )
+
+
+def _run_in_new_runner(coro: Awaitable[T]) -> T:
+    with Runner() as runner:
+        return runner.run(coro)
+
+
+class Runner:
+    """Runs coroutines from synchronous code, reusing one event loop for all of them
+
+    asyncio.run creates (and closes) a new loop for every coroutine, so nothing that is tied to a loop
+    (like the connections of a session) can outlive a single command. The loop is created the first time
+    it's needed, and closed by [close].
+    """
+
+    _loop: Optional[asyncio.AbstractEventLoop]
+
+    def __init__(self):
+        self._loop = None
+
+    def __enter__(self) -> Runner:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the loop of the runner, creating it if there isn't one yet"""
+        if self._loop is None:
+            self._loop = new_event_loop()
+            asyncio.set_event_loop(self._loop)
+
+        return self._loop
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run [coro] until it's done, and return its result
+
+        If an event loop is already running in this thread, it can't be used to wait for [coro] without blocking
+        it, so [coro] is run on a separate thread with a loop of its own instead (which still blocks the running
+        loop until it's done). That means [coro] can't use anything that belongs to the running loop, like a
+        session passed to use_session. Async code should await the functions in ugent_food.cli.core directly.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self.get_loop().run_until_complete(coro)
+
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(context.run, _run_in_new_runner, coro).result()
+
+    def close(self):
+        """Cancel everything that is still running on the loop, and close it"""
+        if self._loop is None:
+            return
+
+        loop, self._loop = self._loop, None
+
+        try:
+            _cancel_all_tasks(loop)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+@functools.lru_cache(maxsize=None)
+def get_runner() -> Runner:
+    """Get the runner that is shared by all commands, which is closed when the process exits"""
+    runner = Runner()
+    atexit.register(runner.close)
+    return runner
@@ -2,20 +2,97 @@ import textwrap
 
 from tabulate import tabulate
 
-from ugent_food.api.models import Sandwich
-from ugent_food.i18n import Translator
+from ugent_food.api.models import Price, Sandwich
+from ugent_food.api.search import SearchResult, SearchSource
+from ugent_food.api.stats import MenuStats
+from ugent_food.i18n import Message, Translator
 
-__all__ = ["sandwich_table"]
+__all__ = ["sandwich_table", "search_table", "stats_tables"]
 
 
 def sandwich_table(sandwiches: list[Sandwich], translator: Translator) -> str:
-    """Table for the list of sandwiches"""
+    """Table for the list of sandwiches, in the order they are in"""
     table_data = []
 
-    for sandwich in sorted(sandwiches, key=lambda x: x.name):
+    for sandwich in sandwiches:
         ingredients = list(map(str.title, sandwich.ingredients))
         ingredients_str = "".join(textwrap.wrap(", ".join(sorted(ingredients))))
 
-        table_data.append([sandwich.name.title(), ingredients_str, sandwich.price_small, sandwich.price_medium])
+        table_data.append(
+            [
+                sandwich.name.title(),
+                ingredients_str,
+                translator.price(sandwich.price_small),
+                translator.price(sandwich.price_medium),
+            ]
+        )
 
     return tabulate(table_data, headers=translator.sandwich_table_headers())
+
+
+def search_table(results: list[SearchResult], translator: Translator) -> str:
+    """Table for the results of a search"""
+    table_data = []
+
+    for result in results:
+        day_str = ""
+        if result.day is not None:
+            day_str = f"{translator.weekday(result.day.weekday())} {result.day.strftime('%d/%m/%Y')}"
+
+        name = result.name
+
+        # Things that aren't meals only show where they were found
+        if result.source == SearchSource.MEAL and result.type is not None and result.kind is not None:
+            type_str, kind_str = translator.type(result.type), translator.kind(result.kind)
+        else:
+            type_str, kind_str = translator.source(result.source), ""
+
+            # Same as in the table of sandwiches
+            if result.source == SearchSource.SANDWICH:
+                name = name.title()
+
+        table_data.append([day_str, type_str, kind_str, name])
+
+    return tabulate(table_data, headers=translator.search_table_headers())
+
+
+def stats_tables(stats: MenuStats, translator: Translator) -> str:
+    """Tables for the statistics about a range of days"""
+    start = stats.start.strftime("%d/%m/%Y") if stats.start is not None else "-"
+    end = stats.end.strftime("%d/%m/%Y") if stats.end is not None else "-"
+    aggregated = [translator.message(Message.STATS_FOR, days=stats.days, start=start, end=end)]
+
+    # The median & average are rounded to the nearest cent
+    prices_data = [
+        [
+            translator.kind(kind),
+            summary.count,
+            translator.price(Price(summary.minimum)),
+            translator.price(Price(round(summary.median))),
+            translator.price(Price(round(summary.mean))),
+            translator.price(Price(summary.maximum)),
+        ]
+        for kind, summary in stats.prices.items()
+    ]
+    aggregated.append("\n" + tabulate(prices_data, headers=translator.stats_table_headers("prices")))
+
+    weeks_data = [
+        [
+            f"{week.year}-W{week.week:02}",
+            week.meals,
+            f"{week.vegan} ({week.vegan_share:.0%})",
+            f"{week.vegetarian} ({week.vegetarian_share:.0%})",
+        ]
+        for week in stats.weeks
+    ]
+    aggregated.append("\n" + tabulate(weeks_data, headers=translator.stats_table_headers("weeks")))
+
+    aggregated.append("\n" + tabulate(stats.dishes, headers=translator.stats_table_headers("dishes")))
+
+    if stats.closed:
+        closed_str = "\n".join(
+            f"- {translator.weekday(day.weekday())} {day.strftime('%d/%m/%Y')}" for day in stats.closed
+        )
+        aggregated.append("\n" + translator.message(Message.CLOSED_DAYS, days=closed_str))
+
+    return "\n".join(aggregated)
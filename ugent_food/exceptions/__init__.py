@@ -1,5 +1,8 @@
 from .api_exception import APIException
+from .api_unavailable import APIUnavailable
 from .base import UGentFoodException
+from .decoding_error import DecodingError
+from .invalid_argument import InvalidArgument
 from .no_menu_found import NoMenuFound
 
-__all__ = ["APIException", "NoMenuFound", "UGentFoodException"]
+__all__ = ["APIException", "APIUnavailable", "DecodingError", "InvalidArgument", "NoMenuFound", "UGentFoodException"]
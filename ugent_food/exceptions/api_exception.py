@@ -6,5 +6,8 @@ __all__ = ["APIException"]
 class APIException(UGentFoodException):
     """Exception raised when an API request fails"""
 
+    status_code: int
+
     def __init__(self, status_code: int):
+        self.status_code = status_code
         super().__init__(f"API request failed with status code {status_code}.")
@@ -0,0 +1,7 @@
+from .base import UGentFoodException
+
+__all__ = ["APIUnavailable"]
+
+
+class APIUnavailable(UGentFoodException):
+    """Exception raised when the API can't be reached"""
@@ -0,0 +1,7 @@
+from .base import UGentFoodException
+
+__all__ = ["DecodingError"]
+
+
+class DecodingError(UGentFoodException):
+    """Exception raised when an API response doesn't have the expected format"""
@@ -0,0 +1,13 @@
+from .base import UGentFoodException
+
+__all__ = ["InvalidArgument"]
+
+
+class InvalidArgument(UGentFoodException):
+    """Exception raised when a day (or a range of days) can't be parsed"""
+
+    argument: str
+
+    def __init__(self, argument: str):
+        self.argument = argument
+        super().__init__(f'Unable to parse argument "{argument}".')
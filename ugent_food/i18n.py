@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import functools
+import json
 from enum import Enum, auto
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from ugent_food.api.enums import MealKind, MealType
 
+if TYPE_CHECKING:
+    from ugent_food.api.models import Price
+
 __all__ = ["Language", "Message", "Translator"]
 
 
@@ -26,90 +33,141 @@ class Language(Enum):
 class Message(Enum):
     """Enum for messages that can be displayed in multiple languages"""
 
+    CLOSED_DAYS = auto()
     EXTRA_MESSAGE = auto()
     MENU_FOR = auto()
     RESTO_CLOSED = auto()
+    STATS_FOR = auto()
 
     MAIN_COURSE = auto()
     SOUP = auto()
     VEGETABLES = auto()
 
 
-kinds: dict[MealKind, dict[Language, str]] = {
-    MealKind.FISH: {Language.DUTCH: "Vis", Language.ENGLISH: "Fish"},
-    MealKind.MEAT: {Language.DUTCH: "Vlees", Language.ENGLISH: "Meat"},
-    MealKind.SOUP: {Language.DUTCH: "Soep", Language.ENGLISH: "Soup"},
-    MealKind.VEGAN: {Language.DUTCH: "Vegan", Language.ENGLISH: "Vegan"},
-    MealKind.VEGETARIAN: {Language.DUTCH: "Vegetarisch", Language.ENGLISH: "Vegetarian"},
-}
+CATALOGS_PATH = Path(__file__).parent / "catalogs"
 
 
-types: dict[MealType, dict[Language, str]] = {
-    MealType.MAIN: {Language.DUTCH: "Hoofdgerecht", Language.ENGLISH: "Main course"},
-    MealType.COLD: {Language.DUTCH: "Koud", Language.ENGLISH: "Cold"},
-    MealType.SIDE: {Language.DUTCH: "Bijgerecht", Language.ENGLISH: "Side dish"},
-}
+class Translator:
+    """Class that handles translation of messages
 
+    The translations for every language are stored in a catalog file, which is only read the
+    first time a translation in that language is needed. It's turned into flat lookup tables that
+    are indexed by the enums directly, and shared by all translators for that language.
+    Use Translator.for_language to share the translators themselves as well.
 
-messages: dict[Message, dict[Language, str]] = {
-    Message.EXTRA_MESSAGE: {
-        Language.DUTCH: "Extra mededeling:\n{extra}",
-        Language.ENGLISH: "Extra message:\n{extra}",
-    },
-    Message.RESTO_CLOSED: {
-        Language.DUTCH: "De resto's zijn gesloten op {day}.",
-        Language.ENGLISH: "The restaurants are closed on {day}.",
-    },
-    Message.MENU_FOR: {Language.DUTCH: "Menu voor {weekday} {day}:", Language.ENGLISH: "Menu for {weekday} {day}:"},
-    Message.VEGETABLES: {Language.DUTCH: "Groenten:\n{vegetables}", Language.ENGLISH: "Vegetables:\n{vegetables}"},
-}
+    Adding a language only requires a catalog file (& a Language to go with it).
+    """
 
+    language: Language
 
-weekdays: dict[int, dict[Language, str]] = {
-    0: {Language.ENGLISH: "Monday", Language.DUTCH: "maandag"},
-    1: {Language.ENGLISH: "Tuesday", Language.DUTCH: "dinsdag"},
-    2: {Language.ENGLISH: "Wednesday", Language.DUTCH: "woensdag"},
-    3: {Language.ENGLISH: "Thursday", Language.DUTCH: "donderdag"},
-    4: {Language.ENGLISH: "Friday", Language.DUTCH: "vrijdag"},
-    5: {Language.ENGLISH: "Saturday", Language.DUTCH: "zaterdag"},
-    6: {Language.ENGLISH: "Sunday", Language.DUTCH: "zondag"},
-}
+    # Lookup tables, filled in on first access by __getattr__
+    _kinds: dict[MealKind, str]
+    _types: dict[MealType, str]
+    _messages: dict[Message, Callable[..., str]]
+    _weekdays: tuple[str, ...]
+    _price_format: Callable[..., str]
+    _menu_table_headers: tuple[str, ...]
+    _sandwich_table_headers: tuple[str, ...]
+    _search_table_headers: tuple[str, ...]
+    _stats_table_headers: dict[str, tuple[str, ...]]
+    _sources: dict[str, str]
+    _changes: dict[str, Callable[..., str]]
+
+    def __init__(self, language: Language):
+        self.language = language
 
+    def __getattr__(self, name: str) -> Any:
+        """Load the lookup tables the first time one of them is used
 
-class Translator:
-    """Class that handles translation of messages"""
+        This is only called for attributes that don't exist yet, so once the tables are loaded
+        they are regular attributes that don't need any checks anymore. Other names (like the
+        ones that IPython, copy or mock look for) raise an AttributeError as usual.
+        """
+        # The tables are loaded all at once, so if one of them is there, all of them are
+        if name.startswith("_") and not name.startswith("__") and "_kinds" not in self.__dict__:
+            self.__dict__.update(_load_tables(self.language))
 
-    language: Language
+        if name in self.__dict__:
+            return self.__dict__[name]
 
-    def __init__(self, language: Language):
-        self.language = language
+        raise AttributeError(name)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def for_language(cls, language: Language) -> Translator:
+        """Get the shared translator for a language"""
+        return cls(language)
+
+    def change(self, change: str, **kwargs) -> str:
+        """Get a description of a change to a menu (a ChangeKind, or "message_removed") in the configured language"""
+        return self._changes[change](**kwargs)
 
     def kind(self, kind: MealKind) -> str:
         """Get a translation for a meal kind in the configured language"""
-        return kinds[kind][self.language]
+        return self._kinds[kind]
 
-    def menu_table_headers(self) -> list[str]:
+    def menu_table_headers(self) -> tuple[str, ...]:
         """Get a translation for the headers in the menu table"""
-        if self.language == Language.DUTCH:
-            return ["Type", "Soort", "Naam", "Prijs"]
+        return self._menu_table_headers
 
-        return ["Type", "Kind", "Name", "Price"]
-
-    def sandwich_table_headers(self) -> list[str]:
+    def sandwich_table_headers(self) -> tuple[str, ...]:
         """Get a translation for the headers in the sandwich table"""
-        if self.language == Language.DUTCH:
-            return ["Naam", "Ingrediënten", "Prijs (klein)", "Prijs (medium)"]
+        return self._sandwich_table_headers
+
+    def search_table_headers(self) -> tuple[str, ...]:
+        """Get a translation for the headers in the table of search results"""
+        return self._search_table_headers
+
+    def stats_table_headers(self, table: str) -> tuple[str, ...]:
+        """Get a translation for the headers in one of the tables of statistics ("dishes", "prices" or "weeks")"""
+        return self._stats_table_headers[table]
+
+    def price(self, price: Optional[Price]) -> str:
+        """Get a price in the notation of the configured language, or an empty string if there is no price"""
+        if price is None:
+            return ""
+
+        # Prices that couldn't be parsed are shown the way the API wrote them
+        if price.cents is None:
+            return price.text
+
+        euros, cents = divmod(price.cents, 100)
+        return self._price_format(euros=euros, cents=cents)
 
-        return ["Name", "Ingredients", "Price (small)", "Price (medium)"]
+    def source(self, source: str) -> str:
+        """Get a translation for the place a search result was found in (a SearchSource)"""
+        return self._sources[source]
 
     def type(self, type_: MealType) -> str:
         """Get a translation for a type in the configured language"""
-        return types[type_][self.language]
+        return self._types[type_]
 
     def message(self, message: Message, **kwargs) -> str:
         """Get a specific message in the configured language"""
-        return messages[message][self.language].format(**kwargs)
+        return self._messages[message](**kwargs)
 
     def weekday(self, weekday: int) -> str:
         """Get a day of the week in a configured language"""
-        return weekdays[weekday][self.language]
+        return self._weekdays[weekday]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_tables(language: Language) -> dict[str, Any]:
+    """Read the catalog for a language, and turn it into the lookup tables of a Translator"""
+    with (CATALOGS_PATH / f"{language.value}.json").open("r", encoding="utf-8") as fp:
+        catalog = json.load(fp)
+
+    return {
+        "_kinds": {MealKind(kind): value for kind, value in catalog["kinds"].items()},
+        "_types": {MealType(type_): value for type_, value in catalog["types"].items()},
+        # Keep the bound format methods around, instead of looking them up for every message
+        "_messages": {Message[name.upper()]: template.format for name, template in catalog["messages"].items()},
+        "_weekdays": tuple(catalog["weekdays"]),
+        "_price_format": catalog["price_format"].format,
+        "_menu_table_headers": tuple(catalog["menu_table_headers"]),
+        "_sandwich_table_headers": tuple(catalog["sandwich_table_headers"]),
+        "_search_table_headers": tuple(catalog["search_table_headers"]),
+        "_stats_table_headers": {table: tuple(headers) for table, headers in catalog["stats_table_headers"].items()},
+        "_sources": catalog["sources"],
+        "_changes": {change: template.format for change, template in catalog["changes"].items()},
+    }
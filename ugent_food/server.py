@@ -0,0 +1,145 @@
+from dataclasses import fields, is_dataclass
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Optional, Union
+
+from aiohttp import web
+
+from ugent_food.api.cache import MemoryCache
+from ugent_food.api.client import HydraClient
+from ugent_food.api.models import Menu, MultilingualMenu, Price
+from ugent_food.cli.config import Config
+from ugent_food.cli.parsers import parse_date_argument
+from ugent_food.cli.runner import new_event_loop
+from ugent_food.exceptions import (
+    APIException,
+    APIUnavailable,
+    DecodingError,
+    NoMenuFound,
+)
+from ugent_food.i18n import Language
+
+__all__ = ["create_app", "run_server"]
+
+CONFIG_KEY = "config"
+CLIENT_KEY = "client"
+
+
+def _serialize(value: Any) -> Any:
+    """Turn a model into something JSON-serializable, leaving out private fields"""
+    if isinstance(value, Price):
+        return str(value)
+
+    if is_dataclass(value):
+        return {
+            _field.name: _serialize(getattr(value, _field.name))
+            for _field in fields(value)
+            if not _field.name.startswith("_")
+        }
+
+    if isinstance(value, list):
+        return list(map(_serialize, value))
+
+    return value
+
+
+def _error(status: HTTPStatus, message: str) -> web.Response:
+    return web.json_response({"error": message}, status=status)
+
+
+async def _hydra_client(app: web.Application) -> AsyncIterator[None]:
+    """Keep one HydraClient alive for as long as the server is running"""
+    async with app[CLIENT_KEY]:
+        yield
+
+
+async def menu_handler(request: web.Request) -> web.Response:
+    """Get the menu for a day
+
+    The day is parsed the same way as the argument of the menu command (use YYYY-MM-DD for dates),
+    leaving it out fetches the menu for today. Multiple languages can be requested at once by
+    separating them with commas (?language=nl,en), which returns a menu with a name for every language.
+    """
+    config: Config = request.app[CONFIG_KEY]
+    day_arg: Optional[str] = request.match_info.get("day")
+
+    day = parse_date_argument(day_arg, skip_weekends=config.skip_weekends)
+    if day is None:
+        return _error(HTTPStatus.BAD_REQUEST, f'Unable to parse argument "{day_arg}".')
+
+    languages = list(dict.fromkeys(request.query.get("language", config.language).split(",")))
+    try:
+        for language in languages:
+            Language.from_str(language)
+    except ValueError as e:
+        return _error(HTTPStatus.BAD_REQUEST, str(e))
+
+    client: HydraClient = request.app[CLIENT_KEY]
+    menu: Union[Menu, MultilingualMenu]
+
+    try:
+        if len(languages) == 1:
+            menu = await client.get_menu(day, languages[0])
+        else:
+            menu = await client.get_multilingual_menu(day, languages)
+    except NoMenuFound:
+        return _error(HTTPStatus.NOT_FOUND, f"No menu found for {day}.")
+    except (APIException, APIUnavailable, DecodingError) as e:
+        return _error(HTTPStatus.BAD_GATEWAY, str(e))
+
+    return web.json_response({"date": day.isoformat(), **_serialize(menu)})
+
+
+async def sandwiches_handler(request: web.Request) -> web.Response:
+    """Get the list of available sandwiches"""
+    try:
+        sandwiches = await request.app[CLIENT_KEY].get_sandwiches()
+    except (APIException, APIUnavailable, DecodingError) as e:
+        return _error(HTTPStatus.BAD_GATEWAY, str(e))
+
+    return web.json_response(list(map(_serialize, sandwiches)))
+
+
+async def stats_handler(request: web.Request) -> web.Response:
+    """Get statistics about the requests sent to the API"""
+    single_flight = request.app[CLIENT_KEY].single_flight
+
+    return web.json_response(
+        {
+            "requests": single_flight.executed,
+            "coalesced": single_flight.coalesced,
+            "in_flight": single_flight.in_flight,
+        }
+    )
+
+
+def create_app(config: Config, *, max_entries: int = 256) -> web.Application:
+    """Create the application that serves the menus
+
+    All requests share one HydraClient with an in-memory cache, so repeated requests
+    don't have to go to the API again.
+    """
+    app = web.Application()
+    app[CONFIG_KEY] = config
+    app[CLIENT_KEY] = HydraClient(language=config.language, cache=MemoryCache(max_entries=max_entries))
+    app.cleanup_ctx.append(_hydra_client)
+
+    app.router.add_get("/menu", menu_handler)
+    app.router.add_get("/menu/{day}", menu_handler)
+    app.router.add_get("/sandwiches", sandwiches_handler)
+    app.router.add_get("/stats", stats_handler)
+
+    return app
+
+
+def run_server(config: Config, *, host: str = "127.0.0.1", port: int = 8080, path: Optional[str] = None):
+    """Run the server until it is interrupted
+
+    If a [path] is passed, the server listens on that Unix socket instead of on [host]:[port].
+    uvloop is used when it's installed.
+    """
+    app = create_app(config)
+
+    if path is not None:
+        web.run_app(app, path=path, loop=new_event_loop())
+    else:
+        web.run_app(app, host=host, port=port, loop=new_event_loop())
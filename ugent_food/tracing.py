@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import count
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from aiohttp import TraceConfig
+
+__all__ = ["Span", "Tracer", "current_tracer", "shared_trace_config", "span"]
+
+# The tracer that is currently active (if any), and the span that new spans are nested in
+_current_tracer: ContextVar[Optional[Tracer]] = ContextVar("ugent_food_tracer", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("ugent_food_span", default=None)
+
+
+@dataclass
+class Span:
+    """A phase of a command, with its start & end times (from time.perf_counter)"""
+
+    name: str
+    span_id: int
+    parent: Optional[Span]
+    start: float
+    end: Optional[float] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """The duration of the span in seconds, up until now if it hasn't ended yet"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.start
+
+
+class Tracer:
+    """Collects spans for every phase of a command
+
+    Spans are only recorded while the tracer is active, see [activate]. Code that wants to be
+    measured uses the [span] function, which does nothing at all when no tracer is active.
+    """
+
+    spans: list[Span]
+    trace_id: str
+
+    _ids: Iterator[int]
+    _epoch: float
+
+    def __init__(self):
+        self.spans = []
+        self.trace_id = os.urandom(16).hex()
+
+        self._ids = count(1)
+        # Offset to turn perf_counter values into timestamps
+        self._epoch = time.time() - time.perf_counter()
+
+    def record(self, name: str, start: float, end: Optional[float] = None, **attributes: Any) -> Span:
+        """Add a span, nested in the span that is currently active"""
+        recorded = Span(
+            name=name,
+            span_id=next(self._ids),
+            parent=_current_span.get(),
+            start=start,
+            end=end,
+            attributes=attributes,
+        )
+        self.spans.append(recorded)
+        return recorded
+
+    @contextmanager
+    def activate(self, name: str) -> Iterator[Span]:
+        """Record spans until the block exits, in a root span called [name]"""
+        tracer_token = _current_tracer.set(self)
+        try:
+            with span(name) as root:
+                assert root is not None  # noqa: S101
+                yield root
+        finally:
+            _current_tracer.reset(tracer_token)
+
+    def trace_config(self) -> TraceConfig:
+        """Create a TraceConfig that records the network phases of every request of a session
+
+        The phases are:
+         - http.queued: waiting for a free connection in the pool
+         - http.dns: resolving the host name
+         - http.connect: creating a new connection (including the TLS handshake)
+         - http.request: sending the request, up until the headers of the response are received
+        """
+        return _trace_config(lambda: self)
+
+    def format_summary(self) -> str:
+        """Summary of the time spent in every phase, with nested phases indented below their parent
+
+        Spans that ran concurrently are all counted, so the total of a phase can be larger than
+        the total of the phase it's nested in.
+        """
+        # Group the spans by their name (and the name of their parent), in the order they started
+        phases: dict[tuple[str, ...], list[Span]] = {}
+        for recorded in sorted(self.spans, key=lambda s: s.start):
+            names = []
+            current: Optional[Span] = recorded
+            while current is not None:
+                names.append(current.name)
+                current = current.parent
+
+            phases.setdefault(tuple(reversed(names)), []).append(recorded)
+
+        def _first_starts(path: tuple[str, ...]) -> list[float]:
+            return [phases[path[: i + 1]][0].start for i in range(len(path))]
+
+        # Keep nested phases right below their parent
+        ordered = sorted(phases, key=_first_starts)
+
+        width = max((len(path) * 2 + len(path[-1]) for path in ordered), default=0)
+        lines = [f"{'Phase':<{width}}  {'Calls':>5}  {'Total':>10}"]
+
+        for path in ordered:
+            spans = phases[path]
+            total = sum(s.duration for s in spans) * 1000
+            name = "  " * (len(path) - 1) + path[-1]
+            lines.append(f"{name:<{width}}  {len(spans):>5}  {total:>8.1f}ms")
+
+        return "\n".join(lines)
+
+    def export(self, path: Path):
+        """Append all spans to [path] as JSON lines, using the same fields as OpenTelemetry"""
+        with path.open("a", encoding="utf-8") as fp:
+            for recorded in self.spans:
+                end = recorded.end if recorded.end is not None else time.perf_counter()
+
+                exported = {
+                    "name": recorded.name,
+                    "trace_id": self.trace_id,
+                    "span_id": f"{recorded.span_id:016x}",
+                    "parent_span_id": f"{recorded.parent.span_id:016x}" if recorded.parent is not None else None,
+                    "start_time_unix_nano": int((recorded.start + self._epoch) * 1_000_000_000),
+                    "end_time_unix_nano": int((end + self._epoch) * 1_000_000_000),
+                    "attributes": recorded.attributes,
+                }
+                fp.write(json.dumps(exported, default=str) + "\n")
+
+
+def _trace_config(get_tracer: Callable[[], Optional[Tracer]]) -> TraceConfig:
+    """Create a TraceConfig that records the network phases of every request in the tracer from [get_tracer]"""
+    from aiohttp import TraceConfig
+
+    trace_config = TraceConfig()
+
+    def _phase(name: str, start_signal, end_signal, describe=None):
+        async def _on_start(_session, context, _params):
+            setattr(context, name, time.perf_counter())
+
+        async def _on_end(_session, context, params):
+            tracer = get_tracer()
+            if tracer is not None:
+                attributes = describe(params) if describe is not None else {}
+                tracer.record(name, getattr(context, name), time.perf_counter(), **attributes)
+
+        start_signal.append(_on_start)
+        for signal in end_signal:
+            signal.append(_on_end)
+
+    def _describe_request(params) -> dict[str, Any]:
+        attributes: dict[str, Any] = {"method": params.method, "url": str(params.url)}
+
+        if hasattr(params, "response"):
+            attributes["status"] = params.response.status
+        else:
+            attributes["error"] = type(params.exception).__name__
+
+        return attributes
+
+    _phase("http.queued", trace_config.on_connection_queued_start, [trace_config.on_connection_queued_end])
+    _phase(
+        "http.dns",
+        trace_config.on_dns_resolvehost_start,
+        [trace_config.on_dns_resolvehost_end],
+        lambda params: {"host": params.host},
+    )
+    _phase("http.connect", trace_config.on_connection_create_start, [trace_config.on_connection_create_end])
+    _phase(
+        "http.request",
+        trace_config.on_request_start,
+        [trace_config.on_request_end, trace_config.on_request_exception],
+        _describe_request,
+    )
+
+    return trace_config
+
+
+def shared_trace_config() -> TraceConfig:
+    """Create a TraceConfig like Tracer.trace_config, for sessions that outlive a single tracer
+
+    Every request is recorded in the tracer that is active when it's sent, or not at all if there is none.
+    """
+    return _trace_config(current_tracer)
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Get the tracer that is currently active, if any"""
+    return _current_tracer.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Measure the time spent in a block, if a tracer is active
+
+    Spans that are started inside the block are nested in this one. This yields None if no
+    tracer is active.
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+
+    current = tracer.record(name, time.perf_counter(), **attributes)
+    token = _current_span.set(current)
+
+    try:
+        yield current
+    except Exception as e:
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
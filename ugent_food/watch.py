@@ -0,0 +1,168 @@
+import asyncio
+import json
+import sys
+from abc import ABC, abstractmethod
+from datetime import date
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+import click
+from aiohttp import ClientError
+
+from ugent_food.api.client import HydraClient
+from ugent_food.api.diff import MenuChange, diff_menus
+from ugent_food.api.models import Menu
+from ugent_food.api.policy import DEFAULT_POLICY
+from ugent_food.exceptions import APIException, APIUnavailable, DecodingError
+from ugent_food.i18n import Translator
+
+__all__ = ["Emitter", "FileEmitter", "MenuWatcher", "StreamEmitter", "WebhookEmitter"]
+
+
+class Emitter(ABC):
+    """Base class for the destinations that changes are sent to"""
+
+    @abstractmethod
+    async def emit(self, changes: list[MenuChange]):
+        """Send a list of changes"""
+
+
+class StreamEmitter(Emitter):
+    """Write changes to a stream (stdout by default), either as text or as one JSON object per line"""
+
+    translator: Translator
+    as_json: bool
+    stream: TextIO
+
+    def __init__(self, translator: Translator, *, as_json: bool = False, stream: Optional[TextIO] = None):
+        self.translator = translator
+        self.as_json = as_json
+        self.stream = stream if stream is not None else sys.stdout
+
+    async def emit(self, changes: list[MenuChange]):
+        """Write every change on a separate line"""
+        for change in changes:
+            if self.as_json:
+                line = json.dumps(change.to_dict(), ensure_ascii=False)
+            else:
+                line = change.describe(self.translator)
+
+            click.echo(line, file=self.stream)
+
+
+class FileEmitter(Emitter):
+    """Append changes to a file, one JSON object per line"""
+
+    path: Path
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    async def emit(self, changes: list[MenuChange]):
+        """Append every change to the file"""
+        with self.path.open("a", encoding="utf-8") as fp:
+            for change in changes:
+                fp.write(json.dumps(change.to_dict(), ensure_ascii=False) + "\n")
+
+
+class WebhookEmitter(Emitter):
+    """Send changes to a URL in a POST request, as {"changes": [...]}
+
+    The request is sent using the session of the [client], so it shares its connection pool.
+    """
+
+    client: HydraClient
+    url: str
+
+    def __init__(self, client: HydraClient, url: str):
+        self.client = client
+        self.url = url
+
+    async def emit(self, changes: list[MenuChange]):
+        """Send all changes in one request"""
+        payload = {"changes": [change.to_dict() for change in changes]}
+        policy = self.client.policy if self.client.policy is not None else DEFAULT_POLICY
+
+        async with self.client.session.post(self.url, json=payload, timeout=policy.timeout) as response:
+            response.raise_for_status()
+
+
+class MenuWatcher:
+    """Polls the menus for a couple of days, and reports what changed since the previous poll
+
+    Every poll sends a conditional request for every day, so the API only sends a menu again when
+    it actually changed (this requires the [client] to have a cache). Days that are seen for the
+    first time are only remembered, not reported.
+
+    The [days] are looked up again before every poll, so relative days (like "today") move along
+    with the date. When polling fails, the time between polls is doubled (up to [max_interval])
+    until it works again.
+    """
+
+    client: HydraClient
+    days: Callable[[], list[date]]
+    interval: float
+    max_interval: float
+    language: Optional[str]
+
+    _menus: dict[date, Optional[Menu]]
+
+    def __init__(
+        self,
+        client: HydraClient,
+        days: Callable[[], list[date]],
+        *,
+        interval: float = 300,
+        max_interval: float = 3600,
+        language: Optional[str] = None,
+    ):
+        self.client = client
+        self.days = days
+        self.interval = interval
+        self.max_interval = max_interval
+        self.language = language
+
+        self._menus = {}
+
+    async def poll(self) -> list[MenuChange]:
+        """Fetch the menus, and get the changes compared to the previous poll"""
+        days = self.days()
+        menus = await self.client.get_menus(days, self.language, revalidate=True)
+
+        changes = []
+        for day, menu in zip(days, menus):
+            if day in self._menus:
+                changes.extend(diff_menus(day, self._menus[day], menu))
+
+        # Days that aren't watched anymore are forgotten
+        self._menus = dict(zip(days, menus))
+        return changes
+
+    async def run(self, emitters: list[Emitter]):
+        """Keep polling forever, sending the changes to all [emitters]
+
+        Errors are reported on stderr, they don't stop the watcher.
+        """
+        delay = self.interval
+
+        while True:
+            try:
+                changes = await self.poll()
+            except (APIException, APIUnavailable, DecodingError) as e:
+                delay = min(delay * 2, self.max_interval)
+                click.echo(f"Unable to fetch the menus, trying again in {delay:g}s: {e}", err=True)
+            else:
+                delay = self.interval
+
+                if changes:
+                    await self._emit(emitters, changes)
+
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _emit(emitters: list[Emitter], changes: list[MenuChange]):
+        for emitter in emitters:
+            try:
+                await emitter.emit(changes)
+            except (ClientError, asyncio.TimeoutError, OSError) as e:
+                click.echo(f"Unable to send changes using {type(emitter).__name__}: {e}", err=True)